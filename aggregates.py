@@ -0,0 +1,117 @@
+# aggregates.py
+# Agregat untuk chart & tabel dashboard: jumlah usaha dan statistik review per daerah / Jenis Usaha.
+# Dibuat sekali per versi data (didaftarkan ke watcher); versi baru dihitung inkremental dari diff
+# (hanya baris tambah / hapus / berubah). Agregat per hasil filter di-memo per kombinasi filter.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+GROUP_COLUMNS = ["daerah", "Jenis Usaha"]
+HIGH_REVIEW = 1000
+
+
+class _Groups:
+    """Kode kategori per baris + jumlah & total review per kategori untuk satu kolom."""
+
+    def __init__(self, values, review):
+        cat = pd.Categorical(values)
+        self.labels = [str(c) for c in cat.categories]
+        self.lookup = {lab: i for i, lab in enumerate(self.labels)}
+        self.codes = np.asarray(cat.codes, dtype=np.int32)  # -1 = kosong (NaN)
+        self.count, self.review_sum = self.totals(np.arange(len(self.codes)), review)
+
+    def encode(self, values):
+        """Kode untuk nilai baru; kategori yang belum ada ditambahkan di belakang."""
+        out = np.empty(len(values), dtype=np.int32)
+        for i, v in enumerate(values):
+            if pd.isna(v):
+                out[i] = -1
+                continue
+            v = str(v)
+            if v not in self.lookup:
+                self.lookup[v] = len(self.labels)
+                self.labels.append(v)
+            out[i] = self.lookup[v]
+        return out
+
+    def totals(self, rows, review):
+        codes = self.codes[rows]
+        ok = codes >= 0
+        k = len(self.labels)
+        count = np.bincount(codes[ok], minlength=k).astype(np.int64)
+        review_sum = np.bincount(codes[ok], weights=review[rows][ok], minlength=k)
+        return count, review_sum
+
+
+class Aggregates:
+    def __init__(self, df, memo_size=128):
+        self.review = df["review"].to_numpy(dtype=float)
+        self.groups = {col: _Groups(df[col], self.review) for col in GROUP_COLUMNS}
+        self.n = len(df)
+        self.n_high_review = int((self.review > HIGH_REVIEW).sum())
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def table(self, col, key=None, rows=None):
+        """DataFrame [col, jumlah, review_total, rata_review] terurut jumlah terbanyak.
+
+        rows=None -> seluruh data; kalau tidak, posisi baris hasil filter dengan `key` sebagai key memo
+        (mis. filter_key dari sidebar).
+        """
+        if rows is None or len(rows) == self.n:
+            key = None
+        memo_key = (col, key)
+        with self._lock:
+            if memo_key in self._memo:
+                self._memo.move_to_end(memo_key)
+                return self._memo[memo_key]
+        g = self.groups[col]
+        if key is None:
+            count, review_sum = g.count, g.review_sum
+        else:
+            count, review_sum = g.totals(np.asarray(rows), self.review)
+        nz = np.flatnonzero(count)
+        order = nz[np.lexsort((nz, -count[nz]))]  # jumlah menurun, seri -> urutan kategori
+        out = pd.DataFrame({
+            col: [g.labels[i] for i in order],
+            "jumlah": count[order],
+            "review_total": review_sum[order],
+            "rata_review": review_sum[order] / count[order],
+        })
+        with self._lock:
+            self._memo[memo_key] = out
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return out
+
+
+def update_aggregates(prev, df, diff):
+    """Aggregates versi baru dari versi lama + diff watcher: kontribusi baris lama dikurangi, baris baru ditambah."""
+    agg = Aggregates.__new__(Aggregates)
+    agg.review = df["review"].to_numpy(dtype=float)
+    agg.n = len(df)
+    agg._memo = OrderedDict()
+    agg._memo_size = prev._memo_size
+    agg._lock = threading.Lock()
+
+    gone_old = np.concatenate([diff.removed, diff.changed_old])
+    fresh_new = np.concatenate([diff.added, diff.changed])
+    agg.groups = {}
+    for col, pg in prev.groups.items():
+        g = _Groups.__new__(_Groups)
+        g.labels, g.lookup = list(pg.labels), dict(pg.lookup)
+        g.codes = np.empty(len(df), dtype=np.int32)
+        g.codes[diff.matched_new] = pg.codes[diff.matched_old]
+        g.codes[fresh_new] = g.encode(df[col].iloc[fresh_new].to_numpy())
+        old_count, old_sum = pg.totals(gone_old, prev.review)
+        new_count, new_sum = g.totals(fresh_new, agg.review)
+        k = len(g.labels)
+        g.count = np.pad(pg.count - old_count, (0, k - len(pg.labels))) + new_count
+        g.review_sum = np.pad(pg.review_sum - old_sum, (0, k - len(pg.labels))) + new_sum
+        agg.groups[col] = g
+    agg.n_high_review = (prev.n_high_review - int((prev.review[gone_old] > HIGH_REVIEW).sum())
+                         + int((agg.review[fresh_new] > HIGH_REVIEW).sum()))
+    return agg
@@ -0,0 +1,95 @@
+# areas.py
+# Spatial join usaha -> batas wilayah (GeoJSON poligon) untuk mengisi / memeriksa kolom `daerah` yang diketik manual.
+# Poligon dimuat sekali ke shapely STRtree, lalu semua titik di-query sekaligus per chunk (point-in-polygon vektor,
+# tanpa loop per usaha). Dipasang di loader watcher: join jalan sekali per versi data dan FilterIndex / Aggregates
+# (filter & chart per daerah) langsung memakai daerah hasil join.
+import json
+
+import numpy as np
+import pandas as pd
+
+# optional: shapely >= 2 untuk STRtree & point-in-polygon vektor
+try:
+    import shapely
+    from shapely.geometry import shape
+    SHAPELY_AVAILABLE = True
+except Exception:
+    SHAPELY_AVAILABLE = False
+
+CHUNK_POINTS = 200_000  # titik per query STRtree (memori objek Point terbatas)
+MODES = ("assign", "verify")
+AREA_COLUMNS = ["daerah", "daerah_input", "daerah_spasial"]  # kolom teks yang dibuat / diganti join_daerah
+
+
+class AreaIndex:
+    def __init__(self, names, polygons):
+        self.names = np.asarray(names, dtype=object)
+        self.tree = shapely.STRtree(polygons)
+
+    def locate(self, lats, lons, chunk=CHUNK_POINTS):
+        """Nama daerah per titik (array object; None kalau di luar semua poligon / tanpa koordinat).
+
+        Titik tepat di garis batas ikut poligon yang urutannya lebih dulu di file.
+        """
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        out = np.full(len(lats), None, dtype=object)
+        valid = np.flatnonzero(~(np.isnan(lats) | np.isnan(lons)))
+        for s in range(0, len(valid), chunk):
+            rows = valid[s:s + chunk]
+            pt, area = self.tree.query(shapely.points(lons[rows], lats[rows]), predicate="intersects")
+            order = np.lexsort((area, pt))
+            pt, area = pt[order], area[order]
+            first = np.unique(pt, return_index=True)[1]
+            out[rows[pt[first]]] = self.names[area[first]]
+        return out
+
+
+def load_areas(path, name_field="daerah"):
+    """AreaIndex dari FeatureCollection GeoJSON (Polygon / MultiPolygon, koordinat lon/lat).
+
+    Raise ValueError kalau file tidak bisa dibaca, tidak ada poligon, atau properti `name_field` tidak ada.
+    """
+    if not SHAPELY_AVAILABLE:
+        raise ValueError("shapely belum terpasang (dibutuhkan untuk batas daerah)")
+    try:
+        with open(path, encoding="utf-8") as f:
+            features = json.load(f).get("features", [])
+    except (OSError, ValueError) as e:
+        raise ValueError(f"GeoJSON batas daerah '{path}' tidak bisa dibaca: {e}") from e
+    names, polygons = [], []
+    for feat in features:
+        geom = feat.get("geometry") or {}
+        if geom.get("type") not in ("Polygon", "MultiPolygon"):
+            continue
+        name = (feat.get("properties") or {}).get(name_field)
+        if name is None:
+            raise ValueError(f"fitur GeoJSON tanpa properti '{name_field}'")
+        names.append(str(name).strip())
+        polygons.append(shape(geom))
+    if not polygons:
+        raise ValueError(f"tidak ada poligon di '{path}'")
+    return AreaIndex(names, polygons)
+
+
+def _same(a, b):
+    return a.astype(str).str.strip().str.casefold() == b.astype(str).str.strip().str.casefold()
+
+
+def join_daerah(df, areas, mode="assign"):
+    """Tambah kolom daerah_input (isian asli), daerah_spasial (hasil point-in-polygon, NaN di luar batas)
+    dan daerah_sesuai (isian == hasil join; NA kalau di luar batas).
+
+    mode "assign": kolom daerah diganti daerah_spasial (isian asli dipakai untuk titik di luar batas);
+    mode "verify": kolom daerah tidak diubah, hanya ditandai.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode harus salah satu dari {MODES}")
+    spasial = pd.Series(areas.locate(df["lat"].to_numpy(), df["lon"].to_numpy()), index=df.index, dtype=object)
+    inside = spasial.notna()
+    sesuai = pd.Series(pd.NA, index=df.index, dtype="boolean")
+    sesuai[inside] = _same(df["daerah"][inside], spasial[inside])
+    df = df.assign(daerah_input=df["daerah"], daerah_spasial=spasial, daerah_sesuai=sesuai)
+    if mode == "assign":
+        df["daerah"] = spasial.where(inside, df["daerah"])
+    return df
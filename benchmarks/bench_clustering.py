@@ -0,0 +1,36 @@
+# bench_clustering.py
+# Waktu DBSCAN (grid index, haversine) + convex hull untuk 10k..100k usaha.
+#   python benchmarks/bench_clustering.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from clustering import cluster_hulls, dbscan  # noqa: E402
+
+JEMBER = (-8.1724, 113.7005)
+
+
+def make_points(n, n_centers=200, seed=0):
+    # usaha mengumpul di sekitar "pusat keramaian" + sebagian tersebar acak
+    rng = np.random.default_rng(seed)
+    centers = rng.uniform(-0.25, 0.25, (n_centers, 2))
+    k = int(n * 0.8)
+    pts = np.vstack([centers[rng.integers(n_centers, size=k)] + rng.normal(0, 0.003, (k, 2)),
+                     rng.uniform(-0.3, 0.3, (n - k, 2))])
+    return JEMBER[0] + pts[:, 0], JEMBER[1] + pts[:, 1]
+
+
+if __name__ == "__main__":
+    for n in [10_000, 50_000, 100_000]:
+        lats, lons = make_points(n)
+        t0 = time.perf_counter()
+        labels = dbscan(lats, lons, eps_m=200, min_samples=5)
+        t_db = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        hulls = cluster_hulls(lats, lons, labels)
+        t_hull = time.perf_counter() - t0
+        print(f"n={n:>7,}  dbscan {t_db:6.2f} s | hull {t_hull:6.2f} s | {labels.max() + 1} cluster,"
+              f" noise {np.mean(labels == -1) * 100:4.1f}%")
@@ -0,0 +1,42 @@
+# bench_distance.py
+# Bandingkan geodesic() per baris (cara lama) vs distances_from() versi NumPy (waktu saja;
+# akurasi terhadap geopy dicek di tests/test_geo.py).
+#   python benchmarks/bench_distance.py [jumlah_titik]
+import os
+import sys
+import time
+
+import numpy as np
+from geopy.distance import geodesic
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo import distances_from  # noqa: E402
+
+JEMBER = (-8.1724, 113.7005)
+
+
+def random_points(n, spread=0.15, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = JEMBER[0] + rng.uniform(-spread, spread, n)
+    lons = JEMBER[1] + rng.uniform(-spread, spread, n)
+    return lats, lons
+
+
+def bench(n):
+    lats, lons = random_points(n)
+    t0 = time.perf_counter()
+    [geodesic(JEMBER, (a, b)).meters for a, b in zip(lats, lons)]
+    t_loop = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    distances_from(JEMBER, lats, lons, method="haversine")
+    t_hv = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    distances_from(JEMBER, lats, lons, method="geodesic")
+    t_vc = time.perf_counter() - t0
+    print(f"n={n:>7,}  geopy loop {t_loop * 1000:9.1f} ms | haversine_np {t_hv * 1000:7.2f} ms | vincenty_np {t_vc * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    sizes = [int(sys.argv[1])] if len(sys.argv) > 1 else [1_000, 10_000, 50_000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,39 @@
+# bench_heatmap.py
+# Heatmap lama (semua titik dikirim ke browser) vs grid multi-resolusi (heat_levels):
+# waktu agregasi dan ukuran HTML peta untuk 10k..1M usaha.
+#   python benchmarks/bench_heatmap.py
+import os
+import sys
+import time
+
+import folium
+import numpy as np
+from folium.plugins import HeatMap
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from heatmap import add_heatmap, heat_levels  # noqa: E402
+from synthetic import JEMBER, make_dataset  # noqa: E402
+
+
+def html_mb(m):
+    return len(m.get_root().render()) / 1e6
+
+
+if __name__ == "__main__":
+    for n in [10_000, 100_000, 1_000_000]:
+        df = make_dataset(n)
+        lats, lons, review = df["lat"].to_numpy(), df["lon"].to_numpy(), df["review"].fillna(0).to_numpy()
+
+        old_mb = float("nan")
+        if n <= 100_000:  # 1M titik mentah terlalu berat untuk dirender
+            m = folium.Map(location=JEMBER, zoom_start=12)
+            HeatMap(np.column_stack([lats, lons]).tolist()).add_to(m)
+            old_mb = html_mb(m)
+
+        t0 = time.perf_counter()
+        levels = heat_levels(lats, lons, review)
+        t_bin = time.perf_counter() - t0
+        m = folium.Map(location=JEMBER, zoom_start=12)
+        add_heatmap(m, levels, zoom_start=12)
+        cells = sum(len(v) for v in levels.values())
+        print(f"n={n:>9,}  semua titik {old_mb:7.2f} MB | grid {t_bin:5.2f} s, {cells:,} sel, {html_mb(m):5.2f} MB")
@@ -0,0 +1,33 @@
+# bench_markers.py
+# Waktu build + ukuran HTML peta: marker per baris (MarkerCluster) vs batch (FastMarkerCluster).
+#   python benchmarks/bench_markers.py [--skip-legacy-above N]
+import os
+import sys
+import time
+
+import folium
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_store import normalize  # noqa: E402
+from map_render import add_business_markers, popup_last_line  # noqa: E402
+from synthetic import JEMBER, make_dataset  # noqa: E402
+
+
+def build(df, threshold):
+    t0 = time.perf_counter()
+    m = folium.Map(location=JEMBER, zoom_start=12)
+    add_business_markers(m, df, popup_last_line(df, "review", "Review: {}"), threshold=threshold)
+    html = m.get_root().render()
+    return time.perf_counter() - t0, len(html.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    skip_above = int(sys.argv[sys.argv.index("--skip-legacy-above") + 1]) if "--skip-legacy-above" in sys.argv else 10**9
+    for n in [1_000, 10_000, 100_000]:
+        df = normalize(make_dataset(n))  # review kosong -> 0, seperti saat load
+        t_b, size_b = build(df, threshold=0)
+        line = f"n={n:>7,}  batch {t_b:7.2f} s {size_b / 1e6:8.2f} MB"
+        if n <= skip_above:
+            t_l, size_l = build(df, threshold=n)
+            line += f" | per-marker {t_l:7.2f} s {size_l / 1e6:8.2f} MB"
+        print(line)
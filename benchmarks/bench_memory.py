@@ -0,0 +1,95 @@
+# bench_memory.py
+# Memori (RSS) untuk N sesi dashboard yang aktif bersamaan, tiap skenario di proses Python baru:
+#   per_sesi  : tiap sesi punya frame data sendiri (teks object) + frame hasil filter + kolom jarak di frame penuh
+#               (cara lama map2.py)
+#   bersama   : satu frame compact per versi data untuk semua sesi; per sesi hanya index array (posisi baris
+#               hasil filter dari memo FilterIndex, hasil radius + jarak) dan frame hasil filter dibagi per filter
+#   python benchmarks/bench_memory.py [--rows 200000] [--sessions 50]
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+RADIUS_M = 500
+
+
+def rss_mb():
+    """RSS proses ini sekarang (MB); maxrss kalau /proc tidak ada."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def simulate(scenario, csv_path, sessions, seed=0):
+    """(MB setelah data dimuat, MB setelah semua sesi aktif, MB frame dataset) untuk satu skenario."""
+    import numpy as np
+    import pandas as pd
+
+    from data_store import load_dataset, normalize
+    from filter_index import ALL, FilterIndex
+    from spatial_index import build_index
+
+    base = rss_mb()
+    rng = np.random.default_rng(seed)
+    if scenario == "per_sesi":
+        raw = normalize(pd.read_csv(csv_path)).astype({"nama_usaha": object, "Alamat": object, "Jenis Usaha": object,
+                                                       "daerah": object, "Visited": object})
+    else:
+        raw = load_dataset(csv_path)
+    findex, sindex = FilterIndex(raw), build_index(raw)
+    combos = [(j, d) for j in [ALL] + findex.options("Jenis Usaha")[:3] for d in [ALL] + findex.options("daerah")[:4]]
+    centers = rng.integers(0, len(raw), sessions)
+    loaded = rss_mb() - base
+
+    held, shared_frames = [], {}
+    for s in range(sessions):
+        jenis, daerah = combos[rng.integers(len(combos))]
+        rows = findex.query(jenis, daerah)
+        idx, dist = sindex.query_radius((raw["lat"].iat[centers[s]], raw["lon"].iat[centers[s]]), RADIUS_M)
+        if scenario == "per_sesi":
+            data = raw.copy(deep=True)
+            data["__jarak_tmp"] = np.nan
+            data.loc[data.index[idx], "__jarak_tmp"] = dist
+            data["jarak_m"] = data["__jarak_tmp"]
+            held.append((data, data.iloc[rows].copy()))
+        else:
+            key = (jenis, daerah)
+            if key not in shared_frames:
+                shared_frames[key] = raw.iloc[rows]
+            held.append((rows, shared_frames[key], idx, dist))
+    return loaded, rss_mb() - base, raw.memory_usage(deep=True).sum() / 1e6
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--sessions", type=int, default=50)
+    ap.add_argument("--child", default=None, help=argparse.SUPPRESS)  # dipakai proses anak
+    ap.add_argument("--csv", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        print(*simulate(args.child, args.csv, args.sessions))
+        sys.exit(0)
+
+    from synthetic import write_dataset
+    from data_store import load_dataset
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "usaha.csv")
+        write_dataset(args.rows, csv_path)
+        load_dataset(csv_path)  # snapshot compact ditulis dulu, tidak ikut diukur
+        print(f"{args.rows:,} usaha, {args.sessions} sesi bersamaan")
+        for scenario in ["per_sesi", "bersama"]:
+            out = subprocess.run([sys.executable, __file__, "--child", scenario, "--csv", csv_path,
+                                  "--sessions", str(args.sessions)], cwd=ROOT, capture_output=True, text=True, check=True)
+            loaded, total, frame = map(float, out.stdout.split())
+            print(f"  {scenario:9s} frame data {frame:8.1f} MB | RSS setelah load {loaded:8.1f} MB | "
+                  f"RSS {args.sessions} sesi {total:8.1f} MB | per sesi {(total - loaded) / args.sessions:6.2f} MB")
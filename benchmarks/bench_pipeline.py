@@ -0,0 +1,192 @@
+# bench_pipeline.py
+# Waktu tiap tahap pipeline dashboard tanpa browser, pada dataset sintetis 1k..1M usaha:
+# import tervalidasi, load (CSV & snapshot), spatial join daerah, build index, filter, hitung radius, agregasi chart,
+# build peta, cari nama usaha, tulis & browse catatan, eksport.
+# Hasil disimpan ke JSON; --compare membandingkan dengan hasil lama (mis. versi sebelumnya).
+#   python benchmarks/bench_pipeline.py [--sizes 1000,10000,100000,1000000] [--out hasil.json] [--compare lama.json]
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import folium
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_store import load_dataset  # noqa: E402
+from filter_index import ALL, FilterIndex  # noqa: E402
+from aggregates import Aggregates  # noqa: E402
+from areas import SHAPELY_AVAILABLE, join_daerah, load_areas  # noqa: E402
+from competition import competition_frame  # noqa: E402
+from export import FORMATS, export_file, frame_chunks  # noqa: E402
+from heatmap import heat_levels  # noqa: E402
+from ingest import ingest_csv  # noqa: E402
+from map_render import add_business_markers, popup_last_line  # noqa: E402
+from name_index import NameIndex  # noqa: E402
+from notes_store import NotesStore  # noqa: E402
+from spatial_index import build_index  # noqa: E402
+from synthetic import write_areas, write_dataset  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RADIUS_M = 300
+N_QUERIES = 200
+N_NOTES = 200
+N_SEARCHES = 20
+MAX_MAP_ROWS = 200_000  # peta semua marker di atas ini terlalu berat (mode viewport yang dipakai)
+COMPETITION_RADIUS_M = 100
+MAX_COMPETITION_ROWS = 200_000  # biaya ~ N x kepadatan lokal; di atas ini benchmark jadi terlalu lama
+
+
+def timed(fn, repeat=1):
+    """(hasil terakhir, detik rata-rata per panggilan)."""
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.perf_counter() - t0) / repeat
+
+
+def run_size(n, workdir, seed=0):
+    stages = {}
+    csv_path = os.path.join(workdir, f"usaha_{n}.csv")
+    _, stages["generate_csv"] = timed(lambda: write_dataset(n, csv_path, seed))
+
+    # import lewat pipeline validasi (chunk + swap atomik), hasilnya jadi file yang di-load di bawah
+    _, stages["ingest_csv"] = timed(lambda: ingest_csv(csv_path, csv_path))
+
+    _, stages["load_csv"] = timed(lambda: load_dataset(csv_path))          # parse CSV + tulis snapshot
+    df, stages["load_snapshot"] = timed(lambda: load_dataset(csv_path))    # baca snapshot
+
+    if SHAPELY_AVAILABLE:
+        areas_path = os.path.join(workdir, "batas_daerah.geojson")
+        write_areas(areas_path, seed)
+        areas = load_areas(areas_path)
+        joined, stages["area_join"] = timed(lambda: join_daerah(df, areas))  # point-in-polygon semua usaha
+        stages["mean_daerah_mismatch"] = float(joined["daerah_sesuai"].eq(False).mean())
+
+    sindex, stages["build_spatial_index"] = timed(lambda: build_index(df))
+    findex, stages["build_filter_index"] = timed(lambda: FilterIndex(df))
+
+    jenis, daerah = findex.options("Jenis Usaha")[0], findex.options("daerah")[0]
+    combos = [(ALL, ALL, None, None, False), (jenis, ALL, None, None, False),
+              (ALL, daerah, 10, 5000, False), (jenis, daerah, None, None, True)]
+
+    def _filter():
+        for c in combos:
+            rows = findex._compute(*c)  # tanpa memo -> biaya filter sebenarnya
+            df.iloc[rows]
+    _, t = timed(_filter)
+    stages["filter"] = t / len(combos)
+
+    rng = np.random.default_rng(seed)
+    centers = rng.integers(0, n, N_QUERIES)
+    lats, lons = df["lat"].to_numpy(), df["lon"].to_numpy()
+    counts, t = timed(lambda: [len(sindex.query_radius((lats[c], lons[c]), RADIUS_M)[0]) for c in centers])
+    stages["radius_count"] = t / N_QUERIES
+
+    def _aggregations():
+        df["daerah"].value_counts()
+        df["Jenis Usaha"].value_counts()
+        df.nlargest(10, "review")
+    _, stages["aggregations"] = timed(_aggregations)
+    agg, stages["aggregates_build"] = timed(lambda: Aggregates(df))
+    rows = findex._compute(jenis, ALL, None, None, False)
+    _, stages["aggregates_filtered"] = timed(lambda: agg.table("daerah", ("bench", jenis), rows))
+
+    if n <= MAX_COMPETITION_ROWS:
+        _, stages["competition"] = timed(lambda: competition_frame(df, COMPETITION_RADIUS_M))
+
+    _, stages["heatmap_levels"] = timed(lambda: heat_levels(lats, lons, df["review"].to_numpy(dtype=float)))
+
+    if n <= MAX_MAP_ROWS:
+        def _map():
+            m = folium.Map(location=[float(np.nanmedian(lats)), float(np.nanmedian(lons))], zoom_start=12)
+            add_business_markers(m, df, popup_last_line(df, "review", "Review: {}"))
+            return m.get_root().render()
+        html, stages["map_build"] = timed(_map)
+        stages["map_html_mb"] = len(html) / 1e6
+
+    names_ix, stages["name_index_build"] = timed(lambda: NameIndex(df))
+    _, stages["name_search_first"] = timed(lambda: names_ix.search("a"))  # struktur pencarian dibangun di sini
+    # prefix kata pertama & salah ketik (huruf kedua dibuang) dari nama usaha acak
+    words = [str(df["nama_usaha"].iat[c]).split()[0].lower() for c in centers[:N_SEARCHES]]
+    queries = [w[:4] if i % 2 else w[0] + w[2:] for i, w in enumerate(words)]
+    _, t = timed(lambda: [names_ix.search(q, page=1) for q in queries])
+    stages["name_search"] = t / len(queries)
+
+    store = NotesStore(os.path.join(workdir, f"notes_{n}.db"))
+    names = df["nama_usaha"].to_numpy()
+
+    def _notes():
+        for i in range(N_NOTES):
+            store.add(datetime.now().strftime("%Y-%m-%d %H:%M:%S"), names[i % n], lats[i % n], lons[i % n], "bench")
+    _, t = timed(_notes)
+    stages["note_write"] = t / N_NOTES
+    _, stages["notes_page"] = timed(lambda: (store.count(search="bench"), store.page(50, 50, "nama_usaha", search="bench")))
+    if "parquet" in FORMATS:
+        _, stages["export_parquet"] = timed(lambda: export_file(lambda: frame_chunks(df), "parquet").close())
+    stages["mean_in_radius"] = float(np.mean(counts))
+    return stages
+
+
+def meta():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(new, old_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    print(f"\nbanding dengan {old_path} (commit {old['meta'].get('commit')}):")
+    for n, stages in new["results"].items():
+        base = old["results"].get(n, {})
+        for stage, v in stages.items():
+            if stage in base and base[stage] > 0 and not stage.startswith(("map_html", "mean_")):
+                ratio = v / base[stage]
+                flag = "  <-- lebih lambat" if ratio > 1.2 else ""
+                print(f"  n={int(n):>9,}  {stage:20s} {ratio:5.2f}x{flag}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES))
+    ap.add_argument("--out", default=None, help="file JSON hasil (default: benchmarks/results/pipeline_<waktu>.json)")
+    ap.add_argument("--compare", default=None, help="file JSON hasil lama untuk dibandingkan")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    result = {"meta": meta(), "results": {}}
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            stages = run_size(n, workdir, args.seed)
+            result["results"][str(n)] = stages
+            print(f"n={n:>9,}  " + " | ".join(
+                f"{k} {v * 1000:.1f} ms" if not k.startswith(("map_html", "mean_")) else f"{k} {v:.2f}"
+                for k, v in stages.items()))
+
+    out = args.out or os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                   f"pipeline_{datetime.now():%Y%m%d_%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"hasil: {out}")
+    if args.compare:
+        compare(result, args.compare)
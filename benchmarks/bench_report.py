@@ -0,0 +1,37 @@
+# bench_report.py
+# Waktu laporan batch (report.py) untuk semua daerah + beberapa titik pusat x radius pada dataset sintetis,
+# dengan jumlah proses worker berbeda (skala process pool).
+#   python benchmarks/bench_report.py [JUMLAH_BARIS] [WORKERS,...]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import report  # noqa: E402
+from synthetic import write_dataset  # noqa: E402
+
+N_CENTERS = 20
+RADII = "300,1000"
+
+
+def bench(n, workers_list):
+    with tempfile.TemporaryDirectory() as workdir:
+        csv_path = os.path.join(workdir, "usaha.csv")
+        df = write_dataset(n, csv_path)
+        centers_path = os.path.join(workdir, "pusat.txt")
+        with open(centers_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(df["nama_usaha"].sample(N_CENTERS, random_state=0)))
+        report.main(["--data", csv_path, "--out", os.path.join(workdir, "warmup"), "--daerah", "Gebang",
+                     "--workers", "1", "--areas", ""])  # tulis snapshot dulu, tidak ikut diukur
+        for w in workers_list:
+            t0 = time.perf_counter()
+            report.main(["--data", csv_path, "--out", os.path.join(workdir, f"w{w}"), "--daerah", "all",
+                         "--centers-file", centers_path, "--radius", RADII, "--workers", str(w), "--areas", ""])
+            print(f"n={n:>9,}  workers={w:>2}  {time.perf_counter() - t0:8.2f} s")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = [int(x) for x in sys.argv[2].split(",")] if len(sys.argv) > 2 else sorted({1, os.cpu_count() or 1})
+    bench(n, workers)
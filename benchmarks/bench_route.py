@@ -0,0 +1,32 @@
+# bench_route.py
+# Panjang rute & waktu solve planner kunjungan (nearest neighbour vs + 2-opt/Or-opt).
+#   python benchmarks/bench_route.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from route import plan_route  # noqa: E402
+
+JEMBER = (-8.1724, 113.7005)
+
+
+def bench(n, return_to_start=False, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = JEMBER[0] + rng.uniform(-0.05, 0.05, n)
+    lons = JEMBER[1] + rng.uniform(-0.05, 0.05, n)
+    t0 = time.perf_counter()
+    order, length, nn_len = plan_route(JEMBER, lats, lons, return_to_start=return_to_start)
+    dt = time.perf_counter() - t0
+    assert sorted(order.tolist()) == list(range(n))
+    mode = "kembali" if return_to_start else "terbuka"
+    print(f"n={n:>4} ({mode:7})  NN {nn_len / 1000:8.2f} km -> optimasi {length / 1000:8.2f} km"
+          f" ({(1 - length / nn_len) * 100:5.1f}% lebih pendek)  solve {dt * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    for n in [20, 50, 100, 200, 400]:
+        bench(n)
+    bench(200, return_to_start=True)
@@ -0,0 +1,57 @@
+# bench_spatial_index.py
+# Waktu query radius: GridIndex vs scan NumPy penuh, dengan jumlah baris yang terus naik.
+# Kepadatan usaha dibuat tetap (area ikut membesar), seperti data satu kota -> satu provinsi.
+#   python benchmarks/bench_spatial_index.py
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo import distances_from  # noqa: E402
+from spatial_index import GridIndex  # noqa: E402
+
+JEMBER = (-8.1724, 113.7005)
+DENSITY_PER_KM2 = 60      # kira-kira kepadatan data contoh di pusat kota
+RADIUS_M = 300
+N_QUERIES = 200
+
+
+def make_points(n, seed=0):
+    rng = np.random.default_rng(seed)
+    half_km = np.sqrt(n / DENSITY_PER_KM2) / 2
+    spread = half_km / 111.32
+    return (JEMBER[0] + rng.uniform(-spread, spread, n),
+            JEMBER[1] + rng.uniform(-spread, spread, n))
+
+
+def bench(n):
+    lats, lons = make_points(n)
+    rng = np.random.default_rng(1)
+    centers = rng.integers(0, n, N_QUERIES)
+
+    t0 = time.perf_counter()
+    ix = GridIndex(lats, lons)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    hits = 0
+    for i in centers:
+        idx, _ = ix.query_radius((lats[i], lons[i]), RADIUS_M)
+        hits += len(idx)
+    t_index = (time.perf_counter() - t0) / N_QUERIES
+
+    t0 = time.perf_counter()
+    for i in centers:
+        d = distances_from((lats[i], lons[i]), lats, lons)
+        np.flatnonzero(d <= RADIUS_M)
+    t_scan = (time.perf_counter() - t0) / N_QUERIES
+
+    print(f"n={n:>9,}  build {t_build * 1000:8.1f} ms | query index {t_index * 1e6:8.1f} us"
+          f" | query scan {t_scan * 1e6:10.1f} us | rata2 hasil {hits / N_QUERIES:6.1f}")
+
+
+if __name__ == "__main__":
+    for n in [1_000, 10_000, 100_000, 1_000_000]:
+        bench(n)
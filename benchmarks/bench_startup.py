@@ -0,0 +1,73 @@
+# bench_startup.py
+# Cold start dashboard: waktu import tiap modul halaman (views/) di proses Python baru,
+# dan waktu rerun pertama tiap halaman lewat streamlit AppTest (tanpa browser).
+#   python benchmarks/bench_startup.py [--repeat 3] [--no-apptest]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from views import PAGES  # noqa: E402
+
+# import dasar map2.py (tanpa halaman) sebagai pembanding
+BASE = "import streamlit, data_store, watcher, filter_index, notes_store, diagnostics, views"
+
+
+def import_seconds(stmt, repeat):
+    """Median waktu `stmt` (setelah import dasar) di proses baru, supaya tidak ada modul yang sudah ter-cache."""
+    code = (f"import time; t0 = time.perf_counter(); {BASE}; t1 = time.perf_counter(); {stmt}; "
+            "print(t1 - t0, time.perf_counter() - t1)")
+    base, extra = [], []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        b, e = map(float, out.stdout.split())
+        base.append(b)
+        extra.append(e)
+    return statistics.median(base), statistics.median(extra)
+
+
+def first_paint_seconds(page):
+    """(rerun pertama app, rerun saat pindah ke `page`) dalam detik, lewat AppTest di proses ini."""
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.join(ROOT, "map2.py"), default_timeout=300)
+    at.query_params["diag"] = "1"
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    if page == "Dashboard Utama":
+        return first, first
+    t0 = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    return first, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--no-apptest", action="store_true")
+    ap.add_argument("--first-paint", default=None, help=argparse.SUPPRESS)  # dipakai proses anak
+    args = ap.parse_args()
+
+    if args.first_paint:
+        os.chdir(ROOT)
+        print(*first_paint_seconds(args.first_paint))
+        sys.exit(0)
+
+    base, _ = import_seconds("pass", args.repeat)
+    print(f"import dasar map2.py: {base * 1000:.0f} ms")
+    for page, module in PAGES.items():
+        _, extra = import_seconds(f"import views.{module}", args.repeat)
+        print(f"  + views.{module:16s} {extra * 1000:7.0f} ms   ({page})")
+
+    if not args.no_apptest:
+        # proses baru per halaman: import halaman yang dibuka ikut terhitung (cold)
+        print("AppTest, proses baru per halaman:")
+        for page in PAGES:
+            out = subprocess.run([sys.executable, os.path.abspath(__file__), "--first-paint", page],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            first, paint = map(float, out.stdout.split()[-2:])
+            print(f"  {page:16s} rerun pertama {first * 1000:7.0f} ms · buka halaman {paint * 1000:7.0f} ms")
@@ -0,0 +1,27 @@
+# bench_viewport.py
+# Mode viewport: waktu query_bbox (GridIndex) + bangun layer area terlihat untuk 100k..1M usaha,
+# pada zoom jauh (jumlah per sel) dan zoom dekat (marker per usaha).
+#   python benchmarks/bench_viewport.py
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spatial_index import GridIndex  # noqa: E402
+from synthetic import JEMBER, make_dataset  # noqa: E402
+from viewport import bounds_from_view, pad, viewport_layer, visible_rows  # noqa: E402
+
+
+if __name__ == "__main__":
+    for n in [100_000, 1_000_000]:
+        df = make_dataset(n)
+        ix = GridIndex(df["lat"].to_numpy(), df["lon"].to_numpy())
+        for zoom in [10, 13, 17]:
+            t0 = time.perf_counter()
+            rows = visible_rows(ix, None, pad(bounds_from_view(JEMBER, zoom, 900, 545)))
+            t_q = time.perf_counter() - t0
+            t0 = time.perf_counter()
+            fg = viewport_layer(df, rows, zoom, lambda r: ["-"] * len(r))
+            t_layer = time.perf_counter() - t0
+            print(f"n={n:>9,} zoom {zoom:2d}: {len(rows):>9,} titik terlihat -> {len(fg._children):>5,} objek"
+                  f" | query {t_q * 1000:7.1f} ms | layer {t_layer * 1000:7.1f} ms")
@@ -0,0 +1,105 @@
+# synthetic.py
+# Dataset usaha sintetis dengan skema yang sama seperti cobalagi_daerah.csv, di sekitar Jember.
+# Usaha mengumpul di pusat-pusat daerah (kelurahan) yang lebih padat di tengah kota,
+# jenis usaha & jumlah review mengikuti sebaran kasar data asli (review berekor panjang, sebagian kosong).
+# Batas daerah sintetis (GeoJSON) = sel Voronoi pusat-pusat daerah, jadi sebagian usaha pinggiran "salah daerah".
+#   python benchmarks/synthetic.py 100000 data_100k.csv
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+JEMBER = (-8.1724, 113.7005)
+
+COLUMNS = ["nama_usaha", "Rating", "review", "lat", "lon", "Alamat", "Notes", "Visited", "Jenis Usaha", "daerah"]
+
+# jenis usaha -> proporsi (kira-kira dari data contoh)
+JENIS_USAHA = {
+    "Restaurant": 0.31, "Hotel": 0.27, "Rumah Sakit": 0.21, "Klinik": 0.11,
+    "Cafe": 0.07, "Toko Kue": 0.02, "Puskesmas": 0.01,
+}
+
+DAERAH = [
+    "Gebang", "Sumbersari", "Patrang", "Jember Kidul", "Kepatihan", "Kaliwates", "Tegal Besar",
+    "Baratan", "Jemberlor", "Slawu", "Bintoro", "Kebonsari", "Karangrejo", "Wirolegi", "Kranjingan",
+    "Mangli", "Antirogo", "Tegalgede", "Sempusari", "Kebonagung", "Arjasa", "Ajung", "Rambipuji",
+    "Balung", "Ambulu", "Kalisat", "Tanggul", "Puger", "Wuluhan", "Glenmore",
+]
+
+
+def daerah_centers(seed=0):
+    """Pusat tiap daerah: daerah awal (kota) dekat pusat Jember, sisanya makin jauh ke pinggir."""
+    rng = np.random.default_rng(seed)
+    k = len(DAERAH)
+    dist = np.linspace(0.005, 0.35, k) * rng.uniform(0.7, 1.0, k)
+    ang = rng.uniform(0, 2 * np.pi, k)
+    return JEMBER[0] + dist * np.sin(ang), JEMBER[1] + dist * np.cos(ang)
+
+
+def make_points(n, seed=0):
+    """(lats, lons, index daerah) untuk n usaha, padat di daerah kota dan jarang di pinggiran."""
+    rng = np.random.default_rng(seed)
+    clat, clon = daerah_centers(seed)
+    k = len(DAERAH)
+    weight = 1.0 / np.arange(1, k + 1) ** 0.8  # daerah kota lebih banyak usaha
+    d = rng.choice(k, n, p=weight / weight.sum())
+    spread = 0.004 + 0.02 * np.arange(k) / k  # daerah pinggiran lebih tersebar
+    lats = clat[d] + rng.normal(0, 1, n) * spread[d]
+    lons = clon[d] + rng.normal(0, 1, n) * spread[d]
+    return lats, lons, d
+
+
+def make_dataset(n, seed=0, missing_review=0.07):
+    """DataFrame n usaha sintetis dengan kolom COLUMNS."""
+    rng = np.random.default_rng(seed)
+    lats, lons, d = make_points(n, seed)
+    jenis_names = np.array(list(JENIS_USAHA))
+    p = np.array(list(JENIS_USAHA.values()))
+    jenis = jenis_names[rng.choice(len(jenis_names), n, p=p / p.sum())]
+    daerah = np.array(DAERAH)[d]
+    review = np.floor(rng.lognormal(5.0, 1.8, n)).clip(0, 20000)
+    review[rng.random(n) < missing_review] = np.nan
+    ids = np.arange(n)
+    return pd.DataFrame({
+        "nama_usaha": pd.Series(jenis).str.cat(ids.astype(str), sep=" ") + " " + daerah,
+        "Rating": np.round(rng.uniform(3.5, 5.0, n), 1),
+        "review": review,
+        "lat": np.round(lats, 7),
+        "lon": np.round(lons, 7),
+        "Alamat": "Jl. Contoh No." + pd.Series(ids % 200 + 1).astype(str) + ", " + daerah + ", Kabupaten Jember",
+        "Notes": "",
+        "Visited": "No",
+        "Jenis Usaha": jenis,
+        "daerah": daerah,
+    }, columns=COLUMNS)
+
+
+def write_dataset(n, path, seed=0):
+    df = make_dataset(n, seed)
+    df.to_csv(path, index=False)
+    return df
+
+
+def write_areas(path, seed=0, margin=0.5):
+    """GeoJSON batas daerah sintetis (properti "daerah"): sel Voronoi pusat daerah, dipotong ke kotak sekitar Jember."""
+    import shapely
+    from shapely.geometry import MultiPoint, box, mapping
+    clat, clon = daerah_centers(seed)
+    bounds = box(JEMBER[1] - margin, JEMBER[0] - margin, JEMBER[1] + margin, JEMBER[0] + margin)
+    cells = shapely.voronoi_polygons(MultiPoint(list(zip(clon, clat))), extend_to=bounds).geoms
+    features = []
+    for cell in cells:
+        # urutan sel Voronoi tidak sama dengan urutan titik: cocokkan lewat pusat yang ada di dalam sel
+        k = next(i for i in range(len(DAERAH)) if cell.covers(shapely.Point(clon[i], clat[i])))
+        features.append({"type": "Feature", "properties": {"daerah": DAERAH[k]},
+                         "geometry": mapping(cell.intersection(bounds))})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": features}, f)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("pakai: python benchmarks/synthetic.py JUMLAH_BARIS OUTPUT.csv [SEED]")
+        sys.exit(1)
+    write_dataset(int(sys.argv[1]), sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 0)
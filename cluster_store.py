@@ -0,0 +1,136 @@
+# cluster_store.py
+# Cluster manual (nama, warna, tampil/tidak, daftar nama_usaha anggota) di SQLite (mode WAL):
+# tetap ada setelah restart dan dipakai bersama semua petugas. Setiap perubahan menaikkan `revision`
+# (key cache peta). Geometri cluster (posisi & koordinat anggota, convex hull, centroid) di-memo per
+# (versi data, anggota), jadi hanya dihitung ulang kalau anggota cluster atau datanya berubah.
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from name_index import NameIndex
+
+DEFAULT_COLOR = "#22c55e"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clusters (
+    name TEXT PRIMARY KEY,
+    color TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    members TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def member_hull(lats, lons):
+    """(coords hull [(lat, lon)] atau None, centroid (lat, lon) atau None) untuk titik-titik satu cluster.
+
+    coords None kalau titik < 3, segaris, atau shapely tidak ada (lihat clustering.cluster_hulls).
+    """
+    if len(lats) == 0:
+        return None, None
+    from clustering import cluster_hulls  # shapely baru di-import saat ada cluster yang digambar
+    h = cluster_hulls(lats, lons, np.zeros(len(lats), dtype=int))[0]
+    return h["coords"], h["centroid"]
+
+
+class ClusterStore:
+    def __init__(self, db_path, memo_size=256):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._snapshot = (None, {})
+        self._geom = OrderedDict()
+        self._memo_size = memo_size
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self):
+        # satu koneksi per thread (tiap sesi Streamlit jalan di thread sendiri)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def revision(self):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = 'revision'").fetchone()
+        return int(row[0]) if row else 0
+
+    def snapshot(self):
+        """(revision, {nama: {"color", "active", "members"}}) urut waktu dibuat.
+
+        Tabel dibaca ulang hanya kalau revision berubah (juga perubahan dari proses lain);
+        dict dipakai bersama semua sesi, jangan diubah.
+        """
+        rev = self.revision()
+        with self._lock:
+            if self._snapshot[0] == rev:
+                return self._snapshot
+        cur = self._conn().execute("SELECT name, color, active, members FROM clusters ORDER BY rowid")
+        clusters = {name: {"color": color, "active": bool(active), "members": tuple(json.loads(members))}
+                    for name, color, active, members in cur.fetchall()}
+        with self._lock:
+            self._snapshot = (rev, clusters)
+        return rev, clusters
+
+    def all(self):
+        return self.snapshot()[1]
+
+    def _write(self, sql, params):
+        conn = self._conn()
+        with conn:
+            cur = conn.execute(sql, params)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('revision', '1') "
+                         "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+        return cur.rowcount
+
+    def save(self, name, color=DEFAULT_COLOR, members=(), active=True):
+        """Buat cluster baru atau timpa cluster bernama sama."""
+        self._write(
+            "INSERT INTO clusters (name, color, active, members) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET color = excluded.color, active = excluded.active, "
+            "members = excluded.members",
+            (name, color, int(bool(active)), self._members_json(members)))
+
+    def set_active(self, name, active):
+        return self._write("UPDATE clusters SET active = ? WHERE name = ?", (int(bool(active)), name))
+
+    def set_color(self, name, color):
+        return self._write("UPDATE clusters SET color = ? WHERE name = ?", (color, name))
+
+    def set_members(self, name, members):
+        return self._write("UPDATE clusters SET members = ? WHERE name = ?", (self._members_json(members), name))
+
+    def delete(self, name):
+        return self._write("DELETE FROM clusters WHERE name = ?", (name,))
+
+    @staticmethod
+    def _members_json(members):
+        return json.dumps(list(dict.fromkeys(str(m) for m in members)))  # unik, urutan dipertahankan
+
+    def geometry(self, members, dataset):
+        """Anggota cluster pada versi data `dataset`: dict rows (posisi baris), lats, lons (anggota yang
+        ada & berkoordinat), coords (hull [(lat, lon)] atau None) dan centroid (lat, lon) atau None."""
+        key = (dataset.content_version, tuple(members))
+        with self._lock:
+            if key in self._geom:
+                self._geom.move_to_end(key)
+                return self._geom[key]
+        df = dataset.df
+        rows = dataset.derived("name_index", NameIndex).rows(members)
+        lats = df["lat"].iloc[rows].to_numpy(dtype=float)
+        lons = df["lon"].iloc[rows].to_numpy(dtype=float)
+        ok = ~(np.isnan(lats) | np.isnan(lons))
+        rows, lats, lons = rows[ok], lats[ok], lons[ok]
+        coords, centroid = member_hull(lats, lons)
+        geom = {"rows": rows, "lats": lats, "lons": lons, "coords": coords, "centroid": centroid}
+        with self._lock:
+            self._geom[key] = geom
+            if len(self._geom) > self._memo_size:
+                self._geom.popitem(last=False)
+        return geom
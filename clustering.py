@@ -0,0 +1,99 @@
+# clustering.py
+# Segmentasi otomatis usaha: DBSCAN dengan jarak haversine.
+# Tetangga dicari lewat GridIndex (hanya sel bertetangga), bukan matriks all-pairs,
+# jadi 100k titik tetap muat & cepat di satu mesin.
+import numpy as np
+
+from spatial_index import GridIndex
+
+# optional: shapely untuk convex hull
+try:
+    from shapely.geometry import MultiPoint
+    SHAPELY_AVAILABLE = True
+except Exception:
+    SHAPELY_AVAILABLE = False
+
+NOISE = -1
+
+
+def _components(n, a, b):
+    """Label komponen terhubung (hook + pointer jumping, semua vektor)."""
+    parent = np.arange(n)
+    while True:
+        pa, pb = parent[a], parent[b]
+        diff = pa != pb
+        if not diff.any():
+            return parent
+        np.minimum.at(parent, np.maximum(pa, pb)[diff], np.minimum(pa, pb)[diff])
+        while True:
+            pp = parent[parent]
+            if (pp == parent).all():
+                break
+            parent = pp
+
+
+def dbscan(lats, lons, eps_m=200, min_samples=5):
+    """Label cluster per titik (0..k-1, NOISE = -1), diurutkan dari cluster terbesar.
+
+    Sama dengan DBSCAN biasa: titik inti punya >= min_samples titik (termasuk dirinya) dalam eps_m.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    n = len(lats)
+    labels = np.full(n, NOISE, dtype=np.int64)
+    if n == 0:
+        return labels
+    ix = GridIndex(lats, lons, cell_m=eps_m)
+    i, j, _ = ix.neighbour_pairs(eps_m)
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    counts = np.bincount(i, minlength=n) + np.bincount(j, minlength=n) + 1
+    core = valid & (counts >= min_samples)
+    if not core.any():
+        return labels
+
+    cc = core[i] & core[j]
+    root = _components(n, i[cc], j[cc])
+    labels[core] = root[core]
+    # titik tepi: bukan inti tapi bertetangga dengan titik inti
+    for a, b in ((i, j), (j, i)):
+        edge = core[a] & ~core[b] & (labels[b] == NOISE)
+        labels[b[edge]] = root[a[edge]]
+
+    # nomori ulang 0..k-1, cluster terbesar dapat nomor terkecil
+    clustered = labels != NOISE
+    uniq, inv, sizes = np.unique(labels[clustered], return_inverse=True, return_counts=True)
+    rank = np.empty(len(uniq), dtype=np.int64)
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(len(uniq))
+    labels[clustered] = rank[inv]
+    return labels
+
+
+def cluster_hulls(lats, lons, labels, max_clusters=None):
+    """Convex hull tiap cluster -> list dict(label, size, coords [(lat, lon)], centroid (lat, lon)).
+
+    coords None kalau hull tidak berbentuk poligon (titik < 3 atau segaris) atau shapely tidak ada.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    labels = np.asarray(labels)
+    keep = labels != NOISE
+    if not keep.any():
+        return []
+    order = np.argsort(labels[keep], kind="stable")
+    lab_sorted = labels[keep][order]
+    la, lo = lats[keep][order], lons[keep][order]
+    uniq, starts = np.unique(lab_sorted, return_index=True)
+    ends = np.append(starts[1:], len(lab_sorted))
+    out = []
+    for lab, s, e in zip(uniq, starts, ends):
+        if max_clusters is not None and len(out) >= max_clusters:
+            break
+        coords = None
+        clat, clon = float(la[s:e].mean()), float(lo[s:e].mean())
+        if SHAPELY_AVAILABLE and e - s >= 3:
+            poly = MultiPoint(list(zip(lo[s:e], la[s:e]))).convex_hull  # shapely: (x, y) = (lon, lat)
+            if poly.geom_type == "Polygon":
+                coords = [(y, x) for x, y in poly.exterior.coords]
+                clat, clon = poly.centroid.y, poly.centroid.x
+        out.append({"label": int(lab), "size": int(e - s), "coords": coords, "centroid": (clat, clon)})
+    return out
@@ -0,0 +1,197 @@
+# competition.py
+# Analisis kepadatan kompetisi untuk SEMUA usaha sekaligus: jumlah tetangga dalam radius R
+# (total & per Jenis Usaha) dan jarak ke kompetitor (usaha sejenis) terdekat.
+# Pasangan tetangga dicari lewat sel GridIndex yang bertetangga, diproses per blok sel (memori terbatas,
+# pasangan tidak pernah dikumpulkan semua) dan blok-blok dibagi ke beberapa thread worker (numpy melepas GIL).
+# Jarak dibandingkan sebagai chord (vektor satuan 3D): monoton terhadap jarak haversine, tanpa trigonometri per pasangan.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from geo import R_EARTH
+from spatial_index import GridIndex, M_PER_DEG_LAT
+
+PAIR_BUDGET = 2_000_000  # perkiraan pasangan kandidat per blok (batas memori per worker)
+
+
+def _offsets(ix, radius_m):
+    """Geseran sel (dy, dx) yang bisa berisi titik dalam radius; sel pojok yang pasti lebih jauh dilewati."""
+    valid_lats = ix.lats[ix.order]
+    cos_min = max(np.cos(np.radians(min(float(np.max(np.abs(valid_lats))) + radius_m / M_PER_DEG_LAT, 89.9))), 1e-6)
+    cell_y = ix.lat_step * M_PER_DEG_LAT * (1 - 1e-9)
+    cell_x = ix.lon_step * M_PER_DEG_LAT * cos_min * (1 - 1e-9)
+    ry, rx = int(np.ceil(radius_m / cell_y)), int(np.ceil(radius_m / cell_x))
+    return [(dy, dx) for dy in range(-ry, ry + 1) for dx in range(-rx, rx + 1)
+            if np.hypot(max(abs(dy) - 1, 0) * cell_y, max(abs(dx) - 1, 0) * cell_x) <= radius_m]
+
+
+def _blocks(ix, n_offsets):
+    """Potongan sel [c0, c1) dengan jumlah pasangan kandidat kira-kira <= PAIR_BUDGET."""
+    counts = ix.ends - ix.starts
+    # perkiraan kandidat per titik: rata-rata isi sel (dibobot titik) x jumlah sel di jendela
+    per_row = max(1.0, float((counts ** 2).sum()) / max(1, counts.sum()) * n_offsets)
+    rows_per_block = max(64, int(PAIR_BUDGET / per_row))
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(rows_per_block, counts.sum(), rows_per_block))
+    edges = np.unique(np.concatenate([[0], np.minimum(bounds + 1, len(counts)), [len(counts)]]))
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _unit_vectors(lats, lons):
+    la, lo = np.radians(lats), np.radians(lons)
+    return np.cos(la) * np.cos(lo), np.cos(la) * np.sin(lo), np.sin(la)
+
+
+def _chord2(dist_m):
+    return (2 * np.sin(np.asarray(dist_m) / (2 * R_EARTH))) ** 2
+
+
+def _arc_m(chord2):
+    return 2 * R_EARTH * np.arcsin(np.minimum(np.sqrt(chord2) / 2, 1.0))
+
+
+def _count_block(ix, xyz, codes, k, radius_m, offsets, c0, c1):
+    """Tetangga per jenis (baris blok x k) + chord^2 sejenis terdekat dalam radius, untuk sel [c0, c1).
+
+    xyz & codes sudah diurutkan seperti ix.order (posisi, bukan nomor baris), supaya akses memori berurutan.
+    """
+    counts = ix.ends - ix.starts
+    r0, r1 = ix.starts[c0], ix.ends[c1 - 1]
+    per_jenis = np.zeros((r1 - r0) * k, dtype=np.int64)
+    nearest = np.full(r1 - r0, np.inf)
+    x, y, z = xyz
+    limit = _chord2(radius_m)
+    cells = np.arange(c0, c1)
+    for dy, dx in offsets:
+        want = ix._cell_key(ix.cell_cy[cells] + dy, ix.cell_cx[cells] + dx)
+        pos = np.searchsorted(ix.keys, want)
+        ok = pos < len(ix.keys)
+        ok[ok] = ix.keys[pos[ok]] == want[ok]
+        a_cells, b_cells = cells[ok], pos[ok]
+        if len(a_cells) == 0:
+            continue
+        ca, cb = counts[a_cells], counts[b_cells]
+        sizes = ca * cb
+        pair_cell = np.repeat(np.arange(len(a_cells)), sizes)
+        within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        q, rem = np.divmod(within, cb[pair_cell])
+        i = ix.starts[a_cells][pair_cell] + q  # posisi di ix.order
+        j = ix.starts[b_cells][pair_cell] + rem
+        d = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2
+        close = (d <= limit) & (i != j)
+        i, j, d = i[close], j[close], d[close]
+        cj = codes[j]
+        per_jenis += np.bincount((i - r0) * k + cj, minlength=len(per_jenis))
+        same = codes[i] == cj
+        np.minimum.at(nearest, i[same] - r0, d[same])
+    return r0, r1, per_jenis.reshape(-1, k), nearest
+
+
+def _nearest_within(ix, xyz, src, radius_m):
+    """chord^2 ke titik lain terdekat dalam radius untuk posisi `src` (posisi di ix.order); inf kalau tidak ada."""
+    x, y, z = xyz
+    best = np.full(len(src), np.inf)
+    cell = np.searchsorted(ix.starts, src, side="right") - 1
+    limit = _chord2(radius_m)
+    for dy, dx in _offsets(ix, radius_m):
+        want = ix._cell_key(ix.cell_cy[cell] + dy, ix.cell_cx[cell] + dx)
+        pos = np.searchsorted(ix.keys, want)
+        ok = pos < len(ix.keys)
+        ok[ok] = ix.keys[pos[ok]] == want[ok]
+        owners, b_cells = np.flatnonzero(ok), pos[ok]
+        cb = ix.ends[b_cells] - ix.starts[b_cells]
+        owner = np.repeat(owners, cb)
+        j = np.repeat(ix.starts[b_cells], cb) + np.arange(cb.sum()) - np.repeat(np.cumsum(cb) - cb, cb)
+        i = src[owner]
+        d = (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2
+        close = (d <= limit) & (i != j)
+        np.minimum.at(best, owner[close], d[close])
+    return best
+
+
+def _nearest_same(lats, lons, members, rows, radius_m):
+    """Jarak (meter) ke usaha lain di `members` (satu jenis) untuk `rows` (bagian dari members).
+
+    Dicari bertahap dengan radius 2R, 4R, ... hanya untuk baris yang belum ketemu; jendela sel tetap
+    kecil karena ukuran sel ikut membesar.
+    """
+    out = np.full(len(rows), np.nan)
+    todo = np.arange(len(rows))
+    local = np.searchsorted(members, rows)
+    r = radius_m * 2
+    while len(todo):
+        ix = GridIndex(lats[members], lons[members], cell_m=r / 3)
+        pos_of = np.empty(len(members), dtype=np.int64)
+        pos_of[ix.order] = np.arange(len(ix.order))
+        xyz = _unit_vectors(lats[members][ix.order], lons[members][ix.order])
+        best = _nearest_within(ix, xyz, pos_of[local[todo]], r)
+        found = np.isfinite(best)
+        out[todo[found]] = _arc_m(best[found])
+        todo = todo[~found]
+        if len(ix.keys) <= 1:
+            break  # semua titik sudah dalam satu sel & tetap tidak ada tetangga
+        r *= 2
+    return out
+
+
+def competition_frame(df, radius_m, workers=None):
+    """DataFrame (index = df.index) berisi kolom analisis kompetisi untuk radius_m meter:
+
+    tetangga_total, tetangga_<Jenis Usaha> (per jenis), kompetitor_sejenis (tetangga dengan jenis sama)
+    dan kompetitor_terdekat_m (jarak usaha sejenis terdekat, tanpa batas radius; NaN kalau tidak ada).
+    Usaha tanpa koordinat mendapat 0 / NaN.
+    """
+    workers = workers or min(8, os.cpu_count() or 1)
+    lats = df["lat"].to_numpy(dtype=float)
+    lons = df["lon"].to_numpy(dtype=float)
+    cat = pd.Categorical(df["Jenis Usaha"])
+    labels = [str(c) for c in cat.categories] + ["(kosong)"]
+    k = len(labels)
+    codes = np.asarray(cat.codes, dtype=np.int64)
+    codes[codes < 0] = k - 1
+
+    n = len(df)
+    per_jenis = np.zeros((n, k), dtype=np.int64)
+    nearest = np.full(n, np.inf)
+    # sel sepertiga radius: jendela kandidat ~5 R^2 (lingkaran radius = 3.14 R^2)
+    ix = GridIndex(lats, lons, cell_m=max(radius_m / 3, 10))
+    if len(ix.keys):
+        offsets = _offsets(ix, radius_m)
+        xyz = _unit_vectors(lats[ix.order], lons[ix.order])
+        sorted_codes = codes[ix.order]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_count_block, ix, xyz, sorted_codes, k, radius_m, offsets, c0, c1)
+                       for c0, c1 in _blocks(ix, len(offsets))]
+            for f in futures:
+                r0, r1, pj, near = f.result()
+                rows = ix.order[r0:r1]
+                per_jenis[rows] = pj
+                nearest[rows] = near
+    found = np.isfinite(nearest)
+    nearest[found] = _arc_m(nearest[found])
+
+    # tidak ada usaha sejenis dalam radius -> cari lebih jauh (biasanya hanya usaha di daerah sepi)
+    valid = ~(np.isnan(lats) | np.isnan(lons))
+    far = np.flatnonzero(valid & np.isinf(nearest))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        jobs = {}
+        for c in np.unique(codes[far]):
+            members = np.flatnonzero((codes == c) & valid)
+            rows = far[codes[far] == c]
+            if len(members) > 1:
+                jobs[pool.submit(_nearest_same, lats, lons, members, rows, radius_m)] = rows
+            else:
+                nearest[rows] = np.nan
+        for f, rows in jobs.items():
+            nearest[rows] = f.result()
+    nearest[~valid] = np.nan
+
+    out = pd.DataFrame(index=df.index)
+    out["tetangga_total"] = per_jenis.sum(axis=1)
+    out["kompetitor_sejenis"] = per_jenis[np.arange(n), codes]
+    out["kompetitor_terdekat_m"] = nearest
+    for c, lab in enumerate(labels):
+        if c < k - 1 or per_jenis[:, c].any():
+            out[f"tetangga_{lab}"] = per_jenis[:, c]
+    return out
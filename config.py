@@ -0,0 +1,23 @@
+# config.py
+# Konfigurasi dashboard (dipakai map2.py dan halaman-halaman di views/).
+DATA_PATH = "cobalagi_daerah.csv"            # ganti jika nama file CSV berbeda
+NOTES_PATH = "catatan_kunjungan.csv"  # CSV catatan lama (dimigrasi sekali ke NOTES_DB) & nama file eksport
+NOTES_DB = "catatan_kunjungan.db"     # database catatan kunjungan (SQLite), dibuat jika belum ada
+CLUSTERS_DB = "cluster_manual.db"     # database cluster manual (SQLite), dipakai bersama semua petugas
+AREAS_PATH = "batas_daerah.geojson"   # batas wilayah (GeoJSON poligon); kalau ada, kolom daerah dicek dari koordinat
+AREAS_NAME_FIELD = "daerah"           # properti GeoJSON yang berisi nama daerah
+DAERAH_MODE = "assign"                # "assign": daerah diganti hasil point-in-polygon; "verify": hanya ditandai
+AUTO_REFRESH = True                   # script akan memeriksa perubahan file CSV dan reload otomatis
+WATCH_INTERVAL = 2.0                  # detik; interval thread background mengecek perubahan file data
+DISTANCE_METHOD = "haversine"         # "haversine" (cepat) atau "geodesic" (ellipsoid WGS-84, lebih akurat)
+MARKER_BATCH_THRESHOLD = 1000         # di atas jumlah ini marker digambar batch (satu layer, popup dibuat di browser)
+MAP_CACHE_ENTRIES = 64                # jumlah maksimum peta (HTML) yang disimpan di cache
+MAP_CACHE_MB = 128                    # batas memori cache peta
+SEARCH_PAGE_SIZE = 20                 # hasil pencarian nama usaha per halaman (kotak "Pilih Titik Pusat")
+MAX_ROUTE_STOPS = 500                 # batas jumlah usaha dalam satu rute kunjungan (tetap interaktif)
+MAX_AUTO_CLUSTERS_DRAWN = 300         # cluster otomatis terbesar yang digambar poligonnya di peta
+FILTERED_FRAMES_CACHED = 16           # frame hasil filter yang dibagi antar sesi (per kombinasi filter sidebar)
+VIEWPORT_AUTO_ROWS = 20000            # mode viewport (hanya titik di area terlihat) aktif default di atas jumlah usaha ini
+DIAGNOSTICS_WINDOW = 500              # jumlah sampel terakhir per tahap untuk persentil di halaman Diagnostics (?diag=1)
+HEATMAP_MAX_CELLS = 3000              # batas sel heatmap per level zoom (payload ke browser tetap kecil)
+CLUSTER_PALETTE = ["#ef4444", "#f59e0b", "#10b981", "#3b82f6", "#8b5cf6", "#ec4899", "#14b8a6", "#f97316", "#84cc16", "#6366f1"]
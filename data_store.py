@@ -0,0 +1,136 @@
+# data_store.py
+# Loader dataset usaha dengan snapshot kolumnar.
+# CSV hanya di-parse ulang kalau file benar-benar berubah (mtime / ukuran);
+# selain itu data dibaca dari snapshot Parquet (atau pickle kalau pyarrow tidak ada).
+# Frame yang dikembalikan sudah ringkas (compact): satu salinan per versi data dibagi read-only ke semua sesi.
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+# optional: pyarrow untuk snapshot Parquet
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except Exception:
+    PARQUET_AVAILABLE = False
+
+EXPECTED_COLUMNS = ["nama_usaha", "Jenis Usaha", "daerah", "lat", "lon", "review"]
+CACHE_DIR = ".dashboard_cache"
+SNAPSHOT_FORMAT = 2  # naikkan kalau isi snapshot berubah (2 = frame compact); snapshot format lama diabaikan
+CATEGORY_MAX_SHARE = 0.5  # kolom teks dengan nilai unik <= 50% jumlah baris disimpan sebagai category
+
+
+def data_version(path):
+    """(mtime_ns, size) file data, atau None kalau file tidak ada."""
+    try:
+        stt = os.stat(path)
+    except OSError:
+        return None
+    return (stt.st_mtime_ns, stt.st_size)
+
+
+def normalize(df):
+    """Cek kolom wajib + paksa tipe numerik lat/lon/review."""
+    missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"CSV missing columns: {missing}")
+    df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
+    df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
+    df["review"] = pd.to_numeric(df["review"], errors="coerce").fillna(0)
+    return df
+
+
+def compact(df, columns=None):
+    """Versi hemat memori `df` (kolom `columns`, default semua):
+
+    teks berulang -> category (kategori terurut, tanpa kategori kosong); float -> float32 kalau semua nilainya
+    tetap persis sama (review; lat/lon & Rating tidak, tetap float64); teks lain ber-dtype object di-intern
+    (nilai sama = satu objek str). Kolom string pyarrow yang sebagian besar unik dibiarkan (sudah satu buffer).
+    """
+    out = {col: _compact_column(df[col]) if columns is None or col in columns else df[col] for col in df.columns}
+    return pd.DataFrame(out, index=df.index)
+
+
+def _compact_column(s):
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.cat.remove_unused_categories()
+    if pd.api.types.is_float_dtype(s.dtype):
+        f32 = s.astype(np.float32)
+        same = np.array_equal(f32.to_numpy(dtype=float), s.to_numpy(dtype=float), equal_nan=True)
+        return f32 if same else s
+    if pd.api.types.is_string_dtype(s.dtype):
+        codes, uniques = pd.factorize(s)
+        if len(uniques) <= len(s) * CATEGORY_MAX_SHARE:
+            return s.astype("category")
+        if s.dtype == object:
+            vals = np.append(np.asarray(uniques, dtype=object), np.nan)  # kode -1 (kosong) -> NaN
+            return pd.Series(vals[codes], index=s.index, name=s.name)
+    return s
+
+
+def _snapshot_base(path, cache_dir):
+    folder = os.path.join(os.path.dirname(os.path.abspath(path)), cache_dir)
+    return os.path.join(folder, os.path.basename(path))
+
+
+def snapshot_path(path, version, cache_dir=CACHE_DIR):
+    ext = "parquet" if PARQUET_AVAILABLE else "pkl"
+    return f"{_snapshot_base(path, cache_dir)}.{version[0]}_{version[1]}.v{SNAPSHOT_FORMAT}.{ext}"
+
+
+def _read_snapshot(snap):
+    if snap.endswith(".parquet"):
+        return pd.read_parquet(snap)
+    return pd.read_pickle(snap)
+
+
+def _write_snapshot(df, path, snap, cache_dir):
+    os.makedirs(os.path.dirname(snap), exist_ok=True)
+    tmp = snap + ".tmp"
+    if snap.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, snap)
+    # buang snapshot versi lama dari file yang sama
+    for old in glob.glob(_snapshot_base(path, cache_dir) + ".*_*.*"):
+        if old != snap and not old.endswith(".tmp"):
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def load_dataset(path, cache_dir=CACHE_DIR):
+    """Baca dataset; pakai snapshot kalau versinya masih sama dengan file CSV.
+
+    Raise ValueError kalau kolom wajib tidak ada.
+    """
+    version = data_version(path)
+    if version is None:
+        raise FileNotFoundError(path)
+    snap = snapshot_path(path, version, cache_dir)
+    if os.path.exists(snap):
+        try:
+            return _read_snapshot(snap)
+        except Exception:
+            pass  # snapshot rusak -> parse ulang CSV
+    df = compact(normalize(pd.read_csv(path)))
+    try:
+        _write_snapshot(df, path, snap, cache_dir)
+    except Exception:
+        pass  # snapshot hanya optimasi; folder read-only dsb. tidak boleh bikin gagal load
+    return df
+
+
+def dataset_loader(areas_path=None, name_field="daerah", mode="assign"):
+    """Fungsi load(path) untuk DatasetWatcher / report.py: load_dataset, ditambah spatial join daerah
+    (areas.join_daerah) kalau file batas wilayah `areas_path` ada.
+    """
+    if not areas_path or not os.path.exists(areas_path):
+        return load_dataset
+    from areas import AREA_COLUMNS, load_areas, join_daerah  # shapely hanya di-import kalau dipakai
+    areas = load_areas(areas_path, name_field)
+    return lambda path: compact(join_daerah(load_dataset(path), areas, mode=mode), columns=AREA_COLUMNS)
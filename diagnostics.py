@@ -0,0 +1,171 @@
+# diagnostics.py
+# Instrumentasi per rerun: timer per tahap script (load, filter, query radius, build peta, ...),
+# opsional cProfile dan tracemalloc. Sampel disimpan di StageStats (bergulir, dipakai bersama semua
+# sesi) supaya halaman Diagnostics bisa menampilkan persentil latensi & memori per tahap.
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+TOTAL = "rerun_total"
+COLD_START = "cold_start"          # rerun pertama proses (termasuk import & setup awal)
+FIRST_PAINT_PREFIX = "first_paint:"  # rerun pertama tiap halaman per sesi
+
+
+class StageStats:
+    """Sampel (detik, memori bersih byte, puncak memori byte) terakhir per tahap + profil cProfile terakhir."""
+
+    def __init__(self, window=500, max_profiles=5):
+        self.window = window
+        self._samples = defaultdict(lambda: deque(maxlen=self.window))
+        self._profiles = deque(maxlen=max_profiles)
+        self._once = set()
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds, mem_delta=None, mem_peak=None):
+        with self._lock:
+            self._samples[stage].append((time.time(), seconds, mem_delta, mem_peak))
+
+    def record_once(self, stage, seconds):
+        """Catat hanya sampel pertama `stage` selama proses hidup (mis. cold start); reset() tidak mengulangnya."""
+        with self._lock:
+            if stage in self._once:
+                return False
+            self._once.add(stage)
+            self._samples[stage].append((time.time(), seconds, None, None))
+            return True
+
+    def add_profile(self, page, text):
+        with self._lock:
+            self._profiles.append({"time": datetime.now().isoformat(timespec="seconds"), "page": page, "stats": text})
+
+    def profiles(self):
+        with self._lock:
+            return list(self._profiles)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._profiles.clear()
+
+    def summary(self):
+        """DataFrame per tahap: jumlah sampel, p50/p90/p99/max (ms), rata-rata memori bersih & puncak (KB)."""
+        with self._lock:
+            items = {k: list(v) for k, v in self._samples.items()}
+        rows = []
+        for stage, samples in items.items():
+            secs = np.array([s[1] for s in samples]) * 1000
+            delta = [s[2] for s in samples if s[2] is not None]
+            peak = [s[3] for s in samples if s[3] is not None]
+            rows.append({
+                "tahap": stage,
+                "n": len(secs),
+                "p50_ms": float(np.percentile(secs, 50)),
+                "p90_ms": float(np.percentile(secs, 90)),
+                "p99_ms": float(np.percentile(secs, 99)),
+                "max_ms": float(secs.max()),
+                "mem_bersih_kb": float(np.mean(delta)) / 1024 if delta else None,
+                "mem_puncak_kb": float(np.max(peak)) / 1024 if peak else None,
+            })
+        cols = ["tahap", "n", "p50_ms", "p90_ms", "p99_ms", "max_ms", "mem_bersih_kb", "mem_puncak_kb"]
+        return pd.DataFrame(rows, columns=cols).sort_values("p90_ms", ascending=False, ignore_index=True)
+
+    def to_json_bytes(self):
+        """Eksport semua sampel mentah + ringkasan + profil (untuk dibandingkan di luar dashboard)."""
+        with self._lock:
+            samples = {k: [list(s) for s in v] for k, v in self._samples.items()}
+        out = {
+            "exported": datetime.now().isoformat(timespec="seconds"),
+            "summary": self.summary().to_dict(orient="records"),
+            "samples": samples,  # [unix time, detik, memori bersih, memori puncak]
+            "profiles": self.profiles(),
+        }
+        return json.dumps(out, indent=2, default=str).encode("utf-8")
+
+
+def set_memory_tracing(on):
+    """tracemalloc berlaku untuk seluruh proses (semua sesi), bukan per sesi."""
+    if on and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not on and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class RerunTimer:
+    """Timer satu rerun script. Tiap tahap langsung dicatat ke StageStats saat selesai,
+    jadi rerun yang berhenti di tengah (st.stop / st.rerun) tetap menyumbang sampel tahap yang sudah lewat.
+    """
+
+    def __init__(self, stats, profile=False, t0=None):
+        self.stats = stats
+        self.trace_memory = tracemalloc.is_tracing()  # lihat set_memory_tracing
+        self._t0 = time.perf_counter() if t0 is None else t0
+        self._lap_name = None
+        self._lap_start = None
+        self._lap_mem = None
+        if t0 is not None:
+            # waktu sejak awal script (import + setup) sampai timer dibuat masuk tahap "startup"
+            self._lap_name, self._lap_start, self._lap_mem = "startup", t0, self._mem()
+        self._profiler = None
+        if profile:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:  # profiler lain sedang aktif di thread ini
+                self._profiler = None
+
+    def _mem(self):
+        return tracemalloc.get_traced_memory()[0] if self.trace_memory else None
+
+    @contextmanager
+    def stage(self, name):
+        """with timer.stage("map:preview"): ... -> waktu (dan memori) blok dicatat sebagai tahap `name`.
+
+        Puncak memori dihitung dari awal tahap; tahap bersarang me-reset puncak tahap luarnya.
+        """
+        mem0 = self._mem()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            secs = time.perf_counter() - t0
+            if self.trace_memory:
+                cur, peak = tracemalloc.get_traced_memory()
+                self.stats.record(name, secs, cur - mem0, peak - mem0)
+            else:
+                self.stats.record(name, secs)
+
+    def lap(self, name):
+        """Tutup tahap berjalan (kalau ada) dan mulai tahap `name`; untuk bagian script yang linear."""
+        now, mem = time.perf_counter(), self._mem()
+        if self._lap_name is not None:
+            delta = mem - self._lap_mem if mem is not None else None
+            self.stats.record(self._lap_name, now - self._lap_start, delta)
+        self._lap_name, self._lap_start, self._lap_mem = name, now, mem
+
+    def finish(self, page=None, first_paint=False):
+        """Tutup rerun: catat total (+ cold start sekali per proses, + first_paint:<page> kalau diminta)."""
+        self.lap(None)
+        total = time.perf_counter() - self._t0
+        self.stats.record(TOTAL, total)
+        self.stats.record_once(COLD_START, total)
+        if first_paint and page is not None:
+            self.stats.record(FIRST_PAINT_PREFIX + page, total)
+        if self._profiler is not None:
+            self._profiler.disable()
+            buf = io.StringIO()
+            pstats.Stats(self._profiler, stream=buf).sort_stats("cumulative").print_stats(40)
+            self.stats.add_profile(page, buf.getvalue())
+            self._profiler = None
+        return total
@@ -0,0 +1,87 @@
+# export.py
+# Eksport tabel besar (data usaha / catatan kunjungan) ke CSV, Parquet atau GeoJSON.
+# Isi ditulis per potongan (chunk) ke file sementara, jadi memori tetap kecil walau jutaan baris;
+# dipanggil dari st.download_button(data=callable) sehingga file baru dibuat saat tombol diklik.
+import json
+import tempfile
+
+import numpy as np
+
+from data_store import PARQUET_AVAILABLE
+
+CHUNK_ROWS = 50_000  # baris per potongan yang ditulis sekaligus
+# format -> (mime, ekstensi file)
+FORMATS = {"csv": ("text/csv", "csv"), "geojson": ("application/geo+json", "geojson")}
+if PARQUET_AVAILABLE:
+    FORMATS["parquet"] = ("application/vnd.apache.parquet", "parquet")
+
+
+def frame_chunks(df, rows=None, chunk=CHUNK_ROWS):
+    """Potongan df.iloc[rows] (semua baris kalau rows None) berukuran <= chunk, urutan rows dipertahankan."""
+    rows = np.arange(len(df)) if rows is None else np.asarray(rows)
+    for i in range(0, len(rows), chunk):
+        yield df.iloc[rows[i:i + chunk]]
+
+
+def _json_value(v):
+    # nilai numpy (int64, bool_, ...) & Timestamp yang tidak dikenal json
+    return v.item() if isinstance(v, np.generic) else str(v)
+
+
+def _write_csv(chunks, out):
+    for i, c in enumerate(chunks):
+        out.write(c.to_csv(index=False, header=i == 0).encode("utf-8"))
+
+
+def _write_parquet(chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for c in chunks:
+            table = pa.Table.from_pandas(c, preserve_index=False,
+                                         schema=writer.schema if writer is not None else None)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_geojson(chunks, out, lat="lat", lon="lon"):
+    # FeatureCollection titik; koordinat kosong -> geometry null, kolom lain jadi properties
+    out.write(b'{"type": "FeatureCollection", "features": [\n')
+    first = True
+    for c in chunks:
+        props = c.drop(columns=[lat, lon]).astype(object)
+        props = props.where(props.notna(), None).to_dict("records")
+        lats, lons = c[lat].to_numpy(dtype=float), c[lon].to_numpy(dtype=float)
+        lines = []
+        for p, y, x in zip(props, lats, lons):
+            geom = None if np.isnan(y) or np.isnan(x) else {"type": "Point", "coordinates": [float(x), float(y)]}
+            lines.append(json.dumps({"type": "Feature", "geometry": geom, "properties": p},
+                                    ensure_ascii=False, default=_json_value))
+        if lines:
+            out.write((("" if first else ",\n") + ",\n".join(lines)).encode("utf-8"))
+            first = False
+    out.write(b"\n]}\n")
+
+
+WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "geojson": _write_geojson}
+
+
+def write_export(chunks, fmt, out):
+    """Tulis potongan frame (iterable) ke file biner `out` dalam format fmt."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format harus salah satu dari {list(FORMATS)}")
+    WRITERS[fmt](chunks, out)
+    return out
+
+
+def export_file(make_chunks, fmt):
+    """File sementara (sudah di-seek ke awal) berisi eksport; make_chunks() dipanggil saat ini juga."""
+    out = tempfile.TemporaryFile()
+    write_export(make_chunks(), fmt, out)
+    out.seek(0)
+    return out
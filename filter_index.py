@@ -0,0 +1,92 @@
+# filter_index.py
+# Index untuk "Advanced Filter" sidebar: Jenis Usaha / daerah disimpan sebagai kode kategori
+# dengan bitmap baris per kategori, review disimpan terurut untuk lookup range.
+# Hasil filter berupa posisi baris (np.ndarray), di-memo per kombinasi filter.
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+ALL = "SEMUA"
+HIGH_REVIEW = 1000
+CATEGORY_COLUMNS = ["Jenis Usaha", "daerah"]
+
+
+class FilterIndex:
+    def __init__(self, df, memo_size=256):
+        self.n = len(df)
+        self.categories = {}
+        self.bitmaps = {}
+        for col in CATEGORY_COLUMNS:
+            cat = pd.Categorical(df[col])
+            codes = np.asarray(cat.codes)
+            labels = [str(c) for c in cat.categories]
+            self.categories[col] = sorted(labels)
+            # bitmap per kategori (np.packbits -> n/8 byte per kategori)
+            self.bitmaps[col] = {
+                lab: np.packbits(codes == code) for code, lab in enumerate(labels)
+            }
+        review = df["review"].to_numpy(dtype=float)
+        self.review_order = np.argsort(review, kind="stable")
+        self.review_sorted = review[self.review_order]
+
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def options(self, col):
+        """Daftar kategori terurut (tanpa NaN) untuk selectbox."""
+        return self.categories[col]
+
+    def review_bounds(self):
+        if self.n == 0:
+            return 0.0, 0.0
+        return float(self.review_sorted[0]), float(self.review_sorted[-1])
+
+    def query(self, jenis=ALL, daerah=ALL, min_review=None, max_review=None, high_review_only=False):
+        """Posisi baris (terurut) yang lolos semua filter."""
+        key = (jenis, daerah, min_review, max_review, bool(high_review_only))
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        rows = self._compute(*key)
+        rows.setflags(write=False)  # dibagi antar sesi -> read-only
+        with self._lock:
+            self._memo[key] = rows
+            if len(self._memo) > self._memo_size:
+                self._memo.popitem(last=False)
+        return rows
+
+    def _compute(self, jenis, daerah, min_review, max_review, high_review_only):
+        bits = None
+        for col, val in (("Jenis Usaha", jenis), ("daerah", daerah)):
+            if val == ALL:
+                continue
+            bm = self.bitmaps[col].get(str(val))
+            if bm is None:
+                return np.empty(0, dtype=np.int64)
+            bits = bm if bits is None else np.bitwise_and(bits, bm)
+
+        # range review -> potongan dari array review yang sudah terurut
+        lo, hi = 0, self.n
+        if min_review is not None:
+            lo = int(np.searchsorted(self.review_sorted, min_review, side="left"))
+        if max_review is not None:
+            hi = int(np.searchsorted(self.review_sorted, max_review, side="right"))
+        if high_review_only:
+            lo = max(lo, int(np.searchsorted(self.review_sorted, HIGH_REVIEW, side="right")))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+
+        if lo == 0 and hi == self.n:
+            if bits is None:
+                return np.arange(self.n, dtype=np.int64)
+            return np.flatnonzero(np.unpackbits(bits, count=self.n)).astype(np.int64)
+
+        in_range = np.sort(self.review_order[lo:hi])
+        if bits is None:
+            return in_range.astype(np.int64)
+        mask = np.unpackbits(bits, count=self.n).astype(bool)
+        return in_range[mask[in_range]].astype(np.int64)
@@ -0,0 +1,106 @@
+# geo.py
+# Perhitungan jarak (meter) untuk dashboard: versi skalar + versi NumPy (sekali jalan untuk semua baris)
+import numpy as np
+from math import radians, cos, sin, asin, sqrt
+
+R_EARTH = 6371000  # meter (bola, dipakai haversine)
+
+# WGS-84 (dipakai mode ellipsoid / "geodesic")
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = (1 - WGS84_F) * WGS84_A
+
+
+def haversine(p1, p2):
+    lat1, lon1 = p1
+    lat2, lon2 = p2
+    R = R_EARTH
+    dlat = radians(lat2-lat1)
+    dlon = radians(lon2-lon1)
+    a = sin(dlat/2)**2 + cos(radians(lat1))*cos(radians(lat2))*sin(dlon/2)**2
+    return 2*R*asin(sqrt(a))
+
+
+def haversine_np(lat1, lon1, lat2, lon2):
+    """Versi vektor dari haversine(): semua argumen boleh array (broadcast), hasil meter."""
+    lat1 = np.radians(np.asarray(lat1, dtype=float))
+    lon1 = np.radians(np.asarray(lon1, dtype=float))
+    lat2 = np.radians(np.asarray(lat2, dtype=float))
+    lon2 = np.radians(np.asarray(lon2, dtype=float))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin(dlon/2)**2
+    return 2*R_EARTH*np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def vincenty_np(lat1, lon1, lat2, lon2, max_iter=200, tol=1e-12):
+    """Jarak ellipsoid WGS-84 (Vincenty inverse) versi vektor.
+
+    Selisih dengan geopy.distance.geodesic < 1 mm untuk jarak skala kota.
+    Titik yang tidak konvergen (hampir antipodal) dihitung ulang dengan geopy.
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(
+        np.asarray(lat1, dtype=float), np.asarray(lon1, dtype=float),
+        np.asarray(lat2, dtype=float), np.asarray(lon2, dtype=float))
+    a, b, f = WGS84_A, WGS84_B, WGS84_F
+
+    L = np.radians(lon2 - lon1)
+    U1 = np.arctan((1 - f) * np.tan(np.radians(lat1)))
+    U2 = np.arctan((1 - f) * np.tan(np.radians(lat2)))
+    sinU1, cosU1 = np.sin(U1), np.cos(U1)
+    sinU2, cosU2 = np.sin(U2), np.cos(U2)
+
+    lam = L.copy()
+    converged = np.zeros(lam.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for _ in range(max_iter):
+            sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+            sin_sigma = np.sqrt((cosU2 * sin_lam) ** 2 + (cosU1 * sinU2 - sinU1 * cosU2 * cos_lam) ** 2)
+            cos_sigma = sinU1 * sinU2 + cosU1 * cosU2 * cos_lam
+            sigma = np.arctan2(sin_sigma, cos_sigma)
+            sin_alpha = np.where(sin_sigma == 0, 0.0, cosU1 * cosU2 * sin_lam / sin_sigma)
+            cos2_alpha = 1 - sin_alpha ** 2
+            # garis ekuator: cos2_alpha = 0
+            cos_2sm = np.where(cos2_alpha == 0, 0.0, cos_sigma - 2 * sinU1 * sinU2 / cos2_alpha)
+            C = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+            lam_prev = lam
+            lam = L + (1 - C) * f * sin_alpha * (
+                sigma + C * sin_sigma * (cos_2sm + C * cos_sigma * (-1 + 2 * cos_2sm ** 2)))
+            converged = np.abs(lam - lam_prev) <= tol
+            if converged[~np.isnan(lam)].all():
+                break
+
+        u2 = cos2_alpha * (a ** 2 - b ** 2) / b ** 2
+        A = 1 + u2 / 16384 * (4096 + u2 * (-768 + u2 * (320 - 175 * u2)))
+        B = u2 / 1024 * (256 + u2 * (-128 + u2 * (74 - 47 * u2)))
+        d_sigma = B * sin_sigma * (cos_2sm + B / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sm ** 2)
+            - B / 6 * cos_2sm * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sm ** 2)))
+        dist = b * A * (sigma - d_sigma)
+
+    dist = np.where(sin_sigma == 0, 0.0, dist)
+    # fallback untuk kasus yang tidak konvergen (jarang; titik hampir berseberangan di bumi)
+    bad = ~converged & ~np.isnan(dist)
+    if bad.any():
+        from geopy.distance import geodesic
+        dist = dist.copy()
+        for idx in map(tuple, np.argwhere(bad)):  # argwhere: juga untuk input skalar (array 0-d)
+            dist[idx] = geodesic((lat1[idx], lon1[idx]), (lat2[idx], lon2[idx])).meters
+    return dist
+
+
+DISTANCE_METHODS = {
+    "haversine": haversine_np,   # cepat, error < 0.6% dibanding ellipsoid
+    "geodesic": vincenty_np,     # akurasi tinggi (WGS-84)
+}
+
+
+def distances_from(center, lats, lons, method="haversine"):
+    """Jarak (meter) dari satu titik pusat (lat, lon) ke semua titik sekaligus.
+
+    `lats`/`lons` boleh Series/array; NaN tetap NaN (tidak lolos filter radius).
+    """
+    if method not in DISTANCE_METHODS:
+        raise ValueError(f"method harus salah satu dari {list(DISTANCE_METHODS)}")
+    clat, clon = center
+    return DISTANCE_METHODS[method](clat, clon, np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
@@ -0,0 +1,127 @@
+# heatmap.py
+# Heatmap pra-agregasi di server: titik di-bin ke grid piksel Web Mercator untuk beberapa level zoom,
+# tiap level dibatasi MAX_CELLS sel. Browser hanya menerima sel berbobot (bukan semua lat/lon),
+# dan layer heatmap berganti level saat zoom berubah -> ukuran payload tetap terbatas.
+import json
+
+import numpy as np
+from branca.element import MacroElement
+from folium.plugins import HeatMap
+from jinja2 import Template
+
+ZOOM_LEVELS = (8, 10, 12, 14, 16)
+CELL_PX = 12        # ukuran sel dalam piksel layar pada level zoom-nya
+MAX_CELLS = 3000    # batas sel per level; grid dikasarkan kalau lebih
+
+
+def _mercator_px(lats, lons, zoom):
+    scale = 256 * 2 ** zoom
+    lat_r = np.radians(np.clip(lats, -85.05112878, 85.05112878))
+    x = (lons + 180.0) / 360.0 * scale
+    y = (1 - np.log(np.tan(lat_r) + 1 / np.cos(lat_r)) / np.pi) / 2 * scale
+    return x, y
+
+
+def _cell_ids(lats, lons, zoom, cell_px, max_cells):
+    # nomor sel (0..k-1) per titik; sel diperbesar 2x selama jumlah sel > max_cells
+    x, y = _mercator_px(lats, lons, zoom)
+    px = cell_px
+    while True:
+        cx = np.floor(x / px).astype(np.int64)
+        cy = np.floor(y / px).astype(np.int64)
+        _, inv = np.unique((cy << 32) + cx, return_inverse=True)
+        k = int(inv.max()) + 1 if len(inv) else 0
+        if k <= max_cells:
+            return inv, k
+        px *= 2
+
+
+def bin_points(lats, lons, weights, zoom, cell_px=CELL_PX, max_cells=MAX_CELLS):
+    """Sel grid berbobot untuk satu level zoom -> array (k, 3) [lat, lon, intensitas 0..1].
+
+    Posisi sel = rata-rata berbobot titik di dalamnya; intensitas dinormalisasi ke sel terberat.
+    """
+    inv, k = _cell_ids(lats, lons, zoom, cell_px, max_cells)
+    if k == 0:
+        return np.empty((0, 3))
+    w = np.bincount(inv, weights=weights, minlength=k)
+    safe = np.where(w > 0, w, 1.0)
+    lat_c = np.bincount(inv, weights=lats * weights, minlength=k) / safe
+    lon_c = np.bincount(inv, weights=lons * weights, minlength=k) / safe
+    # sel dengan bobot 0 (mis. review 0 semua) tetap di posisi rata-rata biasa
+    zero = w <= 0
+    if zero.any():
+        cnt = np.bincount(inv, minlength=k)
+        lat_c[zero] = (np.bincount(inv, weights=lats, minlength=k) / cnt)[zero]
+        lon_c[zero] = (np.bincount(inv, weights=lons, minlength=k) / cnt)[zero]
+    wmax = w.max()
+    inten = w / wmax if wmax > 0 else np.zeros(k)
+    return np.column_stack([lat_c, lon_c, inten])
+
+
+def count_cells(lats, lons, zoom, cell_px=CELL_PX, max_cells=MAX_CELLS):
+    """Jumlah titik per sel grid -> (lat rata-rata, lon rata-rata, jumlah) per sel."""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    inv, k = _cell_ids(lats, lons, zoom, cell_px, max_cells)
+    cnt = np.bincount(inv, minlength=k)
+    if k == 0:
+        return np.empty(0), np.empty(0), cnt
+    return np.bincount(inv, weights=lats, minlength=k) / cnt, np.bincount(inv, weights=lons, minlength=k) / cnt, cnt
+
+
+def heat_levels(lats, lons, weights=None, zoom_levels=ZOOM_LEVELS, max_cells=MAX_CELLS):
+    """{zoom: [[lat, lon, intensitas], ...]} untuk semua level (siap dikirim ke Leaflet)."""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    w = np.ones(len(lats)) if weights is None else np.asarray(weights, dtype=float)
+    ok = ~(np.isnan(lats) | np.isnan(lons) | np.isnan(w))
+    lats, lons, w = lats[ok], lons[ok], np.clip(w[ok], 0, None)
+    return {z: np.round(bin_points(lats, lons, w, z, max_cells=max_cells), 6).tolist() for z in zoom_levels}
+
+
+def level_for_zoom(levels, zoom):
+    """Level terdekat yang <= zoom (atau level terkecil)."""
+    zs = sorted(levels)
+    below = [z for z in zs if z <= zoom]
+    return below[-1] if below else zs[0]
+
+
+class _ZoomSwitch(MacroElement):
+    # ganti data layer heatmap sesuai zoom peta (Leaflet.heat: setLatLngs)
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function () {
+            var levels = {{ this.levels_json }};
+            var zs = Object.keys(levels).map(Number).sort(function (a, b) { return a - b; });
+            function pick(z) {
+                var best = zs[0];
+                for (var i = 0; i < zs.length; i++) { if (zs[i] <= z) { best = zs[i]; } }
+                return best;
+            }
+            var current = null;
+            function update() {
+                var z = pick({{ this.map_name }}.getZoom());
+                if (z !== current) { current = z; {{ this.heat_name }}.setLatLngs(levels[z]); }
+            }
+            {{ this.map_name }}.on("zoomend", update);
+            update();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, map_name, heat_name, levels):
+        super().__init__()
+        self.map_name = map_name
+        self.heat_name = heat_name
+        self.levels_json = json.dumps({str(z): cells for z, cells in levels.items()})
+
+
+def add_heatmap(m, levels, zoom_start, **options):
+    """Tambah heatmap multi-resolusi ke peta `m` dari hasil heat_levels()."""
+    # intensitas sudah dinormalisasi per level -> matikan peredupan per zoom bawaan Leaflet.heat
+    options.setdefault("max_zoom", 1)
+    heat = HeatMap(levels[level_for_zoom(levels, zoom_start)], **options)
+    heat.add_to(m)
+    _ZoomSwitch(m.get_name(), heat.get_name(), levels).add_to(m)
+    return m
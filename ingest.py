@@ -0,0 +1,102 @@
+# ingest.py
+# Import CSV usaha baru secara streaming: dibaca per chunk, kolom wajib dicek, lat/lon/review dipaksa numerik,
+# baris tidak valid ditolak (contoh + alasannya disimpan untuk laporan). Baris valid ditulis ke file sementara
+# di folder yang sama lalu di-swap atomik ke path data, jadi sesi lain tidak pernah melihat file setengah jadi.
+# Memori terbatas ke satu chunk + contoh baris ditolak, berapa pun ukuran upload.
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from data_store import EXPECTED_COLUMNS
+
+CHUNK_ROWS = 100_000
+MAX_REJECTED_KEPT = 1000  # contoh baris ditolak yang disimpan untuk laporan (sisanya hanya dihitung)
+
+
+@dataclass
+class IngestReport:
+    rows_read: int = 0
+    rows_ok: int = 0
+    rows_rejected: int = 0
+    reasons: dict = field(default_factory=dict)                    # alasan -> jumlah baris
+    rejected: pd.DataFrame = field(default_factory=pd.DataFrame)  # contoh baris ditolak (+ _baris, _alasan)
+    seconds: float = 0.0
+
+
+def _validate(chunk):
+    """(chunk dengan lat/lon/review numerik, Series alasan tolak per baris; None = valid)."""
+    lat = pd.to_numeric(chunk["lat"], errors="coerce")
+    lon = pd.to_numeric(chunk["lon"], errors="coerce")
+    review_raw = chunk["review"]
+    review = pd.to_numeric(review_raw, errors="coerce")
+    reason = pd.Series(None, index=chunk.index, dtype=object)
+    # urutan dibalik supaya alasan yang paling mendasar yang tersisa
+    reason[review_raw.notna() & (review.isna() | (review < 0))] = "review bukan angka >= 0"
+    reason[lon.isna() | ~lon.between(-180, 180)] = "lon kosong / di luar -180..180"
+    reason[lat.isna() | ~lat.between(-90, 90)] = "lat kosong / di luar -90..90"
+    reason[chunk["nama_usaha"].isna() | (chunk["nama_usaha"].str.strip() == "")] = "nama_usaha kosong"
+    chunk = chunk.assign(lat=lat, lon=lon, review=review)
+    return chunk, reason
+
+
+def ingest_csv(src, dest_path, chunk_rows=CHUNK_ROWS, max_rejected_kept=MAX_REJECTED_KEPT):
+    """Validasi CSV `src` (path atau file object) per chunk dan ganti `dest_path` secara atomik.
+
+    Raise ValueError (dest_path tidak disentuh) kalau kolom wajib tidak ada, CSV tidak bisa di-parse,
+    atau tidak ada satu pun baris valid.
+    """
+    t0 = time.perf_counter()
+    report = IngestReport()
+    rejected = []
+    kept = 0
+    folder = os.path.dirname(os.path.abspath(dest_path))
+    fd, tmp = tempfile.mkstemp(prefix=".import_", suffix=".csv", dir=folder)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            # dtype=str: tipe tidak ditebak ulang per chunk; kolom lain ditulis apa adanya
+            reader = pd.read_csv(src, dtype=str, chunksize=chunk_rows, skipinitialspace=True)
+            header = True
+            for chunk in reader:
+                if header:
+                    missing = [c for c in EXPECTED_COLUMNS if c not in chunk.columns]
+                    if missing:
+                        raise ValueError(f"CSV missing columns: {missing}")
+                chunk, reason = _validate(chunk)
+                bad = reason.notna().to_numpy()
+                n_bad = int(bad.sum())
+                if n_bad:
+                    for r, c in reason[bad].value_counts().items():
+                        report.reasons[r] = report.reasons.get(r, 0) + int(c)
+                    if kept < max_rejected_kept:
+                        sample = chunk[bad].head(max_rejected_kept - kept)
+                        # nomor baris di file (baris 1 = header)
+                        rejected.append(sample.assign(_baris=report.rows_read + np.flatnonzero(bad)[:len(sample)] + 2,
+                                                      _alasan=reason[bad].head(len(sample)).to_numpy()))
+                        kept += len(sample)
+                good = chunk[~bad]
+                good.to_csv(out, index=False, header=header)
+                header = False
+                report.rows_read += len(chunk)
+                report.rows_ok += len(good)
+                report.rows_rejected += n_bad
+        if report.rows_ok == 0:
+            raise ValueError("tidak ada baris valid")
+        if os.path.exists(dest_path):
+            shutil.copymode(dest_path, tmp)  # mkstemp membuat file 0600
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, dest_path)  # atomik di filesystem yang sama: pembaca melihat file lama atau baru
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"CSV tidak bisa dibaca: {e}") from e
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    if rejected:
+        report.rejected = pd.concat(rejected, ignore_index=True)
+    report.seconds = time.perf_counter() - t0
+    return report
@@ -0,0 +1,120 @@
+# map_render.py
+# Render marker usaha ke peta folium.
+# Sampai MARKER_BATCH_THRESHOLD (config.py) titik: satu folium.Marker per usaha di MarkerCluster (seperti semula).
+# Di atasnya: semua titik dikirim sebagai satu array JSON ke FastMarkerCluster dan
+# popup dibangun di browser dari properti tiap titik -> build Python & payload HTML jauh lebih kecil.
+# MapCache menyimpan HTML peta jadi supaya rerun dengan input yang sama tidak membangun ulang peta.
+import threading
+from collections import OrderedDict
+
+import folium
+import numpy as np
+from folium.plugins import FastMarkerCluster, MarkerCluster
+
+from config import MARKER_BATCH_THRESHOLD
+
+# row = [lat, lon, nama_usaha, Jenis Usaha, daerah, baris terakhir popup]
+POPUP_CALLBACK = """
+function (row) {
+    function esc(s) {
+        return String(s).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    }
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(
+        "<b>" + esc(row[2]) + "</b><br>" + esc(row[3]) + "<br>" + esc(row[4]) + "<br>" + esc(row[5]),
+        {maxWidth: 300}
+    );
+    return marker;
+};
+"""
+
+
+def popup_last_line(df, column, fmt):
+    """Baris terakhir popup (mis. 'Review: 120' atau '250 m') untuk semua baris sekaligus."""
+    vals = df[column].to_numpy(dtype=float)
+    return [fmt.format(int(v)) for v in vals]
+
+
+def add_business_markers(m, df, last_line, threshold=MARKER_BATCH_THRESHOLD):
+    """Tambah marker usaha ke peta `m`; mode batch otomatis kalau len(df) > threshold.
+
+    `last_line`: list string (satu per baris df) untuk baris terakhir popup.
+    """
+    lats = df["lat"].to_numpy(dtype=float)
+    lons = df["lon"].to_numpy(dtype=float)
+    ok = ~(np.isnan(lats) | np.isnan(lons))
+    names = df["nama_usaha"].astype(str).to_numpy()
+    jenis = df["Jenis Usaha"].astype(str).to_numpy()
+    daerah = df["daerah"].astype(str).to_numpy()
+    idx = np.flatnonzero(ok)
+
+    if len(idx) > threshold:
+        # 6 desimal ~ 0.1 m, cukup untuk marker dan memangkas ukuran JSON
+        lat_r, lon_r = np.round(lats, 6), np.round(lons, 6)
+        rows = [[float(lat_r[i]), float(lon_r[i]), names[i], jenis[i], daerah[i], last_line[i]] for i in idx]
+        FastMarkerCluster(rows, callback=POPUP_CALLBACK).add_to(m)
+        return m
+
+    mc = MarkerCluster()
+    for i in idx:
+        folium.Marker(
+            [lats[i], lons[i]],
+            popup=f"<b>{names[i]}</b><br>{jenis[i]}<br>{daerah[i]}<br>{last_line[i]}"
+        ).add_to(mc)
+    mc.add_to(m)
+    return m
+
+
+class MapCache:
+    """LRU cache HTML peta yang sudah di-render, dibatasi jumlah entri dan total ukuran (byte).
+
+    Key bebas (tuple hashable) -> biasanya versi dataset + semua input yang memengaruhi peta.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            html = self._items.get(key)
+            if html is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return html
+
+    def put(self, key, html):
+        size = len(html)
+        if size > self.max_bytes:
+            return  # terlalu besar untuk disimpan, render langsung saja
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = html
+            self._bytes += size
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get_or_build(self, key, build):
+        """HTML dari cache, atau panggil build() -> folium.Map, render, lalu simpan."""
+        html = self.get(key)
+        if html is not None:
+            return html
+        with self._lock:
+            self.misses += 1
+        html = build().get_root().render()
+        self.put(key, html)
+        return html
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._items), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,139 @@
+# name_index.py
+# Index nama_usaha -> posisi baris, dibuat sekali per versi data (dataset.derived).
+# Pengganti data[data["nama_usaha"] == nama].iloc[0] yang men-scan seluruh kolom untuk setiap nama.
+# Pencarian nama (kotak "Pilih Titik Pusat"): prefix nama lengkap & prefix per kata lewat array terurut
+# (np.searchsorted), fuzzy (salah ketik) hanya kalau prefix tidak menemukan apa-apa. Struktur pencarian
+# baru dibangun saat pencarian pertama; hasil per query disimpan (LRU) supaya pindah halaman tidak menghitung ulang.
+import difflib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    _TEXT = pd.ArrowDtype(pa.string())  # lower/split/explode/sort di arrow, tanpa list Python per nama
+except ImportError:
+    _TEXT = object
+
+FUZZY_CUTOFF = 0.75     # kemiripan minimum (difflib) kata query vs kata nama usaha
+FUZZY_PER_TOKEN = 5     # kata nama usaha termirip yang dipakai per kata query
+_MAX_CHAR = "\U0010ffff"
+
+
+def normalize_name(text):
+    """Huruf kecil & spasi dirapikan (sama dengan normalisasi nama di index); dipakai untuk query."""
+    return " ".join(str(text).lower().split())
+
+
+class NameIndex:
+    def __init__(self, df, memo_size=64):
+        codes, uniques = pd.factorize(df["nama_usaha"])
+        self.codes = codes  # per baris: posisi nama di self.names (-1 = nama kosong)
+        self.names = pd.Index(uniques)
+        ids, first = np.unique(codes, return_index=True)  # nama kembar -> baris pertama, sama seperti .iloc[0]
+        self.pos = first[ids >= 0]
+        self._search = None
+        self._memo = OrderedDict()
+        self._memo_size = memo_size
+        self._lock = threading.Lock()
+
+    def row(self, name):
+        """Posisi baris pertama dengan nama_usaha == name, atau None."""
+        try:
+            return int(self.pos[self.names.get_loc(name)])
+        except KeyError:
+            return None
+
+    def rows(self, names):
+        """Posisi baris untuk daftar nama (urutan dipertahankan, nama yang tidak ada dilewati)."""
+        k = self.names.get_indexer(pd.Index(list(names), dtype=object))
+        return self.pos[k[k >= 0]]
+
+    def _build_search(self):
+        valid = np.flatnonzero(pd.notna(self.names))
+        norm = (pd.Series(self.names[valid], dtype=_TEXT).str.lower()
+                .str.replace(r"\s+", " ", regex=True).str.strip())
+        # nama lengkap terurut (prefix nama) + rank alfabet per nama untuk mengurutkan hasil
+        order = norm.argsort(kind="stable").to_numpy()
+        rank = np.empty(len(self.names), dtype=np.int64)
+        rank[valid[order]] = np.arange(len(order))
+        # kata -> nama: kosakata terurut, pasangan (kode kata, id nama) diurutkan per kode kata
+        tokens = norm.str.split(" ").explode()
+        tokens = tokens[tokens.notna() & (tokens != "")]
+        codes, vocab = pd.factorize(tokens, sort=True)
+        by_code = np.argsort(codes, kind="stable")
+        owners = valid[tokens.index.to_numpy()][by_code]
+        starts = np.searchsorted(codes[by_code], np.arange(len(vocab) + 1))
+        vocab = vocab.to_numpy(dtype=object)
+        return {"sorted": norm.to_numpy(dtype=object)[order], "ids": valid[order], "rank": rank, "vocab": vocab,
+                "vocab_len": np.fromiter(map(len, vocab), dtype=np.int64, count=len(vocab)),
+                "owners": owners, "starts": starts}
+
+    def _token_ids(self, s, lo, hi):
+        # id nama yang punya kata dengan kode di [lo, hi)
+        return np.unique(s["owners"][s["starts"][lo]:s["starts"][hi]])
+
+    def _prefix_token(self, s, tok):
+        v = s["vocab"]
+        return self._token_ids(s, v.searchsorted(tok), v.searchsorted(tok + _MAX_CHAR))
+
+    def _fuzzy_token(self, s, tok):
+        # kandidat: kata berhuruf awal sama & panjang mirip (bukan seluruh kosakata)
+        v = s["vocab"]
+        lo, hi = v.searchsorted(tok[0]), v.searchsorted(tok[0] + _MAX_CHAR)
+        near = lo + np.flatnonzero(np.abs(s["vocab_len"][lo:hi] - len(tok)) <= 2)
+        close = difflib.get_close_matches(tok, list(v[near]), n=FUZZY_PER_TOKEN, cutoff=FUZZY_CUTOFF)
+        codes = near[np.isin(v[near], close)]
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([s["owners"][s["starts"][c]:s["starts"][c + 1]] for c in codes]))
+
+    def _match(self, query):
+        """Id nama (posisi di self.names) yang cocok dengan query, terurut: prefix nama, prefix kata, fuzzy."""
+        q = normalize_name(query)
+        if not q:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            if self._search is None:
+                self._search = self._build_search()
+            s = self._search
+        full = s["ids"][s["sorted"].searchsorted(q):s["sorted"].searchsorted(q + _MAX_CHAR)]
+        words = None
+        for tok in q.split(" "):
+            ids = self._prefix_token(s, tok)
+            words = ids if words is None else np.intersect1d(words, ids, assume_unique=True)
+        if len(full) == 0 and len(words) == 0:
+            # tidak ada prefix yang cocok -> salah ketik: tiap kata query dicocokkan ke kata termirip
+            for i, tok in enumerate(q.split(" ")):
+                ids = self._fuzzy_token(s, tok)
+                words = ids if i == 0 else np.intersect1d(words, ids, assume_unique=True)
+        words = words[~np.isin(words, full)]
+        return np.concatenate([full, words[np.argsort(s["rank"][words], kind="stable")]])
+
+    def _lookup(self, query):
+        key = normalize_name(query)
+        with self._lock:
+            ids = self._memo.get(key)
+            if ids is not None:
+                self._memo.move_to_end(key)
+        if ids is None:
+            ids = self._match(query)
+            with self._lock:
+                self._memo[key] = ids
+                while len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+        return ids
+
+    def search(self, query, page=0, page_size=20):
+        """(daftar nama usaha untuk halaman `page`, jumlah total hasil) untuk teks query."""
+        ids = self._lookup(query)
+        page_ids = ids[page * page_size:(page + 1) * page_size]
+        return [self.names[i] for i in page_ids], len(ids)
+
+    def search_rows(self, query):
+        """Posisi semua baris (termasuk nama kembar) yang namanya cocok dengan query, urut posisi baris."""
+        hit = np.zeros(len(self.names) + 1, dtype=bool)  # slot terakhir = kode -1 (nama kosong), tidak pernah cocok
+        hit[self._lookup(query)] = True
+        return np.flatnonzero(hit[self.codes])
@@ -0,0 +1,178 @@
+# notes_store.py
+# Penyimpanan catatan kunjungan di SQLite (mode WAL).
+# Simpan catatan = satu INSERT (bukan baca-gabung-tulis ulang seluruh CSV),
+# aman dipakai beberapa petugas sekaligus, dan "Recent Notes" cukup query ber-index.
+# Browser catatan (halaman Data & Catatan): urut/filter/halaman di SQL (index timestamp & nama_usaha),
+# pencarian teks lewat index FTS5 (LIKE kalau SQLite tidak punya FTS5), eksport dibaca per potongan.
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+NOTE_COLUMNS = ["timestamp", "nama_usaha", "lat", "lon", "catatan"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    nama_usaha TEXT,
+    lat REAL,
+    lon REAL,
+    catatan TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_notes_nama_usaha ON notes (nama_usaha);
+CREATE INDEX IF NOT EXISTS idx_notes_timestamp ON notes (timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# index teks nama_usaha + catatan, diisi trigger (external content: teks tidak disimpan dua kali)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(nama_usaha, catatan, content='notes', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts (rowid, nama_usaha, catatan) VALUES (new.id, new.nama_usaha, new.catatan);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, nama_usaha, catatan) VALUES ('delete', old.id, old.nama_usaha, old.catatan);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE ON notes BEGIN
+    INSERT INTO notes_fts (notes_fts, rowid, nama_usaha, catatan) VALUES ('delete', old.id, old.nama_usaha, old.catatan);
+    INSERT INTO notes_fts (rowid, nama_usaha, catatan) VALUES (new.id, new.nama_usaha, new.catatan);
+END;
+"""
+
+SORT_COLUMNS = ["timestamp", "nama_usaha"]  # kolom ber-index yang bisa dipakai untuk urutan browser
+NOTE_DTYPES = {"timestamp": "str", "nama_usaha": "str", "lat": float, "lon": float, "catatan": "str"}
+
+
+class NotesStore:
+    def __init__(self, db_path, legacy_csv=None):
+        self.db_path = db_path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        self.fts = self._init_fts(conn)
+        if legacy_csv:
+            self.migrate_from_csv(legacy_csv)
+
+    def _conn(self):
+        # satu koneksi per thread (tiap sesi Streamlit jalan di thread sendiri)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_fts(self, conn):
+        """Buat index FTS5 (sekali isi dari catatan lama); False kalau SQLite tanpa FTS5."""
+        try:
+            with conn:
+                conn.executescript(FTS_SCHEMA)
+                if conn.execute("SELECT value FROM meta WHERE key = 'fts_built'").fetchone() is None:
+                    conn.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+                    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('fts_built', '1')")
+        except sqlite3.OperationalError:
+            return False
+        return True
+
+    def migrate_from_csv(self, csv_path):
+        """Impor catatan_kunjungan.csv lama satu kali saja (ditandai di tabel meta)."""
+        conn = self._conn()
+        if self._migrated(conn) or not os.path.exists(csv_path):
+            return 0
+        old = pd.read_csv(csv_path)
+        for c in NOTE_COLUMNS:
+            if c not in old.columns:
+                old[c] = None
+        rows = [
+            (str(r[0]), None if pd.isna(r[1]) else str(r[1]),
+             None if pd.isna(r[2]) else float(r[2]), None if pd.isna(r[3]) else float(r[3]),
+             None if pd.isna(r[4]) else str(r[4]))
+            for r in old[NOTE_COLUMNS].itertuples(index=False)
+        ]
+        # cek ulang + insert + tanda dalam satu transaksi tulis (BEGIN IMMEDIATE = lock tulis diambil di awal):
+        # sesi lain yang membuka store bersamaan menunggu, lalu melihat tanda & tidak mengimpor dua kali
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._migrated(conn):
+                conn.rollback()
+                return 0
+            conn.executemany(
+                "INSERT INTO notes (timestamp, nama_usaha, lat, lon, catatan) VALUES (?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_csv', ?)",
+                         (os.path.abspath(csv_path),))
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return len(rows)
+
+    def _migrated(self, conn):
+        return conn.execute("SELECT value FROM meta WHERE key = 'migrated_csv'").fetchone() is not None
+
+    def add(self, timestamp, nama_usaha, lat, lon, catatan):
+        conn = self._conn()
+        with conn:
+            conn.execute(
+                "INSERT INTO notes (timestamp, nama_usaha, lat, lon, catatan) VALUES (?, ?, ?, ?, ?)",
+                (timestamp, nama_usaha, float(lat), float(lon), catatan))
+
+    def count(self, **filters):
+        """Jumlah catatan (yang cocok dengan filter browser: search, date_from, date_to)."""
+        where, params = self._where(**filters)
+        return self._conn().execute(f"SELECT COUNT(*) FROM notes{where}", params).fetchone()[0]
+
+    def _frame(self, sql, params=()):
+        cur = self._conn().execute(sql, params)
+        return pd.DataFrame(cur.fetchall(), columns=NOTE_COLUMNS)
+
+    def recent(self, limit=6):
+        """Catatan terbaru (pakai index timestamp, tidak membaca semua catatan)."""
+        return self._frame(
+            "SELECT timestamp, nama_usaha, lat, lon, catatan FROM notes "
+            "ORDER BY timestamp DESC, id DESC LIMIT ?", (limit,))
+
+    def _where(self, search="", date_from=None, date_to=None):
+        # klausa WHERE + parameter untuk filter browser; tanggal "YYYY-MM-DD" dibandingkan dengan prefix timestamp
+        clauses, params = [], []
+        words = search.split()
+        if words and self.fts:
+            # tiap kata jadi prefix query FTS5 (semua kata harus ada), tanda kutip di-escape
+            clauses.append("id IN (SELECT rowid FROM notes_fts WHERE notes_fts MATCH ?)")
+            params.append(" ".join('"' + w.replace('"', '""') + '"*' for w in words))
+        elif words:
+            for w in words:
+                clauses.append("(nama_usaha LIKE ? OR catatan LIKE ?)")
+                params += [f"%{w}%", f"%{w}%"]
+        if date_from is not None:
+            clauses.append("timestamp >= ?")
+            params.append(str(date_from))
+        if date_to is not None:
+            clauses.append("timestamp < ?")
+            params.append(f"{date_to}~")  # '~' > semua karakter jam, jadi seluruh hari date_to ikut
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _select(self, sort, ascending, filters):
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"sort harus salah satu dari {SORT_COLUMNS}")
+        where, params = self._where(**filters)
+        order = "ASC" if ascending else "DESC"
+        return (f"SELECT timestamp, nama_usaha, lat, lon, catatan FROM notes{where} "
+                f"ORDER BY {sort} {order}, id {order}"), params
+
+    def page(self, offset, limit, sort="timestamp", ascending=False, **filters):
+        """Satu halaman catatan (urut di SQL lewat index kolom sort); filter: search, date_from, date_to."""
+        sql, params = self._select(sort, ascending, filters)
+        return self._frame(f"{sql} LIMIT ? OFFSET ?", (*params, limit, offset))
+
+    def iter_frames(self, chunk=50_000, sort="timestamp", ascending=False, **filters):
+        """Catatan yang cocok sebagai beberapa frame berukuran <= chunk (untuk eksport tanpa memuat semua)."""
+        sql, params = self._select(sort, ascending, filters)
+        cur = self._conn().execute(sql, params)
+        while True:
+            rows = cur.fetchmany(chunk)
+            if not rows:
+                break
+            yield pd.DataFrame(rows, columns=NOTE_COLUMNS).astype(NOTE_DTYPES)
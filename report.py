@@ -0,0 +1,230 @@
+# report.py
+# Laporan batch tanpa Streamlit: peta HTML + tabel CSV/Parquet untuk banyak daerah dan/atau titik pusat x radius
+# sekaligus. Memakai loader, FilterIndex, spatial index, Aggregates & DBSCAN yang sama dengan dashboard.
+# Job dibagi ke process pool; tiap worker memuat dataset (snapshot kolumnar) & index-nya sekali saja.
+#   python report.py --daerah all --out laporan
+#   python report.py --center "Java Lotus Hotel Jember" --centers-file pusat.txt --radius 300,500 --jenis Hotel
+#   python report.py --daerah Patrang,Gebang --auto-cluster 200,5 --format parquet --workers 4
+import argparse
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from aggregates import Aggregates
+from config import (DATA_PATH, AREAS_PATH, AREAS_NAME_FIELD, DAERAH_MODE, DISTANCE_METHOD,
+                    MAX_AUTO_CLUSTERS_DRAWN, CLUSTER_PALETTE)
+from data_store import PARQUET_AVAILABLE, dataset_loader
+from filter_index import ALL, FilterIndex
+from name_index import NameIndex
+from spatial_index import build_index
+
+TABLE_COLUMNS = ["nama_usaha", "Jenis Usaha", "daerah", "lat", "lon", "review"]
+SUMMARY_COLUMNS = ["job", "daerah", "pusat", "radius_m", "jumlah_usaha", "review_total", "rata_review",
+                   "n_cluster", "peta", "tabel_usaha", "tabel_jenis", "detik", "error"]
+
+# state per proses worker (diisi _init_worker)
+_STATE = {}
+
+
+def _init_worker(data_path, areas_path, name_field, daerah_mode):
+    """Muat dataset & index sekali per proses (bukan per job)."""
+    df = dataset_loader(areas_path, name_field, daerah_mode)(data_path)
+    _STATE.update(df=df, findex=FilterIndex(df), sindex=build_index(df), names=NameIndex(df), agg=Aggregates(df))
+
+
+def slug(text):
+    """Nama file aman dari nama daerah / usaha."""
+    return re.sub(r"[^\w.-]+", "_", str(text)).strip("_")[:80] or "tanpa_nama"
+
+
+def _write_table(df, path, fmt):
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def _add_auto_clusters(m, sub, auto):
+    """DBSCAN di atas `sub` + poligon hull (seperti halaman Peta Cluster); label per baris sub."""
+    from clustering import cluster_hulls, dbscan
+    import folium
+    lats, lons = sub["lat"].to_numpy(dtype=float), sub["lon"].to_numpy(dtype=float)
+    labels = dbscan(lats, lons, eps_m=auto[0], min_samples=auto[1])
+    for h in cluster_hulls(lats, lons, labels, max_clusters=MAX_AUTO_CLUSTERS_DRAWN):
+        if h["coords"] is None:
+            continue
+        color = CLUSTER_PALETTE[h["label"] % len(CLUSTER_PALETTE)]
+        folium.Polygon(locations=h["coords"], color=color, weight=2, fill=True, fill_color=color, fill_opacity=0.2,
+                       tooltip=f"Auto cluster {h['label'] + 1}: {h['size']} usaha").add_to(m)
+    return labels
+
+
+def run_job(job, out_dir, filters, fmt, auto=None):
+    """Satu laporan (peta + tabel usaha + ringkasan per Jenis Usaha); dict satu baris ringkasan.
+
+    job: {"job", "stem", "daerah"} atau {"job", "stem", "pusat", "radius_m"}.
+    """
+    import folium
+    from map_render import add_business_markers, popup_last_line
+
+    t0 = time.perf_counter()
+    row = {c: None for c in SUMMARY_COLUMNS}
+    row.update({k: v for k, v in job.items() if k in row})
+    df, findex, agg = _STATE["df"], _STATE["findex"], _STATE["agg"]
+    try:
+        jenis, min_review, max_review, high_review_only = filters
+        if "daerah" in job:
+            rows = findex.query(jenis, job["daerah"], min_review, max_review, high_review_only)
+            sub = df.iloc[rows][TABLE_COLUMNS].copy()
+            last_line = popup_last_line(sub, "review", "Review: {}")
+            ok = sub["lat"].notna() & sub["lon"].notna()
+            center = [float(sub["lat"][ok].median()), float(sub["lon"][ok].median())] if ok.any() else [0.0, 0.0]
+            m = folium.Map(location=center, zoom_start=13, tiles="CartoDB positron")
+        else:
+            pos = _STATE["names"].row(job["pusat"])
+            if pos is None:
+                raise ValueError(f"usaha '{job['pusat']}' tidak ada di data")
+            center = [float(df["lat"].iat[pos]), float(df["lon"].iat[pos])]
+            if np.isnan(center).any():
+                raise ValueError(f"usaha '{job['pusat']}' tidak punya koordinat")
+            rows, dist = _STATE["sindex"].query_radius(center, job["radius_m"], method=DISTANCE_METHOD)
+            # filter sidebar yang sama (jenis / review) diterapkan ke hasil radius
+            keep = np.isin(rows, findex.query(jenis, ALL, min_review, max_review, high_review_only))
+            rows, dist = rows[keep], dist[keep]
+            sub = df.iloc[rows][TABLE_COLUMNS].copy()
+            sub["jarak_m"] = dist.astype(int)
+            last_line = popup_last_line(sub, "jarak_m", "{} m")
+            m = folium.Map(location=center, zoom_start=15, tiles="CartoDB positron")
+            folium.Circle(location=center, radius=job["radius_m"], color="#4B7BEC", fill=True, fill_opacity=0.12).add_to(m)
+        # selalu mode batch: satu layer JSON, bukan satu elemen folium (template) per usaha
+        add_business_markers(m, sub, last_line, threshold=0)
+        if auto is not None and len(sub):
+            sub["cluster"] = _add_auto_clusters(m, sub, auto) + 1  # 0 = di luar cluster
+            row["n_cluster"] = int(sub["cluster"].max())
+        if "jarak_m" in sub.columns:
+            sub = sub.sort_values("jarak_m", kind="stable")
+
+        base = os.path.join(out_dir, job["stem"])
+        row["peta"] = base + ".html"
+        m.save(row["peta"])
+        row["tabel_usaha"] = f"{base}_usaha.{fmt}"
+        _write_table(sub, row["tabel_usaha"], fmt)
+        row["tabel_jenis"] = f"{base}_jenis.{fmt}"
+        _write_table(agg.table("Jenis Usaha", ("report", job["stem"]), rows), row["tabel_jenis"], fmt)
+        review = sub["review"].to_numpy(dtype=float)
+        row.update(jumlah_usaha=len(sub), review_total=float(np.nansum(review)),
+                   rata_review=float(np.nanmean(review)) if len(sub) else float("nan"))
+    except Exception as e:  # satu job gagal tidak menghentikan laporan lain
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["detik"] = round(time.perf_counter() - t0, 3)
+    return row
+
+
+def plan_jobs(daerah, centers, radii, daerah_options):
+    """Daftar job; nama file (stem) dibuat unik di sini, sebelum dibagi ke worker."""
+    jobs, used = [], set()
+
+    def _stem(folder, name):
+        stem, i = f"{folder}/{slug(name)}", 2
+        while stem in used:
+            stem, i = f"{folder}/{slug(name)}_{i}", i + 1
+        used.add(stem)
+        return stem
+
+    if daerah:
+        names = daerah_options if daerah == ["all"] else daerah
+        for d in names:
+            jobs.append({"job": "daerah", "stem": _stem("daerah", d), "daerah": d})
+    for c in centers:
+        for r in radii:
+            jobs.append({"job": "radius", "stem": _stem("radius", f"{c}_{r}m"), "pusat": c, "radius_m": r})
+    return jobs
+
+
+def _split(text, cast=str):
+    return [cast(x.strip()) for x in text.split(",") if x.strip()] if text else []
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Laporan peta & tabel batch tanpa Streamlit.")
+    ap.add_argument("--data", default=DATA_PATH, help="CSV data usaha (default: DATA_PATH di config.py)")
+    ap.add_argument("--out", default="laporan", help="folder output")
+    ap.add_argument("--daerah", default=None, help="'all' atau daftar daerah dipisah koma")
+    ap.add_argument("--center", action="append", default=[], help="nama usaha titik pusat (boleh berulang)")
+    ap.add_argument("--centers-file", default=None, help="file teks, satu nama usaha titik pusat per baris")
+    ap.add_argument("--radius", default="300", help="radius meter untuk tiap titik pusat, dipisah koma")
+    ap.add_argument("--jenis", default=ALL, help="filter Jenis Usaha (default: semua)")
+    ap.add_argument("--min-review", type=float, default=None)
+    ap.add_argument("--max-review", type=float, default=None)
+    ap.add_argument("--high-review", action="store_true", help="hanya usaha dengan review > 1000")
+    ap.add_argument("--auto-cluster", default=None, metavar="EPS_M,MIN", help="tambah cluster otomatis DBSCAN")
+    ap.add_argument("--format", choices=["csv", "parquet"], default="csv", help="format tabel")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--areas", default=AREAS_PATH, help="GeoJSON batas daerah (dipakai kalau ada)")
+    args = ap.parse_args(argv)
+
+    if args.format == "parquet" and not PARQUET_AVAILABLE:
+        ap.error("format parquet butuh pyarrow")
+    auto = None
+    if args.auto_cluster:
+        try:
+            eps, min_samples = _split(args.auto_cluster)
+            auto = (float(eps), int(min_samples))
+        except ValueError:
+            auto = None
+        if auto is None or not auto[0] > 0 or auto[1] < 1:
+            ap.error("--auto-cluster butuh EPS_M,MIN")
+    try:
+        radii = _split(args.radius, int)
+    except ValueError:
+        radii = []
+    if not radii or min(radii) <= 0:
+        ap.error("--radius butuh bilangan bulat meter > 0, dipisah koma")
+    centers = list(args.center)
+    if args.centers_file:
+        with open(args.centers_file, encoding="utf-8") as f:
+            centers += [line.strip() for line in f if line.strip()]
+    if not args.daerah and not centers:
+        ap.error("pilih minimal --daerah atau --center / --centers-file")
+
+    t0 = time.perf_counter()
+    init_args = (args.data, args.areas, AREAS_NAME_FIELD, DAERAH_MODE)
+    _init_worker(*init_args)  # daftar daerah untuk "all" + dipakai langsung kalau --workers 1
+    jobs = plan_jobs(_split(args.daerah), centers, radii, _STATE["findex"].options("daerah"))
+    filters = (args.jenis, args.min_review, args.max_review, args.high_review)
+    for folder in {os.path.dirname(j["stem"]) for j in jobs}:
+        os.makedirs(os.path.join(args.out, folder), exist_ok=True)
+
+    results = [None] * len(jobs)  # urutan ringkasan = urutan job, bukan urutan selesai
+    workers = max(1, min(args.workers, len(jobs)))
+
+    def _done(i, row):
+        results[i] = row
+        done = sum(r is not None for r in results)
+        print(f"[{done}/{len(jobs)}] {jobs[i]['stem']} {row['error'] or ''}", file=sys.stderr)
+
+    if workers == 1:
+        for i, job in enumerate(jobs):
+            _done(i, run_job(job, args.out, filters, args.format, auto))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            futures = {pool.submit(run_job, job, args.out, filters, args.format, auto): i for i, job in enumerate(jobs)}
+            for f in as_completed(futures):
+                _done(futures[f], f.result())
+
+    summary = pd.DataFrame(results, columns=SUMMARY_COLUMNS).astype({"jumlah_usaha": "Int64", "n_cluster": "Int64"})
+    summary_path = os.path.join(args.out, f"ringkasan.{args.format}")
+    _write_table(summary, summary_path, args.format)
+    failed = int(summary["error"].notna().sum())
+    print(f"{len(jobs)} laporan ({failed} gagal) dengan {workers} proses dalam {time.perf_counter() - t0:.1f} detik; "
+          f"ringkasan: {summary_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
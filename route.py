@@ -0,0 +1,130 @@
+# route.py
+# Optimasi urutan kunjungan: matriks jarak vektor (haversine), konstruksi nearest neighbour,
+# lalu perbaikan 2-opt + Or-opt. Titik awal selalu di urutan pertama; rute boleh terbuka
+# (selesai di usaha terakhir) atau kembali ke titik awal.
+import time
+
+import numpy as np
+
+from geo import haversine_np
+
+
+def distance_matrix(lats, lons):
+    """Matriks jarak (meter) n x n untuk semua pasangan titik, satu kali broadcast NumPy."""
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    return haversine_np(lats[:, None], lons[:, None], lats[None, :], lons[None, :])
+
+
+def _with_end_node(D, return_to_start):
+    # node virtual di akhir rute: jarak 0 ke semua titik (rute terbuka)
+    # atau salinan titik awal (rute kembali ke awal)
+    n = len(D)
+    E = np.zeros((n + 1, n + 1))
+    E[:n, :n] = D
+    if return_to_start:
+        E[n, :n] = D[0]
+        E[:n, n] = D[:, 0]
+    return E
+
+
+def nearest_neighbour(D, start=0):
+    """Rute awal: selalu lanjut ke titik terdekat yang belum dikunjungi."""
+    n = len(D)
+    route = [start]
+    visited = np.zeros(n, dtype=bool)
+    visited[start] = True
+    current = start
+    for _ in range(n - 1):
+        d = np.where(visited, np.inf, D[current])
+        current = int(np.argmin(d))
+        route.append(current)
+        visited[current] = True
+    return np.array(route, dtype=np.int64)
+
+
+def route_length(route, D):
+    route = np.asarray(route)
+    return float(D[route[:-1], route[1:]].sum())
+
+
+def two_opt(route, D, deadline=None, eps=1e-9):
+    """Balik segmen route[i..j] selama ada yang memperpendek rute (ujung pertama & terakhir tetap)."""
+    route = route.copy()
+    n = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 2):
+            a, b = route[i - 1], route[i]
+            c = route[i + 1:n - 1]
+            d = route[i + 2:n]
+            gain = D[a, b] + D[c, d] - D[a, c] - D[b, d]
+            k = int(np.argmax(gain))
+            if gain[k] > eps:
+                j = i + 1 + k
+                route[i:j + 1] = route[i:j + 1][::-1]
+                improved = True
+            if deadline is not None and time.perf_counter() > deadline:
+                return route
+    return route
+
+
+def or_opt(route, D, max_seg=3, deadline=None, eps=1e-9):
+    """Pindahkan segmen 1..max_seg titik (boleh dibalik) ke posisi lain yang lebih murah."""
+    route = list(route)
+    n = len(route)
+    improved = True
+    while improved:
+        improved = False
+        for seg in range(1, max_seg + 1):
+            i = 1
+            while i + seg < n:  # segmen route[i:i+seg], tidak termasuk ujung pertama & terakhir
+                prev, s0, s1, nxt = route[i - 1], route[i], route[i + seg - 1], route[i + seg]
+                remove_gain = D[prev, s0] + D[s1, nxt] - D[prev, nxt]
+                rest = np.array(route[:i] + route[i + seg:])
+                p, q = rest[:-1], rest[1:]
+                base = D[p, q]
+                ins = D[p, s0] + D[s1, q] - base
+                ins_rev = D[p, s1] + D[s0, q] - base
+                best_fwd, best_rev = int(np.argmin(ins)), int(np.argmin(ins_rev))
+                rev = ins_rev[best_rev] < ins[best_fwd]
+                k = best_rev if rev else best_fwd
+                cost = ins_rev[k] if rev else ins[k]
+                if remove_gain - cost > eps:
+                    segment = route[i:i + seg]
+                    if rev:
+                        segment = segment[::-1]
+                    rest = list(rest)
+                    route = rest[:k + 1] + segment + rest[k + 1:]
+                    improved = True
+                else:
+                    i += 1
+                if deadline is not None and time.perf_counter() > deadline:
+                    return np.array(route, dtype=np.int64)
+    return np.array(route, dtype=np.int64)
+
+
+def plan_route(start, lats, lons, return_to_start=False, time_limit=5.0):
+    """Urutan kunjungan optimal-ish dari titik `start` (lat, lon) ke semua titik lats/lons.
+
+    Hasil: (urutan index ke lats/lons, panjang rute meter, panjang rute nearest neighbour).
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    if len(lats) == 0:
+        return np.empty(0, dtype=np.int64), 0.0, 0.0
+    deadline = time.perf_counter() + time_limit
+    D = distance_matrix(np.r_[start[0], lats], np.r_[start[1], lons])
+    E = _with_end_node(D, return_to_start)
+    end = len(D)
+    route = np.r_[nearest_neighbour(D, 0), end]
+    nn_len = route_length(route, E)
+    while True:
+        before = route_length(route, E)
+        route = two_opt(route, E, deadline=deadline)
+        route = or_opt(route, E, deadline=deadline)
+        if route_length(route, E) >= before - 1e-6 or time.perf_counter() > deadline:
+            break
+    order = route[1:-1] - 1  # buang titik awal & node akhir -> index ke lats/lons
+    return order, route_length(route, E), nn_len
@@ -0,0 +1,210 @@
+# spatial_index.py
+# Grid bucket index untuk query radius / nearest neighbour pada lat/lon.
+# Titik dikelompokkan ke sel grid (ukuran ~cell_m meter); query hanya menghitung jarak
+# untuk titik di sel-sel yang menyentuh bounding box radius, bukan seluruh dataset.
+import numpy as np
+
+from geo import distances_from, haversine_np
+
+M_PER_DEG_LAT = 111320.0
+NO_CELL = np.iinfo(np.int64).min  # sel untuk baris tanpa koordinat (tidak masuk index)
+BBOX_MARGIN = 1.01  # cadangan kecil: jarak ellipsoid bisa sedikit > jarak bola
+
+
+class GridIndex:
+    def __init__(self, lats, lons, cell_m=250):
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        self.lats = lats
+        self.lons = lons
+        self.n = len(lats)
+        self.cell_m = float(cell_m)
+
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        lat0 = float(np.mean(lats[valid])) if valid.any() else 0.0
+        self.lat_step = self.cell_m / M_PER_DEG_LAT
+        self.lon_step = self.cell_m / (M_PER_DEG_LAT * max(np.cos(np.radians(lat0)), 1e-6))
+        self._set_cells(self._cells_for(lats, lons))
+
+    def _cells_for(self, lats, lons):
+        cells = np.full(len(lats), NO_CELL, dtype=np.int64)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        cells[valid] = self._cell_key(self._cy(lats[valid]), self._cx(lons[valid]))
+        return cells
+
+    def _set_cells(self, row_cell):
+        # baris diurutkan per sel -> tiap sel adalah satu potongan kontigu dari `order`
+        self.row_cell = row_cell
+        valid = np.flatnonzero(row_cell != NO_CELL)
+        keys = row_cell[valid]
+        sort = np.argsort(keys, kind="stable")
+        self.order = valid[sort]
+        sorted_keys = keys[sort]
+        self.keys, self.starts = np.unique(sorted_keys, return_index=True)
+        self.ends = np.append(self.starts[1:], len(sorted_keys))
+        first = self.order[self.starts]
+        self.cell_cy = self._cy(self.lats[first])
+        self.cell_cx = self._cx(self.lons[first])
+
+    # --- helpers sel ---
+    def _cy(self, lats):
+        return np.floor(np.asarray(lats) / self.lat_step).astype(np.int64)
+
+    def _cx(self, lons):
+        return np.floor(np.asarray(lons) / self.lon_step).astype(np.int64)
+
+    @staticmethod
+    def _cell_key(cy, cx):
+        return (cy << 32) + (cx & 0xFFFFFFFF)
+
+    def _rows_in_cells(self, cy0, cy1, cx0, cx1):
+        cys, cxs = np.meshgrid(np.arange(cy0, cy1 + 1), np.arange(cx0, cx1 + 1), indexing="ij")
+        want = self._cell_key(cys.ravel(), cxs.ravel())
+        pos = np.searchsorted(self.keys, want)
+        ok = pos < len(self.keys)
+        pos, want = pos[ok], want[ok]
+        hit = pos[self.keys[pos] == want]
+        if len(hit) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.order[s:e] for s, e in zip(self.starts[hit], self.ends[hit])])
+
+    def candidates(self, center, radius_m):
+        """Index baris (posisi) yang selnya menyentuh bounding box lingkaran radius."""
+        clat, clon = center
+        r = radius_m * BBOX_MARGIN
+        dlat = r / M_PER_DEG_LAT
+        cos_lat = max(np.cos(np.radians(min(abs(clat) + dlat, 89.9))), 1e-6)
+        dlon = r / (M_PER_DEG_LAT * cos_lat)
+        cy0, cy1 = self._cy(clat - dlat), self._cy(clat + dlat)
+        cx0, cx1 = self._cx(clon - dlon), self._cx(clon + dlon)
+        if (cy1 - cy0 + 1) * (cx1 - cx0 + 1) >= len(self.keys):
+            # radius lebih luas dari isi grid -> scan semua titik valid saja
+            return self.order.copy()
+        return self._rows_in_cells(int(cy0), int(cy1), int(cx0), int(cx1))
+
+    def query_radius(self, center, radius_m, method="haversine"):
+        """(index baris, jarak meter) untuk semua titik dalam radius, terurut menurut posisi baris."""
+        cand = self.candidates(center, radius_m)
+        if len(cand) == 0:
+            return cand, np.empty(0)
+        cand.sort()
+        dist = distances_from(center, self.lats[cand], self.lons[cand], method=method)
+        keep = dist <= radius_m
+        return cand[keep], dist[keep]
+
+    def query_bbox(self, south, west, north, east):
+        """Index baris (terurut) yang berada di dalam kotak lat/lon [south..north] x [west..east]."""
+        cy0, cy1 = self._cy(south), self._cy(north)
+        cx0, cx1 = self._cx(west), self._cx(east)
+        if (cy1 - cy0 + 1) * (cx1 - cx0 + 1) >= len(self.keys):
+            cand = self.order.copy()  # kotak lebih luas dari isi grid (zoom jauh) -> scan semua
+        else:
+            cand = self._rows_in_cells(int(cy0), int(cy1), int(cx0), int(cx1))
+        la, lo = self.lats[cand], self.lons[cand]
+        cand = cand[(la >= south) & (la <= north) & (lo >= west) & (lo <= east)]
+        cand.sort()
+        return cand
+
+    def neighbour_pairs(self, radius_m):
+        """Semua pasangan baris (i, j, jarak) dengan jarak haversine <= radius_m, masing-masing sekali.
+
+        Hanya sel yang bertetangga yang dipasangkan (bukan all-pairs), jadi biaya ~ N x kepadatan lokal.
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0))
+        if len(self.keys) == 0:
+            return empty
+        r = radius_m * BBOX_MARGIN
+        valid_lats = self.lats[self.order]
+        cos_min = max(np.cos(np.radians(min(float(np.max(np.abs(valid_lats))) + r / M_PER_DEG_LAT, 89.9))), 1e-6)
+        ry = int(np.ceil(r / (self.lat_step * M_PER_DEG_LAT)))
+        rx = int(np.ceil(r / (self.lon_step * M_PER_DEG_LAT * cos_min)))
+        counts = self.ends - self.starts
+        out_i, out_j, out_d = [], [], []
+        for dy in range(0, ry + 1):
+            for dx in range(-rx, rx + 1):
+                if dy == 0 and dx < 0:
+                    continue  # setengah tetangga saja -> tiap pasangan sel sekali
+                want = self._cell_key(self.cell_cy + dy, self.cell_cx + dx)
+                pos = np.searchsorted(self.keys, want)
+                ok = pos < len(self.keys)
+                ok[ok] = self.keys[pos[ok]] == want[ok]
+                a_cells, b_cells = np.flatnonzero(ok), pos[ok]
+                if len(a_cells) == 0:
+                    continue
+                ca, cb = counts[a_cells], counts[b_cells]
+                sizes = ca * cb
+                pair_cell = np.repeat(np.arange(len(a_cells)), sizes)
+                within = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+                ia = within // cb[pair_cell]
+                ib = within % cb[pair_cell]
+                if dy == 0 and dx == 0:
+                    keep = ia < ib  # sel yang sama: buang pasangan diri sendiri & duplikat
+                    pair_cell, ia, ib = pair_cell[keep], ia[keep], ib[keep]
+                i = self.order[self.starts[a_cells][pair_cell] + ia]
+                j = self.order[self.starts[b_cells][pair_cell] + ib]
+                d = haversine_np(self.lats[i], self.lons[i], self.lats[j], self.lons[j])
+                close = d <= radius_m
+                out_i.append(i[close])
+                out_j.append(j[close])
+                out_d.append(d[close])
+        if not out_i:
+            return empty
+        return np.concatenate(out_i), np.concatenate(out_j), np.concatenate(out_d)
+
+    def nearest(self, center, k=1, method="haversine", exclude=None):
+        """k titik terdekat dari center -> (index baris, jarak meter), terurut dari yang terdekat."""
+        if len(self.order) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        k = min(k, len(self.order) - (1 if exclude is not None else 0))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        clat, clon = center
+        cy, cx = int(self._cy(clat)), int(self._cx(clon))
+        # perlebar cincin sel sampai cukup kandidat, lalu pastikan dengan query radius
+        w = 1
+        while True:
+            if (2 * w + 1) ** 2 >= len(self.keys):
+                cand = self.order.copy()
+            else:
+                cand = self._rows_in_cells(cy - w, cy + w, cx - w, cx + w)
+            if exclude is not None:
+                cand = cand[cand != exclude]
+            if len(cand) >= k:
+                break
+            w *= 2
+        dist = distances_from(center, self.lats[cand], self.lons[cand], method=method)
+        dk = np.partition(dist, k - 1)[k - 1]
+        cand, dist = self.query_radius(center, dk, method=method)
+        if exclude is not None:
+            keep = cand != exclude
+            cand, dist = cand[keep], dist[keep]
+        top = np.argsort(dist, kind="stable")[:k]
+        return cand[top], dist[top]
+
+
+def build_index(df, cell_m=250):
+    """GridIndex dari kolom lat/lon DataFrame (posisi baris = posisi di df)."""
+    return GridIndex(df["lat"].to_numpy(dtype=float), df["lon"].to_numpy(dtype=float), cell_m=cell_m)
+
+
+def update_index(prev, df, diff):
+    """GridIndex untuk versi data baru berdasarkan index lama + diff dari watcher.
+
+    Sel baris yang tidak berubah diambil dari `prev`; hanya baris baru / berubah yang dihitung ulang.
+    Grid (ukuran sel) tetap sama dengan index lama.
+    """
+    lats = df["lat"].to_numpy(dtype=float)
+    lons = df["lon"].to_numpy(dtype=float)
+    ix = GridIndex.__new__(GridIndex)
+    ix.lats, ix.lons, ix.n = lats, lons, len(lats)
+    ix.cell_m, ix.lat_step, ix.lon_step = prev.cell_m, prev.lat_step, prev.lon_step
+
+    cells = np.empty(len(lats), dtype=np.int64)
+    fresh = np.ones(len(lats), dtype=bool)
+    keep = ~np.isin(diff.matched_new, diff.changed)
+    keep_new, keep_old = diff.matched_new[keep], diff.matched_old[keep]
+    cells[keep_new] = prev.row_cell[keep_old]
+    fresh[keep_new] = False
+    cells[fresh] = ix._cells_for(lats[fresh], lons[fresh])
+    ix._set_cells(cells)
+    return ix
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# Modul dashboard ada di root repo (layout datar), jadi root dimasukkan ke sys.path.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,52 @@
+# tests/test_aggregates.py
+# Agregat yang diperbarui dari diff watcher harus sama dengan agregat yang dihitung ulang dari data baru.
+import numpy as np
+import pandas as pd
+
+from aggregates import GROUP_COLUMNS, HIGH_REVIEW, Aggregates, update_aggregates
+from watcher import diff_frames
+
+
+def _frames(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    old = pd.DataFrame({"nama_usaha": [f"Usaha {i}" for i in range(n)],
+                        "Jenis Usaha": rng.choice(["Hotel", "Kafe", "Toko", "Bengkel"], n),
+                        "daerah": rng.choice(["Patrang", "Gebang", "Kaliwates"], n),
+                        "lat": -8.17 + rng.uniform(-0.05, 0.05, n),
+                        "lon": 113.70 + rng.uniform(-0.05, 0.05, n),
+                        "review": rng.integers(0, 2000, n).astype(float)})
+    old.loc[7, "daerah"] = np.nan
+    old.loc[8, "daerah"] = "Ajung"               # satu-satunya baris Ajung, dihapus di versi baru
+    new = old.copy()
+    new.loc[3, "Jenis Usaha"] = "Hotel" if old.loc[3, "Jenis Usaha"] != "Hotel" else "Kafe"  # pindah kategori
+    new.loc[4, "review"] = HIGH_REVIEW + 500.0   # review berubah (melewati batas review tinggi)
+    new.loc[5, "review"] = 0.0
+    new.loc[6, "daerah"] = "Sumbersari"          # pindah ke kategori yang belum pernah ada
+    new.loc[7, "daerah"] = "Patrang"             # kosong -> terisi
+    new = new.drop(index=[8, 20, 21])
+    extra = pd.DataFrame({"nama_usaha": ["Baru A", "Baru B"], "Jenis Usaha": ["Spa", "Kafe"],
+                          "daerah": ["Arjasa", np.nan], "lat": [-8.16, -8.18], "lon": [113.69, 113.71],
+                          "review": [1500.0, 3.0]})
+    new = pd.concat([new.iloc[:50], extra, new.iloc[50:]], ignore_index=True)
+    return old, new
+
+
+def _same(a, b, col):
+    a, b = a.sort_values(col, ignore_index=True), b.sort_values(col, ignore_index=True)  # seri boleh beda urutan
+    pd.testing.assert_frame_equal(a, b, check_exact=False)
+
+
+def test_incremental_matches_rebuild():
+    old, new = _frames()
+    diff = diff_frames(old, new)
+    assert not diff.full and len(diff.added) and len(diff.removed) and len(diff.changed)
+    updated, fresh = update_aggregates(Aggregates(old), new, diff), Aggregates(new)
+    assert (updated.n, updated.n_high_review) == (fresh.n, fresh.n_high_review)
+    rows = np.flatnonzero(new["review"].to_numpy() > 500)
+    for col in GROUP_COLUMNS:
+        _same(updated.table(col), fresh.table(col), col)
+        _same(updated.table(col, key="review>500", rows=rows), fresh.table(col, key="review>500", rows=rows), col)
+        # jumlah terbanyak tetap di depan
+        assert updated.table(col)["jumlah"].is_monotonic_decreasing
+    assert "Ajung" not in set(updated.table("daerah")["daerah"])
+    assert {"Sumbersari", "Arjasa"} <= set(updated.table("daerah")["daerah"])
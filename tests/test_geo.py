@@ -0,0 +1,60 @@
+# tests/test_geo.py
+# Akurasi jarak versi NumPy dibanding geopy.distance.geodesic (Karney): haversine < 0.6%, ellipsoid < 1 mm.
+import numpy as np
+import pytest
+
+from geo import distances_from, haversine_np, vincenty_np
+
+geodesic = pytest.importorskip("geopy.distance").geodesic
+
+JEMBER = (-8.1724, 113.7005)
+HAVERSINE_REL_TOL = 0.006   # bola vs ellipsoid
+GEODESIC_ABS_TOL = 0.001    # meter
+
+# (titik 1, titik 2): lintas garis tanggal (antimeridian) & hampir antipodal (Vincenty tidak konvergen -> geopy)
+EDGE_CASES = [
+    ((-8.1, 179.95), (-8.2, -179.95)),
+    ((0.0, -179.99), (0.0, 179.99)),
+    ((0.0, 0.0), (0.5, 179.7)),
+    ((0.0, 0.0), (0.5, 179.5)),
+    ((10.0, 0.0), (-10.1, 179.8)),
+]
+
+
+def _points(n=500, spread=2.0, seed=1):
+    rng = np.random.default_rng(seed)
+    return JEMBER[0] + rng.uniform(-spread, spread, n), JEMBER[1] + rng.uniform(-spread, spread, n)
+
+
+def _reference(center, lats, lons):
+    return np.array([geodesic(center, (a, b)).meters for a, b in zip(lats, lons)])
+
+
+def test_haversine_within_tolerance():
+    lats, lons = _points()
+    ref = _reference(JEMBER, lats, lons)
+    for hv in (haversine_np(JEMBER[0], JEMBER[1], lats, lons), distances_from(JEMBER, lats, lons, "haversine")):
+        assert np.max(np.abs(hv - ref) / np.maximum(ref, 1.0)) < HAVERSINE_REL_TOL
+
+
+def test_ellipsoid_within_one_mm():
+    lats, lons = _points()
+    ref = _reference(JEMBER, lats, lons)
+    for vc in (vincenty_np(JEMBER[0], JEMBER[1], lats, lons), distances_from(JEMBER, lats, lons, "geodesic")):
+        assert np.max(np.abs(vc - ref)) < GEODESIC_ABS_TOL
+
+
+@pytest.mark.parametrize("p1,p2", EDGE_CASES)
+def test_antimeridian_and_antipodal(p1, p2):
+    ref = geodesic(p1, p2).meters
+    assert abs(float(vincenty_np(*p1, *p2)) - ref) < GEODESIC_ABS_TOL
+    assert abs(float(haversine_np(*p1, *p2)) - ref) / ref < HAVERSINE_REL_TOL
+
+
+def test_antipodal_fallback_inside_batch():
+    # titik yang tidak konvergen dihitung ulang tanpa mengganggu baris lain
+    lats = np.array([p2[0] for _, p2 in EDGE_CASES[2:]] + [-8.2])
+    lons = np.array([p2[1] for _, p2 in EDGE_CASES[2:]] + [113.8])
+    center = (0.0, 0.0)
+    ref = _reference(center, lats, lons)
+    assert np.max(np.abs(distances_from(center, lats, lons, "geodesic") - ref)) < GEODESIC_ABS_TOL
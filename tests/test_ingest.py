@@ -0,0 +1,98 @@
+# tests/test_ingest.py
+# Import CSV: baris tidak valid dihitung & dilewati, gagal/batal tidak menyentuh file data, sukses = swap atomik.
+import os
+
+import pandas as pd
+import pytest
+
+import ingest
+from ingest import ingest_csv
+
+HEADER = "nama_usaha,Jenis Usaha,daerah,lat,lon,review\n"
+ORIGINAL = HEADER + "Usaha Lama,Hotel,Patrang,-8.15,113.71,10\n"
+
+
+def _files(folder):
+    return sorted(os.listdir(folder))
+
+
+@pytest.fixture
+def dest(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_bytes(ORIGINAL.encode("utf-8"))
+    os.chmod(path, 0o640)
+    return path
+
+
+def test_rejected_rows_counted_and_skipped(tmp_path, dest):
+    src = tmp_path / "upload.csv"
+    src.write_text(HEADER
+                   + "Usaha A,Hotel,Patrang,-8.1,113.7,5\n"
+                   + "Usaha B,Hotel,Patrang,abc,113.7,5\n"    # lat bukan angka
+                   + "Usaha C,Kafe,Gebang,-8.1,200,5\n"       # lon di luar -180..180
+                   + ",Kafe,Gebang,-8.1,113.7,5\n"            # nama_usaha kosong
+                   + "Usaha D,Kafe,Gebang,-8.2,113.8,\n", encoding="utf-8")
+    report = ingest_csv(str(src), str(dest), chunk_rows=2)
+    assert (report.rows_read, report.rows_ok, report.rows_rejected) == (5, 2, 3)
+    assert report.reasons == {"lat kosong / di luar -90..90": 1, "lon kosong / di luar -180..180": 1,
+                              "nama_usaha kosong": 1}
+    assert list(report.rejected["_baris"]) == [3, 4, 5]
+    out = pd.read_csv(dest)
+    assert list(out["nama_usaha"]) == ["Usaha A", "Usaha D"]
+    assert _files(tmp_path) == ["data.csv", "upload.csv"]
+
+
+def test_valid_import_swaps_atomically(tmp_path, dest, monkeypatch):
+    src = tmp_path / "upload.csv"
+    src.write_text(HEADER + "Usaha Baru,Kafe,Gebang,-8.2,113.8,7\n", encoding="utf-8")
+    swaps = []
+    real_replace = os.replace
+
+    def _replace(a, b):
+        # saat swap, file lama masih utuh dan isi baru sudah lengkap di file sementara sefolder
+        assert dest.read_bytes() == ORIGINAL.encode("utf-8")
+        assert os.path.dirname(a) == str(tmp_path)
+        assert pd.read_csv(a)["nama_usaha"].tolist() == ["Usaha Baru"]
+        swaps.append((a, b))
+        real_replace(a, b)
+
+    monkeypatch.setattr(ingest.os, "replace", _replace)
+    ingest_csv(str(src), str(dest))
+    assert len(swaps) == 1 and swaps[0][1] == str(dest)
+    assert pd.read_csv(dest)["nama_usaha"].tolist() == ["Usaha Baru"]
+    assert os.stat(dest).st_mode & 0o777 == 0o640  # izin file lama dipertahankan
+    assert _files(tmp_path) == ["data.csv", "upload.csv"]
+
+
+@pytest.mark.parametrize("content", [
+    "nama_usaha,lat,lon\nUsaha A,-8.1,113.7\n",       # kolom wajib hilang
+    HEADER + ",Hotel,Patrang,abc,113.7,5\n",          # tidak ada baris valid
+    "",                                               # file kosong
+])
+def test_failed_import_leaves_file_untouched(tmp_path, dest, content):
+    src = tmp_path / "upload.csv"
+    src.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        ingest_csv(str(src), str(dest))
+    assert dest.read_bytes() == ORIGINAL.encode("utf-8")
+    assert _files(tmp_path) == ["data.csv", "upload.csv"]
+
+
+def test_aborted_import_leaves_file_untouched(tmp_path, dest, monkeypatch):
+    src = tmp_path / "upload.csv"
+    src.write_text(HEADER + "".join(f"Usaha {i},Kafe,Gebang,-8.2,113.8,{i}\n" for i in range(10)), encoding="utf-8")
+    calls = []
+    real_validate = ingest._validate
+
+    def _validate(chunk):
+        # batal di tengah jalan (chunk kedua), setelah sebagian baris sudah ditulis ke file sementara
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return real_validate(chunk)
+
+    monkeypatch.setattr(ingest, "_validate", _validate)
+    with pytest.raises(KeyboardInterrupt):
+        ingest_csv(str(src), str(dest), chunk_rows=4)
+    assert dest.read_bytes() == ORIGINAL.encode("utf-8")
+    assert _files(tmp_path) == ["data.csv", "upload.csv"]
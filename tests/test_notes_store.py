@@ -0,0 +1,29 @@
+# tests/test_notes_store.py
+# Migrasi CSV catatan lama hanya sekali walau beberapa sesi membuka store bersamaan.
+import threading
+
+import pandas as pd
+
+from notes_store import NOTE_COLUMNS, NotesStore
+
+
+def test_concurrent_migration_imports_once(tmp_path):
+    csv_path, db_path = tmp_path / "catatan.csv", str(tmp_path / "catatan.db")
+    pd.DataFrame([[f"2024-01-{i % 28 + 1:02d} 10:00:00", f"Usaha {i}", -8.1, 113.7, "lama"] for i in range(2000)],
+                 columns=NOTE_COLUMNS).to_csv(csv_path, index=False)
+    NotesStore(db_path)  # schema dibuat dulu, migrasi belum
+    stores = [NotesStore(db_path) for _ in range(4)]  # koneksi terpisah, seperti sesi berbeda
+    barrier = threading.Barrier(len(stores))
+    imported = []
+
+    def _migrate(store):
+        barrier.wait()
+        imported.append(store.migrate_from_csv(str(csv_path)))
+
+    threads = [threading.Thread(target=_migrate, args=(s,)) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(imported) == [0, 0, 0, 2000]
+    assert NotesStore(db_path).count() == 2000
@@ -0,0 +1,55 @@
+# tests/test_viewport.py
+# Tampilan peta mode viewport harus ikut pindah kalau titik pusat / filter (location awal peta) berubah.
+import os
+
+import pytest
+
+from viewport import view_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_view_state_kept_for_same_map():
+    state = view_state({}, [-8.17, 113.70], 15)
+    state.update(center=(-8.0, 113.0), zoom=17, layer_zoom=17, window=(0, 0, 1, 1))
+    again = view_state(state, [-8.17, 113.70], 15)
+    assert again["center"] == (-8.0, 113.0) and again["window"] == (0, 0, 1, 1)
+    assert again["generation"] == 0
+
+
+def test_view_state_reset_when_center_changes():
+    state = view_state({}, [-8.17, 113.70], 15)
+    state.update(center=(-8.0, 113.0), zoom=17, layer_zoom=17, window=(0, 0, 1, 1))
+    moved = view_state(state, [-8.25, 113.60], 15)
+    for k in ["center", "zoom", "layer_zoom", "window"]:
+        assert k not in moved
+    assert moved["origin"] == ((-8.25, 113.60), 15)
+    assert moved["generation"] == 1
+
+
+def _pick(at, query):
+    at.text_input(key="center_choice_map_q").input(query).run()
+    sb = at.selectbox(key="center_choice_map_hasil")
+    sb.set_value(sb.options[0]).run()
+
+
+def test_radius_map_follows_new_center(monkeypatch, tmp_path):
+    AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+    pytest.importorskip("streamlit_folium")
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr("config.NOTES_DB", str(tmp_path / "notes.db"))
+    monkeypatch.setattr("config.CLUSTERS_DB", str(tmp_path / "clusters.db"))
+    at = AppTest.from_file(os.path.join(ROOT, "map2.py"), default_timeout=120)
+    at.run()
+    [c for c in at.sidebar.checkbox if "viewport" in c.label][0].check().run()
+    at.sidebar.radio[0].set_value("Peta Radius").run()
+    _pick(at, "java lotus")
+    first = at.session_state["viewport"]["radius"]["origin"]
+    # seolah-olah pengguna sudah menggeser peta
+    at.session_state["viewport"]["radius"].update(center=(0.0, 0.0), zoom=18, layer_zoom=18, window=(0, 0, 1, 1))
+    _pick(at, "luminor")
+    state = at.session_state["viewport"]["radius"]
+    assert not at.exception
+    assert state["origin"] != first
+    assert "center" not in state and "window" not in state
+    assert state["generation"] == 1
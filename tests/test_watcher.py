@@ -0,0 +1,120 @@
+# tests/test_watcher.py
+# Artefak turunan per versi data: artefak berparameter dibatasi LRU, build yang sama tidak dihitung paralel.
+# Reload yang gagal: versi lama tetap dipakai & error tersedia di last_error.
+# Index yang diperbarui dari diff harus sama dengan index yang dibangun ulang dari nol.
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from spatial_index import build_index, update_index
+from watcher import PARAM_ENTRIES, DatasetState, DatasetWatcher, diff_frames
+
+
+def _state():
+    return DatasetState(pd.DataFrame({"a": [1, 2, 3]}), None, revision=1)
+
+
+def test_parameterised_artefacts_are_bounded():
+    state = _state()
+    state.derived("spatial_index", len)
+    for radius in range(PARAM_ENTRIES + 5):
+        state.derived(("competition", radius), lambda df, r=radius: r)
+    assert state.peek("spatial_index") == 3
+    assert state.peek(("competition", 0)) is None
+    assert state.peek(("competition", PARAM_ENTRIES + 4)) == PARAM_ENTRIES + 4
+
+
+def test_concurrent_requests_build_once():
+    state, calls = _state(), []
+
+    def build(df):
+        calls.append(1)
+        time.sleep(0.2)
+        return "hasil"
+
+    out = []
+    threads = [threading.Thread(target=lambda: out.append(state.derived(("competition", 100), build)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and out == ["hasil"] * 4
+
+
+def _loader(path):
+    df = pd.read_csv(path)
+    if "nama_usaha" not in df.columns:
+        raise ValueError("kolom nama_usaha tidak ada")
+    return df
+
+
+def test_failed_reload_keeps_old_data_and_reports_error(tmp_path):
+    path = tmp_path / "usaha.csv"
+    pd.DataFrame({"nama_usaha": ["A"], "lat": [-8.1], "lon": [113.7]}).to_csv(path, index=False)
+    w = DatasetWatcher(str(path), _loader, background=False)
+    path.write_text("rusak\n1\n")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert w.poll_once() is False
+    assert isinstance(w.last_error, ValueError)
+    assert w.current().df["nama_usaha"].tolist() == ["A"]
+
+    pd.DataFrame({"nama_usaha": ["A", "B"], "lat": [-8.1, -8.2], "lon": [113.7, 113.8]}).to_csv(path, index=False)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 2 * 10**9))
+    assert w.poll_once() is True
+    assert w.last_error is None
+
+
+def _frames(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    old = pd.DataFrame({"nama_usaha": [f"Usaha {i}" for i in range(n)],
+                        "lat": -8.17 + rng.uniform(-0.05, 0.05, n),
+                        "lon": 113.70 + rng.uniform(-0.05, 0.05, n),
+                        "review": rng.integers(0, 2000, n)})
+    old.loc[1] = old.loc[0]                      # key kembar (nama + koordinat sama)
+    old.loc[2, ["lat", "lon"]] = np.nan          # koordinat kosong
+    new = old.copy()
+    new.loc[3, "review"] += 1                    # isi berubah, key sama -> changed
+    new.loc[4, "lat"] += 0.01                    # koordinat berubah -> key baru (removed + added)
+    new.loc[5, ["lat", "lon"]] = np.nan          # koordinat jadi kosong
+    new.loc[2, ["lat", "lon"]] = [-8.16, 113.69]  # koordinat kosong jadi terisi
+    new.loc[1, "review"] += 5                    # salah satu dari key kembar berubah
+    new = new.drop(index=[10, 11, 12])
+    extra = pd.DataFrame({"nama_usaha": ["Usaha 0", "Baru A", "Baru B"],
+                          "lat": [old.loc[0, "lat"], -8.18, np.nan],
+                          "lon": [old.loc[0, "lon"], 113.71, np.nan],
+                          "review": [1, 2, 3]})   # key kembar ketiga, baris baru, baris baru tanpa koordinat
+    new = pd.concat([new.iloc[:100], extra, new.iloc[100:]], ignore_index=True)
+    return old, new
+
+
+def test_diff_frames_edits_adds_removes():
+    old, new = _frames()
+    diff = diff_frames(old, new)
+    assert not diff.full
+    assert sorted(new["nama_usaha"].iloc[diff.added]) == ["Baru A", "Baru B", "Usaha 0", "Usaha 2", "Usaha 4",
+                                                          "Usaha 5"]
+    assert sorted(old["nama_usaha"].iloc[diff.removed]) == ["Usaha 10", "Usaha 11", "Usaha 12", "Usaha 2",
+                                                            "Usaha 4", "Usaha 5"]
+    assert sorted(new["nama_usaha"].iloc[diff.changed]) == ["Usaha 0", "Usaha 3"]  # "Usaha 0" = kembar ke-2
+    assert diff.changed_old.tolist() == [1, 3]
+    assert len(diff.matched_new) == len(new) - len(diff.added)
+
+
+def test_update_index_matches_rebuild():
+    old, new = _frames()
+    diff = diff_frames(old, new)
+    updated, fresh = update_index(build_index(old), new, diff), build_index(new)
+    rng = np.random.default_rng(1)
+    centers = [(-8.17, 113.70), (-8.16, 113.69), (float(new.loc[0, "lat"]), float(new.loc[0, "lon"]))]
+    centers += list(zip(-8.17 + rng.uniform(-0.05, 0.05, 10), 113.70 + rng.uniform(-0.05, 0.05, 10)))
+    for center in centers:
+        for radius in (50, 300, 1500, 20000):
+            rows_u, dist_u = updated.query_radius(center, radius)
+            rows_f, dist_f = fresh.query_radius(center, radius)
+            np.testing.assert_array_equal(rows_u, rows_f)
+            np.testing.assert_allclose(dist_u, dist_f)
+    assert not np.isin(new.index[new["lat"].isna()], updated.query_radius((-8.17, 113.70), 50000)[0]).any()
@@ -0,0 +1,105 @@
+# viewport.py
+# Lazy loading titik peta berdasarkan area yang sedang terlihat (bounds + zoom dari st_folium).
+# Hanya usaha di dalam jendela = bounds layar + margin yang dikirim (dicari lewat GridIndex);
+# kalau zoom jauh / titik terlalu banyak, titik diganti lingkaran jumlah usaha per sel grid.
+# Selama pan/zoom masih di dalam jendela, layer tidak dibangun ulang.
+import folium
+import numpy as np
+
+from heatmap import count_cells
+
+MARGIN = 0.5          # jendela = bounds layar diperlebar 50% ke tiap sisi
+DETAIL_ZOOM = 14      # di bawah zoom ini titik selalu diagregasi
+MAX_POINTS = 2000     # di atas jumlah ini (dalam jendela) titik juga diagregasi
+COUNT_CELL_PX = 80    # ukuran sel agregasi dalam piksel layar
+
+
+def bounds_from_view(center, zoom, width, height):
+    """Perkiraan bounds (south, west, north, east) untuk peta ukuran width x height piksel."""
+    lat, lon = center
+    deg_per_px = 360.0 / (256 * 2 ** zoom)
+    dlon = deg_per_px * width / 2
+    dlat = deg_per_px * height / 2 * max(np.cos(np.radians(lat)), 1e-6)
+    return (lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+
+
+def parse_bounds(bounds):
+    """Bounds hasil st_folium ({'_southWest': {lat, lng}, '_northEast': {...}}) -> tuple, atau None."""
+    try:
+        sw, ne = bounds["_southWest"], bounds["_northEast"]
+        b = (float(sw["lat"]), float(sw["lng"]), float(ne["lat"]), float(ne["lng"]))
+    except (TypeError, KeyError, ValueError):
+        return None
+    return None if any(np.isnan(b)) else b
+
+
+def view_state(state, location, zoom):
+    """State tampilan satu peta (dict di session_state), dibuang kalau location/zoom awal peta berubah.
+
+    Titik pusat atau filter lain = peta baru: center/zoom/window dari peta lama tidak dipakai lagi dan
+    `generation` naik (dipakai di key st_folium supaya nilai balik komponen lama tidak ikut terbawa).
+    """
+    origin = (tuple(float(x) for x in location), zoom)
+    if state.get("origin") != origin:
+        generation = state.get("generation", -1) + 1
+        state.clear()
+        state.update(origin=origin, generation=generation)
+    return state
+
+
+def pad(bounds, margin=MARGIN):
+    s, w, n, e = bounds
+    dlat, dlon = (n - s) * margin, (e - w) * margin
+    return (max(s - dlat, -90.0), w - dlon, min(n + dlat, 90.0), e + dlon)
+
+
+def contains(outer, inner):
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and outer[2] >= inner[2] and outer[3] >= inner[3])
+
+
+def visible_rows(index, rows, window):
+    """Posisi baris dari `rows` (terurut) yang berada di dalam jendela, lewat index.query_bbox."""
+    hit = index.query_bbox(*window)
+    if rows is None:
+        return hit
+    return np.intersect1d(hit, rows, assume_unique=True)
+
+
+def aggregated(zoom, n_visible):
+    return zoom < DETAIL_ZOOM or n_visible > MAX_POINTS
+
+
+def viewport_layer(df, rows, zoom, last_line, name="Usaha (area terlihat)"):
+    """FeatureGroup untuk baris `rows` dari df: marker per usaha, atau jumlah per sel kalau diagregasi.
+
+    `last_line(rows)` -> list string baris terakhir popup (hanya dipanggil untuk mode marker).
+    """
+    fg = folium.FeatureGroup(name=name)
+    lats = df["lat"].to_numpy(dtype=float)[rows]
+    lons = df["lon"].to_numpy(dtype=float)[rows]
+    if aggregated(zoom, len(rows)):
+        clat, clon, cnt = count_cells(lats, lons, zoom, cell_px=COUNT_CELL_PX)
+        for la, lo, c in zip(clat, clon, cnt):
+            size = int(24 + 8 * np.log10(c))
+            folium.Marker(
+                [float(la), float(lo)],
+                tooltip=f"{int(c):,} usaha",
+                icon=folium.DivIcon(
+                    icon_size=(size, size), icon_anchor=(size // 2, size // 2),
+                    html=f"<div style='width:{size}px;height:{size}px;line-height:{size}px;border-radius:50%;"
+                         f"background:rgba(59,130,246,0.75);color:white;text-align:center;font-size:11px;"
+                         f"font-weight:700'>{int(c):,}</div>")
+            ).add_to(fg)
+        return fg
+    sub = df.iloc[rows]
+    names = sub["nama_usaha"].astype(str).to_numpy()
+    jenis = sub["Jenis Usaha"].astype(str).to_numpy()
+    daerah = sub["daerah"].astype(str).to_numpy()
+    lines = last_line(rows)
+    for i in range(len(rows)):
+        folium.CircleMarker(
+            [lats[i], lons[i]], radius=6, color="#2563eb", fill=True, fill_opacity=0.8,
+            popup=f"<b>{names[i]}</b><br>{jenis[i]}<br>{daerah[i]}<br>{lines[i]}"
+        ).add_to(fg)
+    return fg
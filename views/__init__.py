@@ -0,0 +1,64 @@
+# views/__init__.py
+# Satu modul per halaman dashboard. Modul halaman (dan dependensi beratnya: folium, plotly,
+# shapely, clustering, ...) baru di-import saat halaman itu pertama kali dibuka, bukan saat app start.
+import importlib
+from dataclasses import dataclass
+from typing import Any
+
+from competition import competition_frame
+from name_index import NameIndex
+from spatial_index import build_index
+
+# kolom analisis kompetisi yang ditampilkan di tabel (per jenis ada di halaman Data & Catatan)
+COMPETITION_COLUMNS = ["kompetitor_sejenis", "tetangga_total", "kompetitor_terdekat_m"]
+
+# nama halaman (sidebar) -> modul di views/ yang punya render(ctx)
+PAGES = {
+    "Dashboard Utama": "dashboard_utama",
+    "Peta Radius": "peta_radius",
+    "Peta Cluster": "peta_cluster",
+    "Rute Kunjungan": "rute_kunjungan",
+    "Data & Catatan": "data_catatan",
+    "Diagnostics": "diagnostik",
+}
+
+
+def load_view(page):
+    """Modul halaman `page` (di-import sekali per proses, berikutnya dari sys.modules)."""
+    return importlib.import_module(f"{__name__}.{PAGES[page]}")
+
+
+@dataclass
+class PageContext:
+    """State satu rerun yang dibutuhkan halaman: data versi aktif, hasil filter sidebar, store & timer."""
+    watcher: Any
+    dataset: Any
+    data: Any
+    data_rev: Any
+    findex: Any
+    filtered_rows: Any
+    df_filtered: Any
+    filter_key: tuple
+    radius_default: int
+    viewport_on: bool
+    competition_on: bool
+    notes_store: Any
+    cluster_store: Any
+    diag: Any
+    stage_stats: Any
+
+    @property
+    def sindex(self):
+        # grid index lat/lon: dibuat sekali per versi data, hanya kalau ada halaman yang memakainya
+        return self.dataset.derived("spatial_index", build_index)
+
+    @property
+    def names(self):
+        # nama usaha -> posisi baris (O(1)) + pencarian prefix/fuzzy, sekali per versi data
+        return self.dataset.derived("name_index", NameIndex)
+
+    def competition(self):
+        """Kolom analisis kompetisi semua usaha (radius = Default Radius), sekali per versi data & radius."""
+        radius = self.radius_default
+        with self.diag.stage("competition"):
+            return self.dataset.derived(("competition", radius), lambda df: competition_frame(df, radius))
@@ -0,0 +1,173 @@
+# views/dashboard_utama.py
+# Halaman "Dashboard Utama": metrik, chart per daerah / jenis usaha, peta preview (+ heatmap), catatan terbaru.
+import numpy as np
+import streamlit as st
+import folium
+import plotly.express as px
+
+from config import DISTANCE_METHOD, MARKER_BATCH_THRESHOLD, HEATMAP_MAX_CELLS
+from map_render import add_business_markers, popup_last_line
+from aggregates import Aggregates
+from heatmap import heat_levels, add_heatmap
+from views.peta import show_cached_map, show_viewport_map, review_line, pick_business
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def get_heat_levels(filter_key, by_review, _rows, _data):
+    # heatmap pra-agregasi (grid per level zoom), di-cache per filter (filter_key memuat versi data)
+    rows = np.asarray(_rows)
+    weights = _data["review"].to_numpy(dtype=float)[rows] if by_review else None
+    return heat_levels(_data["lat"].to_numpy()[rows], _data["lon"].to_numpy()[rows], weights,
+                       max_cells=HEATMAP_MAX_CELLS)
+
+@st.cache_resource(show_spinner=False, max_entries=64)
+def get_daerah_bar(filter_key, _agg, _rows):
+    # figure jadi per filter (filter_key memuat versi data), dibagi semua sesi: rerun tinggal kirim JSON
+    top8 = _agg.table("daerah", filter_key, _rows).head(8)
+
+    # Buat bar chart horizontal
+    fig_bar = px.bar(
+        top8,
+        x="jumlah",
+        y="daerah",
+        orientation="h",
+        title="",
+        labels={"jumlah": "Jumlah Usaha", "daerah": "Daerah", "rata_review": "Rata-rata Review"},
+        hover_data={"rata_review": ":.0f"},
+    )
+
+    fig_bar.update_traces(textposition="outside")
+
+    # Styling chart premium
+    fig_bar.update_layout(
+        showlegend=False,
+        margin=dict(l=10, r=10, t=10, b=10),
+        height=350,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+    )
+    return fig_bar
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_jenis_pie(data_rev, _agg):
+    # Pie: Persentase Jenis Usaha (seluruh data), sekali per versi data
+    return px.pie(_agg.table("Jenis Usaha"), names="Jenis Usaha", values="jumlah", hole=0.4)
+
+def render(ctx):
+    data, df_filtered, filtered_rows, filter_key = ctx.data, ctx.df_filtered, ctx.filtered_rows, ctx.filter_key
+    radius_default, viewport_on, notes_store, diag = ctx.radius_default, ctx.viewport_on, ctx.notes_store, ctx.diag
+    # jumlah per daerah / jenis usaha: sekali per versi data (inkremental lewat watcher), per filter di-memo
+    agg = ctx.dataset.derived("aggregates", Aggregates)
+
+    # layout
+    c1, c2 = st.columns([2, 1.3])
+    with c1:
+        # metrics cards
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        col_a, col_b, col_c, col_d = st.columns(4)
+        col_a.markdown("<div style='opacity:0.7'>Total Usaha</div>", unsafe_allow_html=True)
+        col_a.markdown(f"<div class='metric'>{len(data):,}</div>", unsafe_allow_html=True)
+
+        col_b.markdown("<div style='opacity:0.7'>Setelah Filter</div>", unsafe_allow_html=True)
+        col_b.markdown(f"<div class='metric'>{len(df_filtered):,}</div>", unsafe_allow_html=True)
+
+        # compute count within default radius around a chosen center (if any)
+        _, center_pos = pick_business(ctx, "Pilih Titik Pusat (untuk hitung radius)", "center_choice_dash")
+        within_count = 0
+        if center_pos is not None:
+            pusat = (data["lat"].iat[center_pos], data["lon"].iat[center_pos])
+            with diag.stage("radius_query"):
+                idx_in, _ = ctx.sindex.query_radius(pusat, radius_default, method=DISTANCE_METHOD)
+            within_count = int(len(idx_in))
+        col_c.markdown("<div style='opacity:0.7'>Dalam Radius</div>", unsafe_allow_html=True)
+        col_c.markdown(f"<div class='metric'>{within_count:,}</div>", unsafe_allow_html=True)
+
+        col_d.markdown("<div style='opacity:0.7'>High Review</div>", unsafe_allow_html=True)
+        col_d.markdown(f"<div class='metric'>{agg.n_high_review:,}</div>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+
+
+        # main map + charts
+        left_col, right_col = st.columns([1.5,1.5])
+        with left_col:
+            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+            st.markdown("<div class='glass'>", unsafe_allow_html=True)
+            st.write("### Top Daerah dengan Usaha Terbanyak")
+
+        # Hitung jumlah usaha per daerah (hasil filter)
+            fig_bar = get_daerah_bar(filter_key, agg, filtered_rows)
+
+        # ⚠️ Penting! Kalau tidak ada ini, grafik TIDAK AKAN muncul
+            st.plotly_chart(fig_bar, use_container_width=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+        with right_col:
+
+            # Top daerah table
+            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("<div class='glass'>", unsafe_allow_html=True)
+            st.write("### Top Daerah dengan Usaha Terbanyak")
+            daerah_count = agg.table("daerah")[["daerah", "jumlah"]]
+            st.table(daerah_count.head(8))
+            st.markdown("</div>", unsafe_allow_html=True)
+
+              # Pie: Persentase Jenis Usaha
+            st.markdown("<div class='glass'>", unsafe_allow_html=True)
+            st.write("### Persentase Jenis Usaha")
+            fig = get_jenis_pie(ctx.data_rev, agg)
+            st.plotly_chart(fig, use_container_width=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+
+    with c2:
+
+
+        #peta 
+        st.markdown("<div class='glass map-box'>", unsafe_allow_html=True)
+        st.write("### Peta Persebaran Usaha (Preview)")
+            # show small folium map with markers
+        if len(df_filtered) == 0:
+            st.info("Tidak ada usaha yang cocok dengan filter.")
+            st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            heat_on = st.checkbox("Tampilkan Heatmap pada preview", value=True)
+            heat_by_review = heat_on and st.checkbox("Bobot heatmap dari jumlah review", value=False)
+
+            def _build_preview_map():
+                center_lat = df_filtered["lat"].median()
+                center_lon = df_filtered["lon"].median()
+                m = folium.Map(location=[center_lat, center_lon], zoom_start=12, tiles="CartoDB dark_matter")
+                if not viewport_on:
+                    add_business_markers(m, df_filtered, popup_last_line(df_filtered, "review", "Review: {}"), threshold=MARKER_BATCH_THRESHOLD)
+
+                # optional heatmap overlay
+                if heat_on:
+                    levels = get_heat_levels(filter_key, heat_by_review, filtered_rows, data)
+                    add_heatmap(m, levels, zoom_start=12, radius=18, blur=10, min_opacity=0.3)
+                return m
+
+            # peta hanya dibangun ulang kalau filter / data / heatmap berubah
+            if viewport_on:
+                show_viewport_map(ctx, "preview", _build_preview_map(), filtered_rows, review_line(data), width=900, height=545)
+            else:
+                show_cached_map(ctx, "preview", ("preview", filter_key, heat_on, heat_by_review), _build_preview_map, width=900, height=545)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+
+ # Recent activity / notes summary
+            st.markdown("<div class='glass'>", unsafe_allow_html=True)
+            st.write("### Recent Notes")
+            recent = notes_store.recent(6)
+            if recent.shape[0] == 0:
+                st.info("Belum ada catatan kunjungan.")
+            else:
+                for _, row in recent.iterrows():
+                    st.markdown(f"**{row['nama_usaha']}** — {row['timestamp']}")
+                    st.markdown(f"<div style='opacity:0.7'>{row['catatan']}</div>", unsafe_allow_html=True)
+                    st.markdown("---")
+            st.markdown("</div>", unsafe_allow_html=True)
+            st.markdown("<div class='glass map-box'>", unsafe_allow_html=True)
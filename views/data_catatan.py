@@ -0,0 +1,179 @@
+# views/data_catatan.py
+# Halaman "Data & Catatan": browser data usaha & catatan kunjungan (urut / filter / cari / per halaman di server,
+# hanya satu halaman yang dikirim ke browser), validasi daerah, eksport (dibuat saat diklik), import data baru.
+import numpy as np
+import streamlit as st
+
+from config import DATA_PATH, AREAS_PATH, DAERAH_MODE
+from export import FORMATS, export_file, frame_chunks
+from ingest import ingest_csv
+from notes_store import SORT_COLUMNS
+
+AREA_CHECK_COLUMNS = ["nama_usaha", "Jenis Usaha", "daerah_input", "daerah_spasial", "lat", "lon"]
+PAGE_SIZES = [25, 50, 100, 200, 500]
+NO_SORT = "(urutan data)"
+
+
+def _area_mismatch(df):
+    # usaha yang isian daerah-nya beda dengan poligon tempat koordinatnya berada
+    return df.loc[df["daerah_sesuai"].eq(False).fillna(False).to_numpy(dtype=bool), AREA_CHECK_COLUMNS]
+
+
+def _sort_order(values):
+    # posisi baris urut naik (NaN di akhir) + jumlah nilai non-NaN; dibuat sekali per versi data & kolom
+    s = values.reset_index(drop=True)
+    order = s.sort_values(kind="stable", na_position="last").index.to_numpy()
+    return order.astype(np.int32 if len(order) < 2**31 else np.int64), int(s.notna().sum())
+
+
+def _reset_page(key):
+    st.session_state[key] = 1
+
+
+def _pager(key, total, size):
+    """Nomor halaman (mulai 0) dari number_input; dijepit kalau hasil mengecil."""
+    n_pages = max(1, -(-total // size))
+    if st.session_state.get(key, 1) > n_pages:
+        st.session_state[key] = n_pages
+    return st.number_input(f"Halaman (dari {n_pages:,})", min_value=1, max_value=n_pages, key=key) - 1
+
+
+def _download(label, make_chunks, fmt, stem, key):
+    # data=callable: file eksport baru ditulis (per potongan) saat tombol diklik, bukan di setiap rerun
+    mime, ext = FORMATS[fmt]
+    st.download_button(label, lambda: export_file(make_chunks, fmt), f"{stem}.{ext}", mime, key=key,
+                       on_click="ignore")
+
+
+def _browse_data(ctx):
+    data, n = ctx.data, len(ctx.data)
+    comp = None
+    if ctx.competition_on:
+        with st.spinner("Menghitung kompetisi semua usaha..."):
+            comp = ctx.competition()
+        st.caption(f"Kompetisi dalam radius {ctx.radius_default} m (Default Radius); "
+                   "kompetitor_terdekat_m = jarak ke usaha sejenis terdekat.")
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    query = c1.text_input("Cari nama usaha", key="data_q", placeholder="prefix / salah ketik juga dicari",
+                          on_change=_reset_page, args=("data_page",))
+    sort_options = [NO_SORT] + list(data.columns) + (list(comp.columns) if comp is not None else [])
+    sort_col = c2.selectbox("Urutkan menurut", sort_options, key="data_sort")
+    ascending = c3.checkbox("Menaik", value=comp is None, key="data_sort_asc")
+    size = c4.selectbox("Baris", PAGE_SIZES, index=1, key="data_page_size")
+
+    # baris = hasil filter sidebar ∩ hasil pencarian nama, dalam urutan kolom terpilih (urutan dari cache per versi)
+    mask = None
+    if len(ctx.filtered_rows) < n:
+        mask = np.zeros(n, dtype=bool)
+        mask[ctx.filtered_rows] = True
+    if query.strip():
+        hit = np.zeros(n, dtype=bool)
+        hit[ctx.names.search_rows(query)] = True
+        mask = hit if mask is None else mask & hit
+    if sort_col == NO_SORT:
+        order = np.arange(n)
+        if not ascending:
+            order = order[::-1]
+    else:
+        source = ("competition", ctx.radius_default) if sort_col not in data.columns else ()
+        order, n_valid = ctx.dataset.derived(("sort_order", *source, sort_col),
+                                             lambda df: _sort_order((comp if source else df)[sort_col]))
+        if not ascending:
+            order = np.concatenate([order[:n_valid][::-1], order[n_valid:]])
+    rows = order if mask is None else order[mask[order]]
+
+    page = _pager("data_page", len(rows), size)
+    page_rows = rows[page * size:(page + 1) * size]
+    view = data.iloc[page_rows]
+    st.caption(f"{len(rows):,} dari {n:,} usaha (filter sidebar & pencarian) · "
+               f"baris {page * size + 1 if len(rows) else 0:,}–{page * size + len(page_rows):,}")
+    st.dataframe(view.join(comp) if comp is not None else view, use_container_width=True)
+
+    e1, e2 = st.columns([1, 3])
+    fmt = e1.selectbox("Format eksport", list(FORMATS), key="data_fmt")
+    with e2:
+        _download(f"Download {len(rows):,} usaha ({fmt})",
+                  lambda: (c.join(comp) if comp is not None else c for c in frame_chunks(data, rows)),
+                  fmt, "data_usaha", "data_download")
+
+
+def _browse_notes(notes_store):
+    c1, c2, c3 = st.columns([3, 1, 1])
+    query = c1.text_input("Cari nama usaha / isi catatan", key="notes_q",
+                          on_change=_reset_page, args=("notes_page",))
+    date_from = c2.date_input("Dari tanggal", value=None, key="notes_from")
+    date_to = c3.date_input("Sampai tanggal", value=None, key="notes_to")
+    c4, c5, c6 = st.columns([2, 1, 1])
+    sort = c4.selectbox("Urutkan menurut", SORT_COLUMNS, key="notes_sort")
+    ascending = c5.checkbox("Menaik", value=False, key="notes_sort_asc")
+    size = c6.selectbox("Baris", PAGE_SIZES, index=1, key="notes_page_size")
+
+    filters = {"search": query, "date_from": date_from, "date_to": date_to}
+    total = notes_store.count(**filters)
+    page = _pager("notes_page", total, size)
+    nd = notes_store.page(page * size, size, sort, ascending, **filters)
+    st.caption(f"{total:,} catatan · baris {page * size + 1 if total else 0:,}–{page * size + len(nd):,}")
+    st.dataframe(nd, use_container_width=True, hide_index=True)
+
+    e1, e2 = st.columns([1, 3])
+    fmt = e1.selectbox("Format eksport", list(FORMATS), key="notes_fmt")
+    with e2:
+        _download(f"Download {total:,} catatan ({fmt})",
+                  lambda: notes_store.iter_frames(sort=sort, ascending=ascending, **filters),
+                  fmt, "catatan_kunjungan", "notes_download")
+
+
+def render(ctx):
+    data, notes_store, watcher = ctx.data, ctx.notes_store, ctx.watcher
+
+    st.write("### Data & Catatan (Eksport / Import)")
+    st.markdown("<div class='glass'>", unsafe_allow_html=True)
+    st.write("#### Data Usaha")
+    _browse_data(ctx)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    if "daerah_spasial" in data.columns:
+        # kolom hasil spatial join (areas.join_daerah), ada kalau file batas wilayah ditemukan
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("#### Validasi Daerah (Batas Wilayah)")
+        beda = ctx.dataset.derived("daerah_mismatch", _area_mismatch)
+        n_luar = int(data["daerah_sesuai"].isna().sum())
+        aksi = "sudah diganti" if DAERAH_MODE == "assign" else "belum diubah (mode verify)"
+        st.caption(f"Daerah dicek dari koordinat terhadap poligon di {AREAS_PATH}; daerah di filter & chart {aksi}.")
+        st.write(f"{len(beda):,} usaha dengan isian daerah berbeda dari poligon · {n_luar:,} usaha di luar semua batas")
+        if len(beda):
+            st.dataframe(beda.head(500), use_container_width=True, hide_index=True)
+            _download("Download Daerah Tidak Sesuai (CSV)", lambda: frame_chunks(beda), "csv",
+                      "daerah_tidak_sesuai", "area_download")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='glass'>", unsafe_allow_html=True)
+    st.write("#### Catatan Kunjungan")
+    _browse_notes(notes_store)
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='glass'>", unsafe_allow_html=True)
+    st.write("#### Import Data Baru (Replace)")
+    uploaded = st.file_uploader("Upload CSV (akan mengganti data saat ini)", type=["csv"])
+    if uploaded is not None and st.button("Validasi & Ganti Data"):
+        try:
+            # dibaca per chunk, baris tidak valid ditolak, file data diganti atomik di akhir
+            with st.spinner("Memvalidasi & mengimpor data..."):
+                report = ingest_csv(uploaded, DATA_PATH)
+        except ValueError as e:
+            st.error(f"Import dibatalkan, data lama tetap dipakai: {e}")
+        else:
+            # muat versi baru sekarang (index turunan dibangun sekali), sesi lain ikut di rerun berikutnya
+            watcher.poll_once()
+            st.session_state.import_report = report
+            st.rerun()
+    report = st.session_state.get("import_report")
+    if report is not None:
+        st.success(f"{report.rows_ok:,} dari {report.rows_read:,} baris diimpor ({report.seconds:.1f} detik).")
+        if report.rows_rejected:
+            st.warning(f"{report.rows_rejected:,} baris ditolak: "
+                       + ", ".join(f"{r} ({n:,})" for r, n in report.reasons.items()))
+            st.dataframe(report.rejected, use_container_width=True, hide_index=True)
+            st.download_button("Download Baris Ditolak (CSV)", report.rejected.to_csv(index=False).encode("utf-8"),
+                               "baris_ditolak.csv", "text/csv")
+    st.markdown("</div>", unsafe_allow_html=True)
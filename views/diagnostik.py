@@ -0,0 +1,44 @@
+# views/diagnostik.py
+# Halaman tersembunyi "Diagnostics" (?diag=1): persentil waktu & memori per tahap rerun, cProfile, eksport JSON.
+import sys
+import tracemalloc
+from datetime import datetime
+
+import streamlit as st
+
+from config import DIAGNOSTICS_WINDOW
+from diagnostics import set_memory_tracing, TOTAL, COLD_START, FIRST_PAINT_PREFIX
+
+
+def render(ctx):
+    stage_stats = ctx.stage_stats
+
+    st.write("### Diagnostics")
+    st.caption(f"Waktu per tahap rerun dari semua sesi ({DIAGNOSTICS_WINDOW} sampel terakhir per tahap). "
+               "page:* = seluruh halaman (termasuk tahap peta/radius di dalamnya); map_html = build + render HTML saat cache miss; "
+               "import:* = import modul halaman (hanya saat pertama dibuka di proses ini); startup = import + setup di awal script; "
+               f"{COLD_START} = rerun pertama proses; {FIRST_PAINT_PREFIX}* = rerun pertama halaman per sesi.")
+    d1, d2, d3 = st.columns(3)
+    d1.checkbox("cProfile per rerun (sesi ini)", key="diag_profile")
+    trace_on = d2.checkbox("tracemalloc (semua sesi, memperlambat)", value=tracemalloc.is_tracing())
+    set_memory_tracing(trace_on)
+    if d3.button("Reset sampel"):
+        stage_stats.reset()
+
+    summary = stage_stats.summary()
+    st.dataframe(summary.round(2), use_container_width=True, hide_index=True)
+    total = summary[summary["tahap"] == TOTAL]
+    # map cache hanya ada kalau halaman peta sudah pernah dibuka (jangan import folium dari sini)
+    peta = sys.modules.get("views.peta")
+    cache_info = f" · map cache: {peta.get_map_cache().stats()}" if peta is not None else ""
+    if len(total):
+        st.markdown(f"Rerun: p50 **{total['p50_ms'].iat[0]:.0f} ms**, p90 **{total['p90_ms'].iat[0]:.0f} ms**{cache_info}")
+    startup = summary[summary["tahap"].isin([COLD_START]) | summary["tahap"].str.startswith(FIRST_PAINT_PREFIX)]
+    if len(startup):
+        st.write("#### Startup")
+        st.dataframe(startup[["tahap", "n", "p50_ms", "max_ms"]].round(1), use_container_width=True, hide_index=True)
+    st.download_button("Export Diagnostics (JSON)", stage_stats.to_json_bytes(),
+                       f"diagnostics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json", "application/json")
+    for prof in reversed(stage_stats.profiles()):
+        with st.expander(f"cProfile {prof['time']} — {prof['page']}"):
+            st.code(prof["stats"])
@@ -0,0 +1,121 @@
+# views/peta.py
+# Helper peta yang dipakai beberapa halaman: cache HTML peta, mode viewport (st_folium), popup, pilih titik pusat.
+import folium
+import numpy as np
+import streamlit as st
+import streamlit.components.v1 as components
+from streamlit_folium import st_folium
+
+from config import MAP_CACHE_ENTRIES, MAP_CACHE_MB, SEARCH_PAGE_SIZE
+from map_render import MapCache
+from viewport import (bounds_from_view, parse_bounds, pad, contains, visible_rows, aggregated, viewport_layer,
+                      view_state)
+
+
+@st.cache_resource(show_spinner=False)
+def get_map_cache():
+    # HTML peta jadi, dipakai bersama semua sesi (LRU + batas memori)
+    return MapCache(max_entries=MAP_CACHE_ENTRIES, max_bytes=MAP_CACHE_MB * 1024 * 1024)
+
+def show_viewport_map(ctx, name, m, rows, last_line, width, height):
+    # mode viewport: peta dasar (tanpa marker) + layer usaha yang hanya berisi area terlihat (+ margin).
+    # Layer dibangun ulang hanya kalau bounds keluar dari jendela atau zoom melewati batas agregasi.
+    # tampilan tersimpan hanya berlaku untuk peta yang sama (titik pusat / filter baru -> mulai dari m.location)
+    state = view_state(st.session_state.setdefault("viewport", {}).setdefault(name, {}),
+                       m.location, m.options.get("zoom", 12))
+    center = state.get("center", tuple(m.location))
+    zoom = state.get("zoom", m.options.get("zoom", 12))
+    layer_zoom = state.get("layer_zoom", zoom)
+    window = state.get("window") or pad(bounds_from_view(center, layer_zoom, width, height))
+    with ctx.diag.stage(f"map_build:{name}"):
+        vis = visible_rows(ctx.sindex, rows, window)
+        layer = viewport_layer(ctx.data, vis, layer_zoom, last_line)
+    with ctx.diag.stage(f"map_send:{name}"):
+        out = st_folium(m, key=f"viewport_{name}_{state['generation']}", width=width, height=height, center=center, zoom=zoom,
+                        feature_group_to_add=layer, returned_objects=["bounds", "zoom", "center"]) or {}
+    bounds = parse_bounds(out.get("bounds"))
+    if bounds is None:
+        return
+    new_zoom = out.get("zoom") or zoom
+    if out.get("center"):
+        state["center"] = (out["center"]["lat"], out["center"]["lng"])
+    state["zoom"] = new_zoom
+    zoom_changed = new_zoom != layer_zoom and (aggregated(new_zoom, len(vis)) or aggregated(layer_zoom, len(vis)))
+    if not contains(window, bounds) or zoom_changed:
+        state.update(window=pad(bounds), layer_zoom=new_zoom)
+        st.rerun()
+
+def show_cached_map(ctx, name, key, build, width, height):
+    # HTML peta dari MapCache (build + render hanya saat cache miss); waktu build & kirim dicatat terpisah
+    def _build():
+        with ctx.diag.stage(f"map_build:{name}"):
+            return build()
+    with ctx.diag.stage(f"map_html:{name}"):
+        html = get_map_cache().get_or_build(key, _build)
+    with ctx.diag.stage(f"map_send:{name}"):
+        components.html(html, width=width, height=height)
+
+def review_line(data):
+    # baris terakhir popup mode viewport: posisi baris di data -> "Review: n"
+    reviews = data["review"].to_numpy(dtype=float)
+    return lambda rows: [f"Review: {int(v)}" for v in reviews[rows]]
+
+def _data_center(df):
+    return [float(np.nanmedian(df["lat"].to_numpy(dtype=float))), float(np.nanmedian(df["lon"].to_numpy(dtype=float)))]
+
+def _reset_page(key):
+    st.session_state[f"{key}_page"] = 1
+
+def _pick_from_search(key):
+    # on_change: hanya pilihan baru dari daftar hasil yang mengganti titik pusat (pilihan dari klik peta tidak ditimpa)
+    choice = st.session_state[f"{key}_hasil"]
+    if choice is not None:
+        st.session_state[key] = choice
+
+def _clear_pick(key):
+    st.session_state.pop(key, None)
+
+def pick_business(ctx, label, key):
+    """Pilih usaha lewat pencarian nama (prefix / fuzzy, per halaman) atau klik di peta.
+
+    Nama terpilih disimpan di st.session_state[key]; dikembalikan (nama, posisi baris) atau (None, None).
+    """
+    names = ctx.names
+    query = st.text_input(label, key=f"{key}_q", placeholder="Ketik nama usaha (boleh sebagian / salah ketik)",
+                          on_change=_reset_page, args=(key,))
+    if query.strip():
+        with ctx.diag.stage("name_search"):
+            _, total = names.search(query, 0, SEARCH_PAGE_SIZE)
+        n_pages = max(1, -(-total // SEARCH_PAGE_SIZE))
+        c1, c2 = st.columns([3, 1])
+        page = c2.number_input(f"Halaman (dari {n_pages})", min_value=1, max_value=n_pages, key=f"{key}_page")
+        hasil, _ = names.search(query, page - 1, SEARCH_PAGE_SIZE)
+        c1.selectbox(f"{total:,} usaha cocok", hasil, index=None, placeholder="-- PILIH --", key=f"{key}_hasil",
+                     on_change=_pick_from_search, args=(key,))
+
+    choice = st.session_state.get(key)
+    pos = names.row(choice) if choice is not None else None
+    if choice is not None and pos is None:
+        # usaha tidak ada lagi di versi data ini
+        st.warning(f"'{choice}' tidak ada lagi di data, pilih ulang titik pusat.")
+        st.session_state.pop(key)
+        choice = None
+    data = ctx.data
+    with st.expander("Atau klik lokasi di peta (usaha terdekat dipilih)"):
+        loc = [data["lat"].iat[pos], data["lon"].iat[pos]] if pos is not None else ctx.dataset.derived("map_center", _data_center)
+        m = folium.Map(location=loc, zoom_start=15 if pos is not None else 12, tiles="CartoDB positron")
+        if pos is not None:
+            folium.Marker(loc, tooltip=choice, icon=folium.Icon(color="red")).add_to(m)
+        out = st_folium(m, key=f"{key}_klik", height=320, returned_objects=["last_clicked"]) or {}
+        click = out.get("last_clicked")
+        if click and click != st.session_state.get(f"{key}_klik_last"):
+            st.session_state[f"{key}_klik_last"] = click
+            near, _ = ctx.sindex.nearest((click["lat"], click["lng"]), k=1)
+            if len(near):
+                st.session_state[key] = data["nama_usaha"].iat[int(near[0])]
+                st.rerun()
+    if choice is not None:
+        c1, c2 = st.columns([3, 1])
+        c1.markdown(f"Titik pusat: **{choice}**")
+        c2.button("Hapus pilihan", key=f"{key}_hapus", on_click=_clear_pick, args=(key,))
+    return choice, pos
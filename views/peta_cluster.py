@@ -0,0 +1,131 @@
+# views/peta_cluster.py
+# Halaman "Peta Cluster": cluster manual (convex hull) dan cluster otomatis DBSCAN di atas hasil filter.
+import numpy as np
+import streamlit as st
+import folium
+
+from config import MARKER_BATCH_THRESHOLD, MAX_AUTO_CLUSTERS_DRAWN, CLUSTER_PALETTE
+from map_render import add_business_markers, popup_last_line
+from clustering import dbscan, cluster_hulls
+from views.peta import show_cached_map, show_viewport_map, review_line
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def get_auto_clusters(filter_key, eps_m, min_samples, _rows, _data):
+    # DBSCAN (haversine, lewat grid index) + convex hull, di-cache per filter (filter_key memuat versi data)
+    rows = np.asarray(_rows)
+    lats = _data["lat"].to_numpy()[rows]
+    lons = _data["lon"].to_numpy()[rows]
+    labels = dbscan(lats, lons, eps_m=eps_m, min_samples=min_samples)
+    return {"labels": labels, "hulls": cluster_hulls(lats, lons, labels, max_clusters=MAX_AUTO_CLUSTERS_DRAWN)}
+
+def render(ctx):
+    data, df_filtered, filtered_rows, filter_key = ctx.data, ctx.df_filtered, ctx.filtered_rows, ctx.filter_key
+    viewport_on, cluster_store = ctx.viewport_on, ctx.cluster_store
+    clusters_rev, clusters = cluster_store.snapshot()
+
+    left_col, right_col = st.columns([2,1])
+    with right_col:
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("### Cluster Otomatis")
+        auto_on = st.checkbox("Aktifkan cluster otomatis (DBSCAN)", value=False, key="auto_cluster_on")
+        auto_eps = st.slider("Jarak tetangga / eps (meter)", 50, 1000, 200, step=25, key="auto_cluster_eps")
+        auto_min = st.slider("Minimal usaha per cluster", 3, 50, 5, key="auto_cluster_min")
+        st.markdown("</div>", unsafe_allow_html=True)
+    auto_res = None
+    if auto_on and len(df_filtered) > 0:
+        with st.spinner("Menghitung cluster otomatis..."):
+            auto_res = get_auto_clusters(filter_key, auto_eps, auto_min, filtered_rows, data)
+
+    with left_col:
+        st.write("### Peta Segmentasi Cluster Usaha")
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        if len(df_filtered) == 0:
+            st.info("Tidak ada usaha yang cocok dengan filter.")
+            st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            def _build_cluster_map():
+                center_lat = df_filtered["lat"].median()
+                center_lon = df_filtered["lon"].median()
+                m = folium.Map(location=[center_lat, center_lon], zoom_start=12, tiles="CartoDB positron")
+                if not viewport_on:
+                    add_business_markers(m, df_filtered, popup_last_line(df_filtered, "review", "Review: {}"), threshold=MARKER_BATCH_THRESHOLD)
+                # ================================
+# 🔷 Render ALL Manual Clusters
+# ================================
+                for cname, cdata in clusters.items():
+
+                    if not cdata["active"]:
+                        continue
+
+                    # hull & centroid dari memo store: dihitung ulang hanya kalau anggota (atau data) berubah
+                    geom = cluster_store.geometry(cdata["members"], ctx.dataset)
+
+                    if geom["coords"] is not None:
+
+                        folium.Polygon(
+                            locations=geom["coords"],
+                            color=cdata["color"],
+                            weight=3,
+                            fill=True,
+                            fill_color=cdata["color"],
+                            fill_opacity=0.25,
+                            tooltip=f"Cluster: {cname}"
+                        ).add_to(m)
+
+                        # Label cluster di centroid
+                        folium.Marker(
+                            list(geom["centroid"]),
+                            icon=folium.DivIcon(html=f"""
+                                <div style="
+                                    font-weight:700;
+                                    background:rgba(255,255,255,0.85);
+                                    color:white;
+                                    padding:4px 8px;
+                                    border-radius:6px;
+                                    font-size:11px;
+                                    box-shadow:0 2px 6px rgba(0,0,0,0.3);">
+                                    {cname}
+                                </div>
+                            """)
+                        ).add_to(m)
+
+                # cluster otomatis: poligon convex hull seperti cluster manual
+                if auto_res is not None:
+                    for h in auto_res["hulls"]:
+                        if h["coords"] is None:
+                            continue
+                        color = CLUSTER_PALETTE[h["label"] % len(CLUSTER_PALETTE)]
+                        folium.Polygon(
+                            locations=h["coords"],
+                            color=color,
+                            weight=2,
+                            fill=True,
+                            fill_color=color,
+                            fill_opacity=0.2,
+                            tooltip=f"Auto cluster {h['label'] + 1}: {h['size']} usaha"
+                        ).add_to(m)
+                return m
+
+            auto_key = (auto_eps, auto_min) if auto_res is not None else None
+            cluster_key = ("cluster", filter_key, clusters_rev, auto_key)
+            if viewport_on:
+                show_viewport_map(ctx, "cluster", _build_cluster_map(), filtered_rows, review_line(data), width=1000, height=900)
+            else:
+                show_cached_map(ctx, "cluster", cluster_key, _build_cluster_map, width=1000, height=900)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    with right_col:
+        if auto_res is not None:
+            st.markdown("<div class='glass'>", unsafe_allow_html=True)
+            st.write("### Ringkasan Cluster Otomatis")
+            labels = auto_res["labels"]
+            st.markdown(f"{int(labels.max()) + 1 if len(labels) else 0} cluster · {int((labels == -1).sum()):,} usaha di luar cluster")
+            seg = df_filtered[["Jenis Usaha"]].assign(cluster=labels)
+            seg = seg[seg["cluster"] >= 0]
+            if len(seg) > 0:
+                summary = seg.groupby("cluster").agg(jumlah=("Jenis Usaha", "size"),
+                                                     jenis_dominan=("Jenis Usaha", lambda s: s.mode().iat[0] if len(s.mode()) else "-"))
+                summary.index = summary.index + 1
+                st.dataframe(summary.head(50), use_container_width=True)
+            st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,180 @@
+# views/peta_radius.py
+# Halaman "Peta Radius": usaha dalam radius titik pusat, cluster manual dari hasil radius, catatan kunjungan.
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+import folium
+
+from config import DISTANCE_METHOD, MARKER_BATCH_THRESHOLD
+from map_render import add_business_markers, popup_last_line
+from views import COMPETITION_COLUMNS
+from cluster_store import member_hull
+from views.peta import show_cached_map, show_viewport_map, pick_business
+
+
+def _save_widget(setter, name, key):
+    # on_change: disimpan ke store hanya saat pengguna mengubah widget, bukan di setiap rerun
+    setter(name, st.session_state[key])
+
+def _save_visible_members(store, name, key, visible):
+    # anggota di luar radius saat ini dipertahankan, yang terlihat diganti pilihan multiselect
+    cdat = store.all().get(name)
+    if cdat is not None:
+        store.set_members(name, [m for m in cdat["members"] if m not in visible] + st.session_state[key])
+
+def render(ctx):
+    data, data_rev, df_filtered, radius_default = ctx.data, ctx.data_rev, ctx.df_filtered, ctx.radius_default
+    viewport_on, notes_store, cluster_store, diag = ctx.viewport_on, ctx.notes_store, ctx.cluster_store, ctx.diag
+    comp = None
+    if ctx.competition_on:
+        with st.spinner("Menghitung kompetisi semua usaha..."):
+            comp = ctx.competition()[COMPETITION_COLUMNS]
+
+    st.write("### Peta Radius & Tabel Interaktif")
+    colL, colR = st.columns([2,1])
+    with colL:
+        st.markdown("<div class='glass map-box'>", unsafe_allow_html=True)
+        center_choice, center_pos = pick_business(ctx, "Pilih Titik Pusat:", "center_choice_map")
+        radius_val = st.slider("Radius (meter)", 50, 1500, radius_default, key="radius_val")
+        if center_pos is None:
+            st.info("Pilih titik pusat untuk menampilkan radius.")
+            st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            pusat = [data["lat"].iat[center_pos], data["lon"].iat[center_pos]]
+            # hanya sel grid di sekitar pusat yang dicek (spatial index), bukan seluruh data
+            with diag.stage("radius_query"):
+                idx_in, jarak_in = ctx.sindex.query_radius(pusat, radius_val, method=DISTANCE_METHOD)
+                in_radius = data.iloc[idx_in].assign(jarak_m=jarak_in)  # salinan kecil milik sesi ini
+
+            # ====== MANUAL CLUSTER BUILDER FOR RADIUS MAP ======
+            st.markdown("<hr>", unsafe_allow_html=True)
+            st.markdown("### 🎯 Buat Cluster dari Hasil Radius", unsafe_allow_html=True)
+
+            # show quick create form (only shows items from in_radius)
+            choices_radius = in_radius["nama_usaha"].astype(str).tolist()
+            visible = set(choices_radius)
+            with st.form("create_cluster_radius_form"):
+                cname_r = st.text_input("Nama Cluster Baru (Radius)")
+                ccolor_r = st.color_picker("Warna Cluster", "#22c55e")
+                cmembers_r = st.multiselect("Pilih usaha yang akan masuk ke cluster", choices_radius)
+                create_r = st.form_submit_button("Tambah Cluster dari Radius")
+
+            if create_r:
+                if cname_r.strip() == "":
+                    st.error("Nama cluster tidak boleh kosong!")
+                elif len(cmembers_r) == 0:
+                    st.error("Pilih minimal 1 usaha dari hasil radius untuk dimasukkan ke cluster.")
+                elif cname_r in cluster_store.all():
+                    st.error(f"Cluster '{cname_r}' sudah ada, pakai nama lain.")
+                else:
+                    cluster_store.save(cname_r, ccolor_r, cmembers_r)
+                    st.success(f"Cluster '{cname_r}' ditambahkan dan akan muncul di peta radius.")
+
+            # cluster manual dari store bersama (semua petugas); revision dipakai sebagai key cache peta
+            clusters_rev, clusters = cluster_store.snapshot()
+
+            # List & edit existing clusters (simple controls)
+            for ck, cdat in clusters.items():
+                with st.expander(f"{ck} — {len(cdat['members'])} usaha", expanded=False):
+                    st.checkbox("Tampilkan di peta radius", value=cdat["active"], key=f"rad_active_{ck}",
+                                on_change=_save_widget, args=(cluster_store.set_active, ck, f"rad_active_{ck}"))
+                    # update only those in current radius selection to avoid accidental removal of external members
+                    st.multiselect("Edit anggota (visible in filtered list)", choices_radius, default=[m for m in cdat["members"] if m in visible], key=f"rad_members_{ck}",
+                                   on_change=_save_visible_members, args=(cluster_store, ck, f"rad_members_{ck}", visible))
+                    st.color_picker("Warna cluster", value=cdat["color"], key=f"rad_color_{ck}",
+                                    on_change=_save_widget, args=(cluster_store.set_color, ck, f"rad_color_{ck}"))
+                    if st.button("Hapus Cluster", key=f"rad_del_{ck}"):
+                        cluster_store.delete(ck)
+                        st.rerun()
+
+            def _build_radius_map():
+                m = folium.Map(location=pusat, zoom_start=15, tiles="CartoDB positron")
+                folium.Circle(location=pusat, radius=radius_val, color="#4B7BEC", fill=True, fill_opacity=0.12).add_to(m)
+                if not viewport_on:
+                    add_business_markers(m, in_radius, popup_last_line(in_radius, "jarak_m", "{} m"), threshold=MARKER_BATCH_THRESHOLD)
+
+                # Render manual clusters on this radius map (only show members that are inside in_radius)
+                for cname, cdata in clusters.items():
+                    if not cdata["active"]:
+                        continue
+                    # posisi, koordinat & hull anggota dari memo store (dihitung ulang hanya kalau anggota berubah)
+                    geom = cluster_store.geometry(cdata["members"], ctx.dataset)
+                    inside = np.isin(geom["rows"], idx_in)
+                    lats, lons = geom["lats"][inside], geom["lons"][inside]
+                    if inside.all():
+                        coords, centroid = geom["coords"], geom["centroid"]
+                    else:
+                        coords, centroid = member_hull(lats, lons)
+                    if coords is not None:
+                        folium.Polygon(coords, color=cdata["color"], weight=2, fill=True, fill_color=cdata["color"], fill_opacity=0.3, popup=f"{cname}").add_to(m)
+                        # add cluster label at centroid
+                        folium.map.Marker(list(centroid), icon=folium.DivIcon(html=f"<div style='font-weight:700;padding:2px 6px;background:rgba(255,255,255,0.8);border-radius:4px'>{cname}</div>")).add_to(m)
+                    elif len(lats) > 0:
+                        # fallback: draw small buffered circles around points and combine visually
+                        for lat, lon in zip(lats, lons):
+                            folium.CircleMarker(location=[lat, lon], radius=8, color=cdata["color"], fill=True, fill_color=cdata["color"], fill_opacity=0.6, popup=f"{cname}").add_to(m)
+                return m
+
+            radius_key = ("radius", data_rev, center_choice, radius_val, DISTANCE_METHOD, clusters_rev)
+            if viewport_on:
+                def jarak_line(rows):
+                    return [f"{int(d)} m" for d in jarak_in[np.searchsorted(idx_in, rows)]]
+                show_viewport_map(ctx, "radius", _build_radius_map(), idx_in, jarak_line, width=980, height=600)
+            else:
+                show_cached_map(ctx, "radius", radius_key, _build_radius_map, width=980, height=600)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    with colR:
+
+        # Tabel Usaha dengan Review Terbesar
+        # ================================
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("### Usaha dengan Jumlah Review Terbanyak")
+
+        # Urutkan usaha berdasarkan jumlah review
+        df_review_top = df_filtered.sort_values("review", ascending=False).head(10)
+        review_cols = ["nama_usaha", "Jenis Usaha", "review"]
+        if comp is not None:
+            df_review_top = df_review_top.join(comp)
+            review_cols += COMPETITION_COLUMNS
+
+        # Styling tabel agar lebih premium
+        st.dataframe(
+            df_review_top[review_cols]
+            .rename(columns={
+                "nama_usaha": "Nama Usaha",
+                "Jenis Usaha": "Jenis Usaha",
+                "review": "Jumlah Review",
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("### Daftar Usaha Dalam Radius")
+        if center_pos is None:
+            st.info("Pilih titik pusat untuk melihat daftar.")
+        else:
+            t = in_radius[["nama_usaha", "Jenis Usaha", "daerah", "jarak_m", "review"]].copy()
+            t["jarak_m"] = t["jarak_m"].astype(int)
+            if comp is not None:
+                t = t.join(comp)
+            st.dataframe(t.sort_values("jarak_m").reset_index(drop=True), use_container_width=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+        # Add note interface
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("### Buat Catatan Kunjungan")
+        if center_pos is None:
+            st.info("Pilih titik pusat untuk menyimpan catatan terkait titik tersebut.")
+        else:
+            # pilihan = posisi di in_radius, koordinat diambil langsung tanpa mencari nama lagi
+            i = st.selectbox("Pilih Usaha", range(len(in_radius)), format_func=in_radius["nama_usaha"].iat.__getitem__)
+            catatan = st.text_area("Catatan", placeholder="Tulis catatan kunjungan, outcome, follow-up...")
+            if st.button("Simpan Catatan") and i is not None:
+                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                notes_store.add(now, in_radius["nama_usaha"].iat[i], in_radius["lat"].iat[i], in_radius["lon"].iat[i], catatan)
+                st.success("Catatan tersimpan.")
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,105 @@
+# views/rute_kunjungan.py
+# Halaman "Rute Kunjungan": urutan kunjungan optimal dari titik awal ke usaha dalam radius / cluster / filter.
+import numpy as np
+import streamlit as st
+import folium
+
+from config import DISTANCE_METHOD, MAX_ROUTE_STOPS
+from geo import haversine_np, distances_from
+from route import plan_route
+from views.peta import show_cached_map, pick_business
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def solve_route(version, start_pos, stop_positions, return_to_start, _data):
+    # urutan kunjungan (nearest neighbour + 2-opt/Or-opt), di-cache per versi data & pilihan usaha
+    stops = np.asarray(stop_positions, dtype=np.int64)
+    start = (_data["lat"].iat[start_pos], _data["lon"].iat[start_pos])
+    order, length, nn_length = plan_route(start, _data["lat"].to_numpy()[stops], _data["lon"].to_numpy()[stops],
+                                          return_to_start=return_to_start)
+    return {"order": stops[order].tolist(), "length": length, "nn_length": nn_length}
+
+def render(ctx):
+    data, data_rev, filtered_rows, radius_default = ctx.data, ctx.data_rev, ctx.filtered_rows, ctx.radius_default
+
+    st.write("### Rute Kunjungan (Urutan Optimal)")
+    colL, colR = st.columns([2,1])
+    with colR:
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        start_choice, start_pos = pick_business(ctx, "Titik Awal:", "route_start")
+        sumber = st.radio("Usaha yang dikunjungi", ["Dalam radius titik awal", "Cluster manual", "Hasil filter"], key="route_source")
+        route_radius = radius_default
+        route_cluster = None
+        if sumber == "Dalam radius titik awal":
+            route_radius = st.slider("Radius (meter)", 50, 3000, radius_default, key="route_radius")
+        elif sumber == "Cluster manual":
+            clusters = ctx.cluster_store.all()
+            cluster_names = list(clusters.keys())
+            if cluster_names:
+                route_cluster = st.selectbox("Cluster", cluster_names, key="route_cluster")
+            else:
+                st.info("Belum ada cluster manual. Buat dulu di halaman Peta Radius.")
+        kembali = st.checkbox("Kembali ke titik awal", value=False, key="route_return")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with colL:
+        st.markdown("<div class='glass map-box'>", unsafe_allow_html=True)
+        if start_pos is None:
+            st.info("Pilih titik awal untuk menyusun rute kunjungan.")
+        else:
+            start_pt = (data["lat"].iat[start_pos], data["lon"].iat[start_pos])
+            if sumber == "Dalam radius titik awal":
+                stops, _ = ctx.sindex.query_radius(start_pt, route_radius, method=DISTANCE_METHOD)
+            elif sumber == "Cluster manual" and route_cluster is not None:
+                stops = np.sort(ctx.cluster_store.geometry(clusters[route_cluster]["members"], ctx.dataset)["rows"])
+            elif sumber == "Hasil filter":
+                stops = np.asarray(filtered_rows)
+            else:
+                stops = np.empty(0, dtype=np.int64)
+            stops = stops[(stops != start_pos) & data["lat"].notna().to_numpy()[stops] & data["lon"].notna().to_numpy()[stops]]
+            if len(stops) > MAX_ROUTE_STOPS:
+                # ambil usaha terdekat dari titik awal supaya tetap interaktif
+                d = distances_from(start_pt, data["lat"].to_numpy()[stops], data["lon"].to_numpy()[stops])
+                stops = np.sort(stops[np.argsort(d, kind="stable")[:MAX_ROUTE_STOPS]])
+                st.warning(f"Rute dibatasi ke {MAX_ROUTE_STOPS} usaha terdekat dari titik awal.")
+            if len(stops) == 0:
+                st.info("Tidak ada usaha untuk dikunjungi dari pilihan ini.")
+            else:
+                res = solve_route(data_rev, start_pos, tuple(stops.tolist()), kembali, data)
+                visit = res["order"]
+                path_pos = [start_pos] + visit + ([start_pos] if kembali else [])
+                path_lat = data["lat"].to_numpy()[path_pos]
+                path_lon = data["lon"].to_numpy()[path_pos]
+
+                def _build_route_map():
+                    m = folium.Map(location=[start_pt[0], start_pt[1]], zoom_start=14, tiles="CartoDB positron")
+                    folium.PolyLine(list(zip(path_lat, path_lon)), color="#4B7BEC", weight=4, opacity=0.8).add_to(m)
+                    folium.Marker([start_pt[0], start_pt[1]], popup=f"<b>START</b><br>{start_choice}", icon=folium.Icon(color="red")).add_to(m)
+                    for no, pos in enumerate(visit, start=1):
+                        folium.Marker(
+                            [data["lat"].iat[pos], data["lon"].iat[pos]],
+                            popup=f"<b>{no}. {data['nama_usaha'].iat[pos]}</b><br>{data['Jenis Usaha'].iat[pos]}<br>{data['daerah'].iat[pos]}",
+                            icon=folium.DivIcon(html=f"<div style='font-weight:700;font-size:11px;background:#4B7BEC;color:white;border-radius:10px;padding:1px 6px;display:inline-block'>{no}</div>")
+                        ).add_to(m)
+                    return m
+
+                route_key = ("route", data_rev, start_pos, tuple(visit), kembali)
+                show_cached_map(ctx, "route", route_key, _build_route_map, width=980, height=600)
+
+                st.markdown(f"**Total jarak:** {res['length'] / 1000:.2f} km · {len(visit)} usaha"
+                            f" <span style='opacity:0.7'>(nearest neighbour: {res['nn_length'] / 1000:.2f} km)</span>", unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+    with colR:
+        st.markdown("<div class='glass'>", unsafe_allow_html=True)
+        st.write("### Urutan Kunjungan")
+        if start_pos is None or len(stops) == 0:
+            st.info("Belum ada rute.")
+        else:
+            leg = haversine_np(path_lat[:-1], path_lon[:-1], path_lat[1:], path_lon[1:])
+            t = data.iloc[visit][["nama_usaha", "Jenis Usaha", "daerah"]].reset_index(drop=True)
+            t.insert(0, "urutan", range(1, len(visit) + 1))
+            t["jarak_dari_sebelumnya_m"] = leg[:len(visit)].astype(int)
+            t["kumulatif_m"] = np.cumsum(leg[:len(visit)]).astype(int)
+            st.dataframe(t, use_container_width=True, hide_index=True)
+        st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,196 @@
+# watcher.py
+# Satu thread background (dipakai bersama semua sesi) yang memantau file data.
+# Kalau file berubah: load ulang, bandingkan baris lama vs baru lewat key stabil, dan
+# - isi sama (file cuma di-touch / disimpan ulang) -> versi lama tetap dipakai, cache tidak hilang
+# - ada baris berubah -> DatasetState baru (revision + 1); index turunan dibangun di thread ini,
+#   yang punya update() diperbarui dari diff (added / removed / changed) secara inkremental.
+# - file gagal dimuat (rusak / sedang ditulis) -> versi lama tetap dipakai, error disimpan di last_error.
+# Sesi mengambil versi terbaru secara lazy lewat current() di awal rerun (tanpa paksa rerun).
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from data_store import data_version
+
+KEY_COLUMNS = ["nama_usaha", "lat", "lon"]
+PARAM_ENTRIES = 8  # artefak berparameter (nama tuple, mis. ("competition", radius)) yang disimpan per versi
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class DatasetDiff:
+    added: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))    # posisi di data baru
+    removed: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # posisi di data lama
+    changed: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # posisi di data baru
+    changed_old: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # pasangan di data lama
+    matched_new: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # semua baris yang
+    matched_old: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))  # ada di kedua versi
+    full: bool = False  # kolom berubah -> anggap semua baris baru
+
+    @property
+    def n_changes(self):
+        return len(self.added) + len(self.removed) + len(self.changed)
+
+
+def _row_keys(df, key_columns):
+    keys = pd.util.hash_pandas_object(df[key_columns], index=False).to_numpy()
+    # key kembar (nama + koordinat sama) dibedakan dengan nomor urut kemunculan
+    dup = pd.Series(keys).groupby(keys).cumcount().to_numpy().astype(np.uint64)
+    return keys * np.uint64(31) + dup
+
+
+def _row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def identical(old, new):
+    return (list(old.columns) == list(new.columns) and len(old) == len(new)
+            and bool((_row_hashes(old) == _row_hashes(new)).all()))
+
+
+def diff_frames(old, new, key_columns=KEY_COLUMNS):
+    """Beda baris antara dua versi dataset, dicocokkan lewat key_columns."""
+    if list(old.columns) != list(new.columns) or any(c not in new.columns for c in key_columns):
+        return DatasetDiff(added=np.arange(len(new)), removed=np.arange(len(old)), full=True)
+    ok, nk = _row_keys(old, key_columns), _row_keys(new, key_columns)
+    oh, nh = _row_hashes(old), _row_hashes(new)
+    old_pos = pd.Series(np.arange(len(old)), index=ok)
+    match = old_pos.reindex(nk).to_numpy()
+    in_old = ~np.isnan(match)
+    added = np.flatnonzero(~in_old)
+    both_new = np.flatnonzero(in_old)
+    both_old = match[in_old].astype(np.int64)
+    differs = oh[both_old] != nh[both_new]
+    removed = np.setdiff1d(np.arange(len(old)), both_old)
+    return DatasetDiff(added=added, removed=removed,
+                       changed=both_new[differs], changed_old=both_old[differs],
+                       matched_new=both_new, matched_old=both_old)
+
+
+class DatasetState:
+    """Satu versi isi dataset + artefak turunannya (index dsb.), dibagi read-only ke semua sesi."""
+
+    def __init__(self, df, file_version, revision, diff=None):
+        self.df = df
+        self.file_version = file_version        # versi file terakhir yang isinya sama dengan df
+        self.content_version = file_version     # versi file saat isi ini pertama dimuat (key cache)
+        self.revision = revision
+        self.diff = diff
+        self._derived = {}
+        self._params = OrderedDict()  # LRU untuk nama tuple: tiap nilai parameter baru tidak menumpuk
+        self._building = {}           # nama -> lock: satu build per nama, sesi lain menunggu hasilnya
+        self._lock = threading.Lock()
+
+    def _store(self, name):
+        return self._params if isinstance(name, tuple) else self._derived
+
+    def _get(self, name):
+        store = self._store(name)
+        if name in store:
+            if store is self._params:
+                store.move_to_end(name)
+            return True, store[name]
+        return False, None
+
+    def derived(self, name, build):
+        """Artefak turunan (mis. spatial index) dibuat sekali per versi: build(df).
+
+        Nama tuple = artefak berparameter, hanya PARAM_ENTRIES terakhir yang disimpan.
+        """
+        with self._lock:
+            found, value = self._get(name)
+            if found:
+                return value
+            key_lock = self._building.setdefault(name, threading.Lock())
+        with key_lock:
+            with self._lock:
+                found, value = self._get(name)
+            if found:
+                return value
+            value = build(self.df)
+            self.put(name, value)
+            with self._lock:
+                self._building.pop(name, None)
+        return value
+
+    def peek(self, name):
+        with self._lock:
+            return self._get(name)[1]
+
+    def put(self, name, value):
+        with self._lock:
+            store = self._store(name)
+            store[name] = value
+            if store is self._params:
+                store.move_to_end(name)
+                while len(store) > PARAM_ENTRIES:
+                    store.popitem(last=False)
+
+
+class DatasetWatcher:
+    def __init__(self, path, loader, key_columns=KEY_COLUMNS, interval=2.0, background=True):
+        self.path = path
+        self.loader = loader
+        self.key_columns = key_columns
+        self.interval = interval
+        self.builders = {}
+        self.last_error = None  # exception reload terakhir (None kalau berhasil), ditampilkan di sidebar
+        self._lock = threading.Lock()
+        self._state = DatasetState(loader(path), data_version(path), revision=1)
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+            self._thread.start()
+
+    def current(self):
+        return self._state
+
+    def register(self, name, build, update=None):
+        """Artefak turunan yang langsung disiapkan di background setiap ada versi baru.
+
+        update(old_value, new_df, diff) -> value baru dari value lama (hanya baris yang berubah
+        yang dihitung ulang); kalau tidak ada / diff penuh, pakai build(new_df).
+        """
+        self.builders[name] = (build, update)
+
+    def poll_once(self):
+        """Cek file sekali; True kalau isi dataset berubah (revision naik)."""
+        version = data_version(self.path)
+        with self._lock:
+            old = self._state
+            if version is None or version == old.file_version:
+                return False
+            try:
+                df = self.loader(self.path)
+            except Exception as e:  # file sedang ditulis / rusak -> tetap pakai versi lama
+                self.last_error = e
+                log.warning("reload %s gagal: %s", self.path, e)
+                return False
+            self.last_error = None
+            if identical(old.df, df):
+                old.file_version = version
+                return False
+            diff = diff_frames(old.df, df, self.key_columns)
+            new = DatasetState(df, version, old.revision + 1, diff)
+            for name, (build, update) in self.builders.items():
+                prev = old.peek(name)
+                if update is not None and prev is not None and not diff.full:
+                    new.put(name, update(prev, df, diff))
+                else:
+                    new.derived(name, build)
+            self._state = new
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.poll_once()
+            except Exception:
+                log.exception("dataset watcher error")